@@ -18,7 +18,7 @@ class AmenityList(Resource):
     @api.response(200, 'List of amenities retrieved successfully')
     def get(self):
         """Retrieve all amenities"""
-        amenities = [a for a in facade.get_all() if isinstance(a, Amenity)]
+        amenities = facade.get_amenities()
         return [{
             'id': a.id,
             'name': a.name,
@@ -55,8 +55,8 @@ class AmenityResource(Resource):
     @api.response(404, 'Amenity not found')
     def get(self, amenity_id):
         """Get amenity by ID"""
-        a = facade.get(amenity_id)
-        if not a or not isinstance(a, Amenity):
+        a = facade.get_amenity(amenity_id)
+        if not a:
             return {'error': 'Amenity not found'}, 404
 
         return {
@@ -73,8 +73,8 @@ class AmenityResource(Resource):
     @api.response(400, 'Invalid input data')
     def put(self, amenity_id):
         """Update amenity"""
-        a = facade.get(amenity_id)
-        if not a or not isinstance(a, Amenity):
+        a = facade.get_amenity(amenity_id)
+        if not a:
             return {'error': 'Amenity not found'}, 404
 
         data = api.payload or {}
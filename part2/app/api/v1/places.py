@@ -56,8 +56,8 @@ class PlaceList(Resource):
                 return {'error': f'{field} is required'}, 400
 
         
-        owner = facade.get(data['owner_id'])
-        if not owner or not isinstance(owner, User):
+        owner = facade.get_user(data['owner_id'])
+        if not owner:
                 return {'error': 'Owner not found'}, 400
 
         
@@ -97,8 +97,8 @@ class PlaceResource(Resource):
     @api.response(404, 'Place not found')
     def get(self, place_id):
         """Get place by ID"""
-        p = facade.get(place_id)
-        if not p or not isinstance(p, Place):
+        p = facade.get_place(place_id)
+        if not p:
             return {'error': 'Place not found'}, 404
 
         return {
@@ -121,12 +121,16 @@ class PlaceResource(Resource):
     @api.response(400, 'Invalid input data')
     def put(self, place_id):
         """Update place"""
-        p = facade.get(place_id)
-        if not p or p.__class__.__name__ != "Place":
+        p = facade.get_place(place_id)
+        if not p:
             return {'error': 'Place not found'}, 404
 
         data = api.payload or {}
-        updated_place = facade.update(place_id, data)
+        try:
+            updated_place = facade.update(place_id, data)
+        except (ValueError, AttributeError):
+            # e.g. an owner that is not a user: the place is left unchanged
+            return {'error': 'Invalid input data'}, 400
 
         return {
             'id': updated_place.id,
@@ -146,8 +150,8 @@ class PlaceReviews(Resource):
     @api.response(200, 'List of reviews for the place')
     @api.response(404, 'Place not found')
     def get(self, place_id):
-        place = facade.get(place_id)
-        if not place or not isinstance(place, Place):
+        place = facade.get_place(place_id)
+        if not place:
             return {'error': 'Place not found'}, 404
 
         return [
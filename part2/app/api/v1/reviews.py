@@ -1,5 +1,5 @@
 from flask_restx import Namespace, Resource, fields
-from app.business.models.facade import HBnBFacade
+from app.business.facade import HBnBFacade
 from app.models.review import Review
 from app.models.user import User
 from app.models.place import Place
@@ -19,7 +19,7 @@ class ReviewList(Resource):
     @api.response(200, 'List of reviews retrieved successfully')
     def get(self):
         """Retrieve all reviews"""
-        reviews = [obj for obj in facade.get_all() if isinstance(obj, Review)]
+        reviews = facade.get_reviews()
         result = []
         for r in reviews:
             result.append({
@@ -47,13 +47,13 @@ class ReviewList(Resource):
                 return {'error': f'{field} is required'}, 400
 
         # Validate user
-        user = facade.get(data['user_id'])
-        if not user or not isinstance(user, User):
+        user = facade.get_user(data['user_id'])
+        if not user:
             return {'error': 'User not found'}, 400
 
         # Validate place
-        place = facade.get(data['place_id'])
-        if not place or not isinstance(place, Place):
+        place = facade.get_place(data['place_id'])
+        if not place:
             return {'error': 'Place not found'}, 400
 
         # Create review
@@ -83,8 +83,8 @@ class ReviewResource(Resource):
     @api.response(404, 'Review not found')
     def get(self, review_id):
         """Get review by ID"""
-        r = facade.get(review_id)
-        if not r or not isinstance(r, Review):
+        r = facade.get_review(review_id)
+        if not r:
             return {'error': 'Review not found'}, 404
 
         return {
@@ -103,8 +103,8 @@ class ReviewResource(Resource):
     @api.response(400, 'Invalid input data')
     def put(self, review_id):
         """Update review"""
-        r = facade.get(review_id)
-        if not r or not isinstance(r, Review):
+        r = facade.get_review(review_id)
+        if not r:
             return {'error': 'Review not found'}, 404
 
         data = api.payload or {}
@@ -124,8 +124,8 @@ class ReviewResource(Resource):
     @api.response(404, 'Review not found')
     def delete(self, review_id):
         """Delete review"""
-        r = facade.get(review_id)
-        if not r or not isinstance(r, Review):
+        r = facade.get_review(review_id)
+        if not r:
             return {'error': 'Review not found'}, 404
 
         facade.delete(review_id)
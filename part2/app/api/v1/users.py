@@ -16,7 +16,7 @@ users_ns = Namespace(
 @users_ns.route("/")
 class UsersList(Resource):
     def get(self):
-        users = facade.get_all()
+        users = facade.get_users()
 
         return [
             {
@@ -25,7 +25,7 @@ class UsersList(Resource):
                 "first_name": u.first_name,
                 "last_name": u.last_name
             }
-            for u in users if isinstance(u, User)
+            for u in users
         ], 200
 
     def post(self):
@@ -41,7 +41,10 @@ class UsersList(Resource):
             last_name=data.get("last_name", "")
         )
 
-        facade.create(user)
+        try:
+            facade.create(user)
+        except ValueError:
+            return {"error": "Email already registered"}, 400
 
         return {
             "id": user.id,
@@ -52,9 +55,9 @@ class UsersList(Resource):
 @users_ns.route("/<string:user_id>")
 class UserDetail(Resource):
     def get(self, user_id):
-        user = facade.get(user_id)
+        user = facade.get_user(user_id)
 
-        if not user or not isinstance(user, User):
+        if not user:
             return {"error": "User not found"}, 404
 
         return {
@@ -67,11 +70,14 @@ class UserDetail(Resource):
     def put(self, user_id):
         data = request.get_json() or {}
 
-        user = facade.get(user_id)
-        if not user or not isinstance(user, User):
+        user = facade.get_user(user_id)
+        if not user:
             return {"error": "User not found"}, 404
 
-        updated_user = facade.update(user_id, data)
+        try:
+            updated_user = facade.update(user_id, data)
+        except ValueError:
+            return {"error": "Email already registered"}, 400
 
         return {
             "id": updated_user.id,
@@ -1,8 +1,17 @@
 from app.persistence.repository import InMemoryRepository
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from app.models.amenity import Amenity
+
 
 class HBnBFacade:
-    def __init__(self):
-        self.repository = InMemoryRepository()
+    def __init__(self, thread_safe=True):
+        self.repository = InMemoryRepository(thread_safe=thread_safe)
+        self.repository.declare_index(User, "email", unique=True)
+        self.repository.declare_index(Place, "owner", key="owner.id")
+        self.repository.declare_index(Review, "place", key="place.id")
+        self.repository.declare_index(Review, "user", key="user.id")
 
     def create(self, obj):
         return self.repository.add(obj)
@@ -18,6 +27,40 @@ class HBnBFacade:
 
     def delete(self, obj_id):
         return self.repository.delete(obj_id)
-    
+
+    # ---------- typed lookups (one bucket or index, no scan) ----------
+    def get_user(self, user_id):
+        return self.repository.get(user_id, User)
+
+    def get_place(self, place_id):
+        return self.repository.get(place_id, Place)
+
+    def get_review(self, review_id):
+        return self.repository.get(review_id, Review)
+
+    def get_amenity(self, amenity_id):
+        return self.repository.get(amenity_id, Amenity)
+
+    def get_users(self):
+        return self.repository.get_all(User)
+
     def get_places(self):
-        return [obj for obj in self.get_all() if obj.__class__.__name__ == "Place"]
+        return self.repository.get_all(Place)
+
+    def get_reviews(self):
+        return self.repository.get_all(Review)
+
+    def get_amenities(self):
+        return self.repository.get_all(Amenity)
+
+    def get_user_by_email(self, email):
+        return self.repository.get_by(User, "email", email)
+
+    def get_places_by_owner(self, owner_id):
+        return self.repository.filter_by(Place, "owner", owner_id)
+
+    def get_reviews_by_place(self, place_id):
+        return self.repository.filter_by(Review, "place", place_id)
+
+    def get_reviews_by_user(self, user_id):
+        return self.repository.filter_by(Review, "user", user_id)
@@ -1,32 +1,301 @@
+import threading
+from contextlib import nullcontext
+from operator import attrgetter
+
+
 class InMemoryRepository:
-    def __init__(self):
+    """
+    Objects by id, plus a bucket per type and declared secondary indexes,
+    so listing one type or looking up by an indexed attribute does not
+    scan every stored object.
+
+        repo.declare_index(User, "email", unique=True)
+        repo.declare_index(Place, "owner", key="owner.id")
+        repo.get_by(User, "email", "ali@test.com")
+        repo.filter_by(Place, "owner", user_id)
+
+    Indexes follow add(), update() and delete(). An indexed attribute
+    changed any other way needs reindex(obj).
+
+    With thread_safe=True (what the facade uses, for threaded servers)
+    every method runs under a ReadWriteLock: reads share it and never wait
+    for each other, a write has it alone, so a unique check and the insert
+    that follows it, or the several dicts one write touches, are never
+    seen half done. Lists are returned as copies, safe to iterate while
+    other threads write.
+    """
+
+    def __init__(self, thread_safe=False):
         self._storage = {}
+        self._buckets = {}  # type -> {id: obj}
+        self._indexes = {}  # type -> {name: _Index}
+        if thread_safe:
+            lock = ReadWriteLock()
+            self._reading, self._writing = lock.reader, lock.writer
+        else:
+            self._reading = self._writing = nullcontext()
+
+    # ---------- indexes ----------
+    def declare_index(self, model, name, unique=False, key=None):
+        """Index `model` objects by `key` (dotted attribute path, default `name`)"""
+        index = _Index(name, unique, attrgetter(key or name))
+        with self._writing:
+            for obj in self._buckets.get(model, {}).values():
+                index.check(obj)
+                index.insert(obj)
+            self._indexes.setdefault(model, {})[name] = index
+
+    def _index(self, model, name):
+        try:
+            return self._indexes[model][name]
+        except KeyError:
+            raise KeyError(f"No index {name!r} declared for {model.__name__}") from None
+
+    def get_by(self, model, name, value):
+        """The object whose unique index `name` is `value`, or None"""
+        index = self._index(model, name)
+        if not index.unique:
+            raise ValueError(f"Index {name!r} of {model.__name__} is not unique; use filter_by()")
+        with self._reading:
+            return index.entries.get(value)
+
+    def filter_by(self, model, name, value):
+        """Objects whose index `name` is `value`, in insertion order"""
+        index = self._index(model, name)
+        with self._reading:
+            if index.unique:
+                obj = index.entries.get(value)
+                return [obj] if obj is not None else []
+            return list(index.entries.get(value, {}).values())
+
+    def reindex(self, obj):
+        """Refresh the index entries of an object mutated outside update()"""
+        with self._writing:
+            self._reindex(obj)
+
+    def _reindex(self, obj):
+        indexes = self._indexes.get(type(obj), {}).values()
+        for index in indexes:
+            index.check(obj)
+        for index in indexes:
+            index.remove(obj)
+            index.insert(obj)
 
+    # ---------- storage ----------
     def add(self, obj):
         if not hasattr(obj, "id"):
             raise ValueError("Object must have an id attribute")
-        self._storage[obj.id] = obj
+        with self._writing:
+            # checked before the object it replaces is removed, so a rejected
+            # re-add leaves the stored one in place (check() ignores entries
+            # with the same id)
+            indexes = list(self._indexes.get(type(obj), {}).values())
+            keys = [index.key(obj) for index in indexes]
+            for index, key in zip(indexes, keys):
+                index.check(obj, key)
+            if obj.id in self._storage:
+                self._delete(obj.id)
+
+            self._storage[obj.id] = obj
+            self._buckets.setdefault(type(obj), {})[obj.id] = obj
+            for index, key in zip(indexes, keys):
+                index.insert(obj, key)
         return obj
 
-    def get(self, obj_id):
-        return self._storage.get(obj_id)
+    def get(self, obj_id, model=None):
+        """The object with `obj_id`; None if missing or not a `model`"""
+        with self._reading:
+            if model is not None:
+                return self._buckets.get(model, {}).get(obj_id)
+            return self._storage.get(obj_id)
+
+    def get_all(self, model=None):
+        """Every object, or only the `model` ones (one bucket, no scan)"""
+        with self._reading:
+            if model is not None:
+                return list(self._buckets.get(model, {}).values())
+            return list(self._storage.values())
 
-    def get_all(self):
-        return list(self._storage.values())
+    def count(self, model=None):
+        with self._reading:
+            if model is not None:
+                return len(self._buckets.get(model, {}))
+            return len(self._storage)
 
     def update(self, obj_id, data):
-        obj = self.get(obj_id)
-        if not obj:
-            return None
+        with self._writing:
+            obj = self._storage.get(obj_id)
+            if not obj:
+                return None
+
+            # the id keys the storage and every index, it is never updated
+            changes = {key: value for key, value in data.items() if key != "id" and hasattr(obj, key)}
+            # new index keys are computed from the updated values before
+            # anything is mutated, so a bad value (owner="x" for "owner.id")
+            # or a taken unique key leaves the object and its indexes as they were
+            indexes = list(self._indexes.get(type(obj), {}).values())
+            updated = _Updated(obj, changes)
+            keys = [index.key(updated) for index in indexes]
+            for index, key in zip(indexes, keys):
+                index.check(obj, key)
 
-        for key, value in data.items():
-            if hasattr(obj, key):
-                setattr(obj, key, value)
+            previous = {key: getattr(obj, key) for key in changes}
+            try:
+                for key, value in changes.items():
+                    setattr(obj, key, value)
+            except BaseException:
+                for key, value in previous.items():
+                    setattr(obj, key, value)
+                raise
+            for index, key in zip(indexes, keys):
+                index.remove(obj)
+                index.insert(obj, key)
 
-        if hasattr(obj, "update"):
-            obj.update()
+            if hasattr(obj, "update"):
+                obj.update()
 
         return obj
 
     def delete(self, obj_id):
-        return self._storage.pop(obj_id, None)
+        with self._writing:
+            return self._delete(obj_id)
+
+    def _delete(self, obj_id):
+        obj = self._storage.pop(obj_id, None)
+        if obj is None:
+            return None
+        self._buckets[type(obj)].pop(obj_id, None)
+        for index in self._indexes.get(type(obj), {}).values():
+            index.remove(obj)
+        return obj
+
+
+class ReadWriteLock:
+    """
+    Many readers or one writer. Readers only take the internal mutex to
+    count themselves in and out; they wait only while a writer holds the
+    lock or is queued for it (writers go first, so a steady stream of
+    reads cannot starve them). Not reentrant.
+
+        with lock.reader: ...
+        with lock.writer: ...
+    """
+
+    def __init__(self):
+        self._mutex = threading.Lock()
+        self._changed = threading.Condition(self._mutex)
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+        self.reader = _Reader(self)
+        self.writer = _Writer(self)
+
+    def acquire_read(self):
+        with self._mutex:
+            while self._writer or self._writers_waiting:
+                self._changed.wait()
+            self._readers += 1
+
+    def release_read(self):
+        with self._mutex:
+            self._readers -= 1
+            if not self._readers and self._writers_waiting:
+                self._changed.notify_all()
+
+    def acquire_write(self):
+        with self._mutex:
+            self._writers_waiting += 1
+            try:
+                while self._writer or self._readers:
+                    self._changed.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = True
+
+    def release_write(self):
+        with self._mutex:
+            self._writer = False
+            self._changed.notify_all()
+
+
+class _Reader:
+    __slots__ = ("_lock",)
+
+    def __init__(self, lock):
+        self._lock = lock
+
+    def __enter__(self):
+        self._lock.acquire_read()
+
+    def __exit__(self, *exc):
+        self._lock.release_read()
+
+
+class _Writer:
+    __slots__ = ("_lock",)
+
+    def __init__(self, lock):
+        self._lock = lock
+
+    def __enter__(self):
+        self._lock.acquire_write()
+
+    def __exit__(self, *exc):
+        self._lock.release_write()
+
+
+class _Updated:
+    """Read-only view of `obj` with `changes` applied, for computing index keys"""
+    __slots__ = ("_obj", "_changes")
+
+    def __init__(self, obj, changes):
+        self._obj = obj
+        self._changes = changes
+
+    def __getattr__(self, name):
+        if name in self._changes:
+            return self._changes[name]
+        return getattr(self._obj, name)
+
+
+_CURRENT = object()  # _Index: compute the key from the object as it is now
+
+
+class _Index:
+    """key -> object (unique) or key -> {id: object}; each object's key is kept for removal"""
+
+    def __init__(self, name, unique, key):
+        self.name = name
+        self.unique = unique
+        self.key = key
+        self.entries = {}
+        self._keys = {}  # obj id -> key it is filed under
+
+    def check(self, obj, key=_CURRENT):
+        """Raise ValueError if `obj` filed under `key` (default: its current one) would break uniqueness"""
+        if self.unique:
+            key = self.key(obj) if key is _CURRENT else key
+            other = self.entries.get(key)
+            if other is not None and other.id != obj.id:
+                raise ValueError(f"{type(obj).__name__} with {self.name} {key!r} already exists")
+
+    def insert(self, obj, key=_CURRENT):
+        key = self.key(obj) if key is _CURRENT else key
+        self._keys[obj.id] = key
+        if self.unique:
+            self.entries[key] = obj
+        else:
+            self.entries.setdefault(key, {})[obj.id] = obj
+
+    def remove(self, obj):
+        if obj.id not in self._keys:
+            return
+        key = self._keys.pop(obj.id)
+        if self.unique:
+            if self.entries.get(key) is obj:
+                del self.entries[key]
+        else:
+            bucket = self.entries.get(key, {})
+            bucket.pop(obj.id, None)
+            if not bucket:
+                self.entries.pop(key, None)
@@ -0,0 +1,215 @@
+"""
+Benchmark: InMemoryRepository under concurrent readers and writers.
+
+Stress: writer threads create users from a small pool of emails (so the
+unique index is contended), change emails, move places between owners and
+delete users, while reader threads list and look up. The thread switch
+interval is lowered so threads interleave inside repository calls. When
+all threads are done the repository is checked against itself: one user
+per email, and every index and bucket agreeing with the stored objects.
+Runs with the facade's thread-safe repository and, for comparison, with
+an unlocked one.
+
+Throughput: reads per second over all threads, 1 to --threads readers,
+with and without one writer running, for the locked and unlocked
+repository. CPython's GIL runs one thread at a time, so the total does not
+grow with threads here; what it shows is that readers do not queue behind
+each other (the locked total stays close to the unlocked one at every
+thread count) and keep going while a writer works.
+
+Exits with status 1 when the thread-safe repository ends inconsistent or a
+thread raised an unexpected error.
+
+    python -m benchmarks.repository_concurrency --threads 8 --seconds 2
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+
+from app.business.facade import HBnBFacade
+from app.models.place import Place
+from app.models.user import User
+
+EMAILS = 50
+
+
+def make_place(owner, n):
+    return Place(name=f"Place {n}", description="", city="Jeddah", price_per_night=100,
+                 latitude=21.5, longitude=39.2, owner=owner)
+
+
+def populate(facade, users, places_per_user, rng):
+    owners = [facade.create(User(email=f"user{i}@bench.io", password="x")) for i in range(users)]
+    for n in range(users * places_per_user):
+        facade.create(make_place(rng.choice(owners), n))
+    return owners
+
+
+def run_threads(targets, seconds):
+    """Run each target(stop) in its own thread for `seconds`; [(ops, errors)] per thread"""
+    stop = threading.Event()
+    results = [None] * len(targets)
+
+    def run(i, target):
+        results[i] = target(stop)
+
+    threads = [threading.Thread(target=run, args=(i, t)) for i, t in enumerate(targets)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def writer(facade, seed):
+    rng = random.Random(seed)
+
+    def work(stop):
+        ops, errors = 0, []
+        while not stop.is_set():
+            users = facade.get_users()
+            try:
+                action = rng.random()
+                if action < 0.35 or not users:
+                    facade.create(User(email=f"pool{rng.randrange(EMAILS)}@bench.io", password="x"))
+                elif action < 0.6:
+                    facade.update(rng.choice(users).id, {"email": f"pool{rng.randrange(EMAILS)}@bench.io"})
+                elif action < 0.85:
+                    places = facade.get_places()
+                    if places:
+                        facade.update(rng.choice(places).id, {"owner": rng.choice(users)})
+                else:
+                    facade.delete(rng.choice(users).id)
+            except ValueError:
+                pass  # email taken: the unique index doing its job
+            except Exception as e:
+                errors.append(repr(e))
+            ops += 1
+        return ops, errors
+
+    return work
+
+
+def reader(facade, owner_ids, seed):
+    rng = random.Random(seed)
+
+    def work(stop):
+        ops, errors = 0, []
+        while not stop.is_set():
+            try:
+                action = rng.random()
+                if action < 0.4:
+                    facade.get_user(rng.choice(owner_ids))
+                elif action < 0.7:
+                    facade.get_user_by_email(f"pool{rng.randrange(EMAILS)}@bench.io")
+                elif action < 0.95:
+                    facade.get_places_by_owner(rng.choice(owner_ids))
+                else:
+                    for user in facade.get_users():
+                        user.email
+            except Exception as e:
+                errors.append(repr(e))
+            ops += 1
+        return ops, errors
+
+    return work
+
+
+def check_consistency(facade):
+    """Problems found comparing the stored objects with the buckets and indexes"""
+    repo = facade.repository
+    problems = []
+    users, places = facade.get_users(), facade.get_places()
+
+    emails = [u.email for u in users]
+    duplicates = len(emails) - len(set(emails))
+    if duplicates:
+        problems.append(f"{duplicates} users share an email")
+    for user in users:
+        if facade.get_user_by_email(user.email) is not user and emails.count(user.email) == 1:
+            problems.append(f"email index misses {user.email}")
+    if len(repo._index(User, "email").entries) != len(set(emails)):
+        problems.append("email index has entries for no user")
+
+    for place in places:
+        if place not in facade.get_places_by_owner(place.owner.id):
+            problems.append(f"owner index misses place {place.name}")
+    indexed = sum(len(bucket) for bucket in repo._index(Place, "owner").entries.values())
+    if indexed != len(places):
+        problems.append(f"owner index holds {indexed} places, bucket {len(places)}")
+
+    if repo.count() != len(users) + len(places):
+        problems.append(f"storage holds {repo.count()} objects, buckets {len(users) + len(places)}")
+    return problems
+
+
+def stress(thread_safe, readers, writers, seconds, seed):
+    rng = random.Random(seed)
+    facade = HBnBFacade(thread_safe=thread_safe)
+    owners = populate(facade, 100, 3, rng)
+    owner_ids = [o.id for o in owners]
+    targets = [writer(facade, seed + i) for i in range(writers)]
+    targets += [reader(facade, owner_ids, seed + 100 + i) for i in range(readers)]
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        results = run_threads(targets, seconds)
+    finally:
+        sys.setswitchinterval(interval)
+    errors = [e for _, errs in results for e in errs]
+    return sum(ops for ops, _ in results), errors, check_consistency(facade)
+
+
+def read_throughput(thread_safe, readers, with_writer, seconds, seed):
+    rng = random.Random(seed)
+    facade = HBnBFacade(thread_safe=thread_safe)
+    owners = populate(facade, 2000, 3, rng)
+    owner_ids = [o.id for o in owners]
+    targets = [reader(facade, owner_ids, seed + i) for i in range(readers)]
+    if with_writer:
+        targets.append(writer(facade, seed - 1))
+    results = run_threads(targets, seconds)
+    return sum(ops for ops, _ in results[:readers]) / seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8, help="most reader threads")
+    parser.add_argument("--writers", type=int, default=4, help="writer threads in the stress run")
+    parser.add_argument("--seconds", type=float, default=2.0, help="length of each run")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    failed = False
+    print(f"stress: {args.threads} readers, {args.writers} writers, {args.seconds:g}s each")
+    for thread_safe in (True, False):
+        ops, errors, problems = stress(thread_safe, args.threads, args.writers, args.seconds, args.seed)
+        label = "thread-safe" if thread_safe else "unlocked"
+        print(f"  {label:<12} {ops:>9} ops  {len(errors)} errors  "
+              f"{'consistent' if not problems else 'INCONSISTENT'}")
+        for line in (errors[:3] + problems[:5]):
+            print(f"    {line}")
+        if thread_safe and (errors or problems):
+            failed = True
+
+    counts = sorted({1, 2, 4, args.threads} - {0})
+    counts = [n for n in counts if n <= args.threads]
+    print("\nreads/s over all reader threads")
+    print(f"  {'readers':>7} {'unlocked':>11} {'locked':>11} {'ratio':>6}"
+          f" {'+writer unlocked':>17} {'+writer locked':>15}")
+    for n in counts:
+        row = [read_throughput(safe, n, with_writer, args.seconds / 2, args.seed)
+               for with_writer in (False, True) for safe in (False, True)]
+        print(f"  {n:>7} {row[0]:>11,.0f} {row[1]:>11,.0f} {row[1] / row[0]:>6.2f}"
+              f" {row[2]:>17,.0f} {row[3]:>15,.0f}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
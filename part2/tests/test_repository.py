@@ -0,0 +1,148 @@
+import threading
+import unittest
+from app.business.facade import HBnBFacade
+from app.persistence.repository import ReadWriteLock
+from app.models.user import User
+from app.models.place import Place
+
+
+def make_place(owner, name="Villa"):
+    return Place(name=name, description="", city="Jeddah", price_per_night=100,
+                 latitude=21.5, longitude=39.2, owner=owner)
+
+
+class TestRepositoryIndexes(unittest.TestCase):
+
+    def setUp(self):
+        self.facade = HBnBFacade()
+        self.ali = self.facade.create(User(email="ali@test.com", password="x"))
+        self.sara = self.facade.create(User(email="sara@test.com", password="x"))
+        self.villa = self.facade.create(make_place(self.ali, "Villa"))
+        self.flat = self.facade.create(make_place(self.ali, "Flat"))
+        self.cabin = self.facade.create(make_place(self.sara, "Cabin"))
+
+    def test_typed_lists_and_lookups(self):
+        self.assertEqual(self.facade.get_users(), [self.ali, self.sara])
+        self.assertEqual(self.facade.get_places(), [self.villa, self.flat, self.cabin])
+        self.assertEqual(self.facade.get_amenities(), [])
+        self.assertIs(self.facade.get_place(self.villa.id), self.villa)
+        self.assertIsNone(self.facade.get_user(self.villa.id))
+        self.assertEqual(len(self.facade.get_all()), 5)
+
+    def test_unique_email_index(self):
+        self.assertIs(self.facade.get_user_by_email("sara@test.com"), self.sara)
+        self.assertIsNone(self.facade.get_user_by_email("nobody@test.com"))
+        with self.assertRaises(ValueError):
+            self.facade.create(User(email="ali@test.com", password="y"))
+        self.assertEqual(len(self.facade.get_users()), 2)
+
+    def test_rejected_re_add_keeps_the_stored_object(self):
+        replacement = User(email="sara@test.com", password="x")
+        replacement.id = self.ali.id
+        with self.assertRaises(ValueError):
+            self.facade.create(replacement)
+        self.assertIs(self.facade.get_user(self.ali.id), self.ali)
+        self.assertIs(self.facade.get_user_by_email("ali@test.com"), self.ali)
+        self.assertIs(self.facade.get_user_by_email("sara@test.com"), self.sara)
+
+        # once the email is free, the re-add replaces the object and its entries
+        replacement.email = "ali@again.com"
+        self.facade.create(replacement)
+        self.assertIs(self.facade.get_user(self.ali.id), replacement)
+        self.assertIsNone(self.facade.get_user_by_email("ali@test.com"))
+        self.assertIs(self.facade.get_user_by_email("ali@again.com"), replacement)
+        self.assertEqual(len(self.facade.get_users()), 2)
+
+    def test_indexes_follow_update_and_delete(self):
+        self.facade.update(self.ali.id, {"email": "ali@new.com"})
+        self.assertIsNone(self.facade.get_user_by_email("ali@test.com"))
+        self.assertIs(self.facade.get_user_by_email("ali@new.com"), self.ali)
+
+        # a conflicting update is rejected and leaves the object as it was
+        with self.assertRaises(ValueError):
+            self.facade.update(self.sara.id, {"email": "ali@new.com", "first_name": "Sara"})
+        self.assertEqual((self.sara.email, self.sara.first_name), ("sara@test.com", ""))
+        self.assertIs(self.facade.get_user_by_email("sara@test.com"), self.sara)
+
+        self.assertEqual(self.facade.get_places_by_owner(self.ali.id), [self.villa, self.flat])
+        self.facade.update(self.flat.id, {"owner": self.sara})
+        self.assertEqual(self.facade.get_places_by_owner(self.ali.id), [self.villa])
+        self.assertEqual(self.facade.get_places_by_owner(self.sara.id), [self.cabin, self.flat])
+
+        # a value the index key cannot be computed from is rejected before anything changes
+        with self.assertRaises(AttributeError):
+            self.facade.update(self.villa.id, {"owner": "x", "name": "Broken"})
+        self.assertEqual((self.villa.owner, self.villa.name), (self.ali, "Villa"))
+        self.assertEqual(self.facade.get_places_by_owner(self.ali.id), [self.villa])
+
+        # the id is never updated
+        villa_id = self.villa.id
+        self.facade.update(villa_id, {"id": "other", "name": "Villa 2"})
+        self.assertEqual((self.villa.id, self.villa.name), (villa_id, "Villa 2"))
+        self.assertIs(self.facade.get_place(villa_id), self.villa)
+        self.assertIsNone(self.facade.get("other"))
+
+        self.facade.delete(self.villa.id)
+        self.assertEqual(self.facade.get_places_by_owner(self.ali.id), [])
+        self.assertEqual(self.facade.get_places(), [self.flat, self.cabin])
+        self.assertIsNone(self.facade.get_place(self.villa.id))
+
+
+class TestRepositoryThreads(unittest.TestCase):
+
+    def test_readers_share_the_lock_and_writers_wait(self):
+        lock = ReadWriteLock()
+        both_reading = threading.Barrier(2, timeout=5)
+        events = []
+
+        def read():
+            with lock.reader:
+                both_reading.wait()  # would time out if readers excluded each other
+                events.append("read")
+
+        def write():
+            with lock.writer:
+                events.append("write")
+
+        readers = [threading.Thread(target=read) for _ in range(2)]
+        for thread in readers:
+            thread.start()
+        for thread in readers:
+            thread.join()
+        with lock.reader:
+            writer = threading.Thread(target=write)
+            writer.start()
+            writer.join(0.1)
+            self.assertTrue(writer.is_alive())
+        writer.join()
+        self.assertEqual(events, ["read", "read", "write"])
+
+    def test_concurrent_creates_keep_emails_unique(self):
+        facade = HBnBFacade()
+        start = threading.Barrier(8)
+        created = []
+
+        def register(n):
+            start.wait()
+            for i in range(50):
+                try:
+                    created.append(facade.create(User(email=f"user{i}@test.com", password=str(n))))
+                except ValueError:
+                    pass
+                facade.get_users()
+
+        threads = [threading.Thread(target=register, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(created), 50)
+        self.assertEqual(sorted(u.email for u in facade.get_users()),
+                         sorted(f"user{i}@test.com" for i in range(50)))
+        for user in created:
+            self.assertIs(facade.get_user_by_email(user.email), user)
+
+
+if __name__ == "__main__":
+    unittest.main()
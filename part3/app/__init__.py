@@ -1,9 +1,16 @@
 # app/__init__.py
 from flask import Flask
-from flask_restx import Api
 from flask_cors import CORS
 from config import config
 from app.extensions import db, bcrypt, jwt
+from app.cache import init_app as init_response_cache
+from app.sqlite import configure_sqlite
+from app.pool import init_app as init_pool_stats
+from app.metrics import init_app as init_metrics
+from app.replicas import init_app as init_replicas
+from app.passwords import init_app as init_password_hasher
+from app.schema import setup_schema
+from app.swagger import CachedSpecApi
 
 
 def create_app(config_class="development"):
@@ -12,18 +19,35 @@ def create_app(config_class="development"):
 
     # Extensions
     bcrypt.init_app(app)
+    init_password_hasher(app)
     jwt.init_app(app)
     db.init_app(app)
+    init_response_cache(app)
+    init_replicas(app)
 
     # 🔥 مهم جداً: استيراد كل المودلز قبل create_all
+    # (create_all in development only; migrations elsewhere, see app/schema.py)
     from app.models.user import User
     from app.models.place import Place
     from app.models.review import Review
     from app.models.amenity import Amenity
+    from app import search  # noqa: F401  FTS5 tables and triggers, created with places/reviews
 
-    # Create DB tables (development only)
     with app.app_context():
-        db.create_all()
+        configure_sqlite(db.engine, app.config.get("SQLITE_PRAGMAS"))
+        init_pool_stats(app, db.engine)
+        router = app.extensions.get("replica_router")
+        init_metrics(app, [db.engine] + (router.engines if router else []))
+        setup_schema(app)
+
+    from app.identity import init_app as init_user_cache
+    init_user_cache(app)
+    from app.amenity_index import init_app as init_amenity_index
+    init_amenity_index(app)
+
+    # CLI commands (flask --app run <command>)
+    from app.commands import register_commands
+    register_commands(app)
 
     # CORS
     CORS(
@@ -33,8 +57,10 @@ def create_app(config_class="development"):
         methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     )
 
-    # API
-    api = Api(app, title="HBnB API", version="1.0", prefix="/api/v1")
+    # API (swagger.json is built on first request, see app/swagger.py)
+    api = CachedSpecApi(app, title="HBnB API", version="1.0", prefix="/api/v1")
+    from app.serializers import output_json
+    api.representation("application/json")(output_json)
 
     # Register namespaces
     from app.api.v1.places import api as places_ns
@@ -42,11 +68,13 @@ def create_app(config_class="development"):
     from app.api.v1.reviews import api as reviews_ns
     from app.api.v1.amenities import api as amenities_ns
     from app.api.v1.users import api as users_ns
+    from app.api.v1.internal import api as internal_ns
 
     api.add_namespace(places_ns)
     api.add_namespace(auth_ns)
     api.add_namespace(reviews_ns)
     api.add_namespace(amenities_ns)
     api.add_namespace(users_ns)
+    api.add_namespace(internal_ns)
 
     return app
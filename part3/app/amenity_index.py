@@ -0,0 +1,252 @@
+# app/amenity_index.py
+"""
+In-memory amenity -> places inverted index.
+
+Every place gets a dense bit position; every amenity a Python int used as a
+bitmap of the places that have it. "Places with all of these amenities" is
+the AND of a few bitmaps, a handful of microseconds even for 100k places.
+
+The index is built from place_amenities on first use and then kept up to
+date by session events: links added or removed on Place.amenities /
+Amenity.places, new or renamed amenities, deleted places and deleted
+amenities are collected at flush and applied after the commit, or dropped
+on rollback. Writes that bypass the unit of work (Core bulk inserts)
+queue their changes with record_changes(). It is per
+process, so it is also rebuilt when older than AMENITY_INDEX_MAX_AGE
+seconds to pick up other workers' writes. Positions of deleted places are
+reused by new ones, so the position table does not grow between rebuilds.
+"""
+import threading
+import time
+from itertools import compress
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, inspect, select
+
+from app.extensions import db
+from app.models import Amenity, Place
+from app.models.place import place_amenities
+from app.replicas import RoutingSession
+
+
+class AmenityIndex:
+    def __init__(self, max_age=300):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._built_at = None
+        self._bitmaps = {}        # amenity id -> int bitmap of place positions
+        self._names = {}          # lower-cased amenity name -> amenity id
+        self._positions = {}      # place id -> bit position
+        self._place_ids = []      # bit position -> place id (None if free)
+        self._free = []           # positions of deleted places, reused first
+
+    # ---------- building ----------
+    def _position(self, place_id):
+        pos = self._positions.get(place_id)
+        if pos is None:
+            if self._free:
+                pos = self._free.pop()
+                self._place_ids[pos] = place_id
+            else:
+                pos = len(self._place_ids)
+                self._place_ids.append(place_id)
+            self._positions[place_id] = pos
+        return pos
+
+    def build(self, session):
+        """Load every amenity and link; replaces the current contents"""
+        amenities = session.execute(select(Amenity.id, Amenity.name)).all()
+        links = session.execute(
+            select(place_amenities.c.place_id, place_amenities.c.amenity_id)
+        ).all()
+        with self._lock:
+            self._positions, self._place_ids, self._free = {}, [], []
+            self._names = {}
+            self._bitmaps = {}
+            for amenity_id, name in amenities:
+                self._add_amenity(amenity_id, name)
+            positions = {}
+            for place_id, amenity_id in links:
+                positions.setdefault(amenity_id, []).append(self._position(place_id))
+            for amenity_id, bits in positions.items():
+                # set all bits of one amenity at once instead of one int per link
+                self._bitmaps[amenity_id] = int.from_bytes(_bitset(bits), "little")
+            self._built_at = time.monotonic()
+
+    def _add_amenity(self, amenity_id, name):
+        self._bitmaps.setdefault(amenity_id, 0)
+        if name:
+            self._names[name.lower()] = amenity_id
+
+    def is_fresh(self):
+        return self._built_at is not None and time.monotonic() - self._built_at < self.max_age
+
+    def invalidate(self):
+        """Force a full rebuild on next use"""
+        self._built_at = None
+
+    # ---------- incremental updates ----------
+    def apply(self, ops):
+        with self._lock:
+            if self._built_at is None:
+                return
+            for op, *args in ops:
+                if op == "link":
+                    place_id, amenity_id = args
+                    bit = 1 << self._position(place_id)
+                    self._bitmaps[amenity_id] = self._bitmaps.get(amenity_id, 0) | bit
+                elif op == "unlink":
+                    place_id, amenity_id = args
+                    pos = self._positions.get(place_id)
+                    if pos is not None and amenity_id in self._bitmaps:
+                        self._bitmaps[amenity_id] &= ~(1 << pos)
+                elif op == "drop_place":
+                    pos = self._positions.pop(args[0], None)
+                    if pos is not None:
+                        mask = ~(1 << pos)
+                        for amenity_id in self._bitmaps:
+                            self._bitmaps[amenity_id] &= mask
+                        self._place_ids[pos] = None
+                        self._free.append(pos)
+                elif op == "amenity":
+                    amenity_id, name = args
+                    if amenity_id in self._bitmaps:
+                        # a rename: the old name no longer resolves
+                        self._names = {n: a for n, a in self._names.items() if a != amenity_id}
+                    self._add_amenity(amenity_id, name)
+                elif op == "drop_amenity":
+                    self._bitmaps.pop(args[0], None)
+                    self._names = {n: a for n, a in self._names.items() if a != args[0]}
+
+    # ---------- queries ----------
+    def resolve(self, key):
+        """Amenity id for an id or a (case-insensitive) name, or None"""
+        if key in self._bitmaps:
+            return key
+        return self._names.get(key.lower())
+
+    def bitmap_all(self, keys):
+        """AND of the bitmaps of `keys` (ids or names); 0 if any is unknown"""
+        with self._lock:
+            return self._bitmap_all(keys)
+
+    def _bitmap_all(self, keys):
+        result = None
+        for key in keys:
+            amenity_id = self.resolve(key)
+            if amenity_id is None:
+                return 0
+            bitmap = self._bitmaps[amenity_id]
+            result = bitmap if result is None else result & bitmap
+            if not result:
+                return 0
+        return result or 0
+
+    def place_ids(self, bitmap):
+        """Place ids of the bits of `bitmap`, which must come from the current positions"""
+        with self._lock:
+            return self._decode(bitmap)
+
+    def _decode(self, bitmap):
+        if bitmap.bit_count() <= 64:
+            ids = []
+            while bitmap:
+                low = bitmap & -bitmap
+                ids.append(self._place_ids[low.bit_length() - 1])
+                bitmap ^= low
+            return ids
+        # "0"/"1" digits, lowest bit first, as 0/1 bytes: compress() picks the
+        # ids in C instead of peeling bits off a large int one at a time
+        bits = format(bitmap, "b")[::-1].encode("ascii").translate(_DIGIT_BITS)
+        return list(compress(self._place_ids, bits))
+
+    def places_with_all(self, keys, max_results=None):
+        """
+        Return the ids of the places having every amenity in `keys`, or None
+        if there are more than max_results of them (the caller filters in SQL).
+        """
+        # one lock for both steps: a build() in between would renumber the
+        # positions and map the bits to the wrong places
+        with self._lock:
+            bitmap = self._bitmap_all(keys)
+            if max_results is not None and bitmap.bit_count() > max_results:
+                return None
+            return self._decode(bitmap)
+
+
+_DIGIT_BITS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def _bitset(positions):
+    data = bytearray(max(positions) // 8 + 1)
+    for pos in positions:
+        data[pos >> 3] |= 1 << (pos & 7)
+    return bytes(data)
+
+
+def init_app(app):
+    app.extensions["amenity_index"] = AmenityIndex(
+        max_age=app.config.get("AMENITY_INDEX_MAX_AGE", 300),
+    )
+
+
+def get_amenity_index():
+    """The app's index, (re)built from the database when missing or too old"""
+    index = current_app.extensions.get("amenity_index")
+    if index is not None and not index.is_fresh():
+        index.build(db.session)
+    return index
+
+
+# ---------- keeping the index in sync ----------
+def _history(obj, attr):
+    return inspect(obj).attrs[attr].history
+
+
+def record_changes(session, ops):
+    """Queue index ops for writes the flush does not see; applied after the commit"""
+    session.info.setdefault("amenity_index_ops", []).extend(ops)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _collect_changes(session, flush_context):
+    ops = session.info.setdefault("amenity_index_ops", [])
+    for obj in session.new | session.dirty:
+        if isinstance(obj, Place):
+            added, _, removed = _history(obj, "amenities")
+            ops += [("link", obj.id, a.id) for a in added]
+            ops += [("unlink", obj.id, a.id) for a in removed]
+        elif isinstance(obj, Amenity):
+            if obj in session.new or _history(obj, "name").has_changes():
+                ops.append(("amenity", obj.id, obj.name))
+            added, _, removed = _history(obj, "places")
+            ops += [("link", p.id, obj.id) for p in added]
+            ops += [("unlink", p.id, obj.id) for p in removed]
+    for obj in session.deleted:
+        if isinstance(obj, Place):
+            ops.append(("drop_place", obj.id))
+        elif isinstance(obj, Amenity):
+            ops.append(("drop_amenity", obj.id))
+
+
+@event.listens_for(RoutingSession, "after_soft_rollback")
+def _rolled_back(session, previous_transaction):
+    ops = session.info.pop("amenity_index_ops", None)
+    if previous_transaction.nested and ops:
+        # a savepoint rolled back: which flushed links survived is unknown
+        session.info["amenity_index_stale"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _apply_changes(session):
+    ops = session.info.pop("amenity_index_ops", None)
+    stale = session.info.pop("amenity_index_stale", False)
+    if not (ops or stale) or not has_app_context():
+        return
+    index = current_app.extensions.get("amenity_index")
+    if index is None:
+        return
+    if stale:
+        index.invalidate()
+    else:
+        index.apply(ops)
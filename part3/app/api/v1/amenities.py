@@ -1,7 +1,13 @@
+from flask import request
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt
+from sqlalchemy.exc import IntegrityError
 from app.business.facade import HBnBFacade
 from app.models.amenity import Amenity
+from app.repositories.pagination import parse_limit
+from app.cache import cached_response
+from app.serializers import serialize_amenity
+from app.batch import run_batch
 
 facade = HBnBFacade()
 
@@ -24,18 +30,22 @@ def _admin_only():
 @api.route("/")
 class AmenityList(Resource):
     @api.response(200, "List of amenities retrieved successfully")
+    @api.doc(params={
+        "limit": "Page size (default 50, max 200)",
+        "cursor": "Opaque cursor returned as next_cursor by the previous page",
+    })
+    @cached_response("amenities")
     def get(self):
-        amenities = [a for a in facade.get_all() if isinstance(a, Amenity)]
-        return [
-            {
-                "id": a.id,
-                "name": a.name,
-                "description": getattr(a, "description", None),
-                "created_at": a.created_at.isoformat() if a.created_at else None,
-                "updated_at": a.updated_at.isoformat() if a.updated_at else None,
-            }
-            for a in amenities
-        ], 200
+        try:
+            limit = parse_limit(request.args.get("limit"))
+            amenities, next_cursor = facade.get_amenities_page(limit, request.args.get("cursor"))
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        return {
+            "amenities": [serialize_amenity(a) for a in amenities],
+            "next_cursor": next_cursor,
+        }, 200
 
     @jwt_required()
     @api.expect(amenity_model, validate=True)
@@ -55,15 +65,33 @@ class AmenityList(Resource):
         if "description" in data:
             new_amenity.description = data["description"]
 
-        created = facade.create(new_amenity)
+        try:
+            with facade.transaction():
+                created = facade.create(new_amenity)
+        except IntegrityError:
+            return {"error": "Amenity already exists"}, 400
 
-        return {
-            "id": created.id,
-            "name": created.name,
-            "description": getattr(created, "description", None),
-            "created_at": created.created_at.isoformat() if created.created_at else None,
-            "updated_at": created.updated_at.isoformat() if created.updated_at else None,
-        }, 201
+        return serialize_amenity(created), 201
+
+
+@api.route("/batch")
+class AmenityBatch(Resource):
+    @jwt_required()
+    @api.doc(params={"mode": "atomic (default): all or nothing; partial: insert the valid items"})
+    @api.response(403, "Admin only")
+    def post(self):
+        if not _admin_only():
+            return {"error": "Admin only"}, 403
+
+        def build(item):
+            if not item.get("name"):
+                raise ValueError("Amenity name is required")
+            amenity = Amenity(name=item["name"])
+            if "description" in item:
+                amenity.description = item["description"]
+            return amenity
+
+        return run_batch(build, facade.create_many, serialize_amenity)
 
 
 @api.route("/<string:amenity_id>")
@@ -71,17 +99,11 @@ class AmenityResource(Resource):
     @api.response(200, "Amenity details retrieved successfully")
     @api.response(404, "Amenity not found")
     def get(self, amenity_id):
-        a = facade.get(amenity_id)
-        if not a or not isinstance(a, Amenity):
+        a = facade.get_amenity(amenity_id)
+        if not a:
             return {"error": "Amenity not found"}, 404
 
-        return {
-            "id": a.id,
-            "name": a.name,
-            "description": getattr(a, "description", None),
-            "created_at": a.created_at.isoformat() if a.created_at else None,
-            "updated_at": a.updated_at.isoformat() if a.updated_at else None,
-        }, 200
+        return serialize_amenity(a), 200
 
     @jwt_required()
     @api.expect(amenity_model)
@@ -92,20 +114,18 @@ class AmenityResource(Resource):
         if not _admin_only():
             return {"error": "Admin only"}, 403
 
-        a = facade.get(amenity_id)
-        if not a or not isinstance(a, Amenity):
+        a = facade.get_amenity(amenity_id)
+        if not a:
             return {"error": "Amenity not found"}, 404
 
         data = api.payload or {}
-        updated = facade.update(amenity_id, data)
+        try:
+            with facade.transaction():
+                updated = facade.update(a, data)
+        except IntegrityError:
+            return {"error": "Amenity already exists"}, 400
 
-        return {
-            "id": updated.id,
-            "name": updated.name,
-            "description": getattr(updated, "description", None),
-            "created_at": updated.created_at.isoformat() if updated.created_at else None,
-            "updated_at": updated.updated_at.isoformat() if updated.updated_at else None,
-        }, 200
+        return serialize_amenity(updated), 200
 
     @jwt_required()
     @api.response(204, "Amenity deleted successfully")
@@ -115,9 +135,9 @@ class AmenityResource(Resource):
         if not _admin_only():
             return {"error": "Admin only"}, 403
 
-        a = facade.get(amenity_id)
-        if not a or not isinstance(a, Amenity):
+        a = facade.get_amenity(amenity_id)
+        if not a:
             return {"error": "Amenity not found"}, 404
 
-        facade.delete(amenity_id)
+        facade.delete(a)
         return "", 204
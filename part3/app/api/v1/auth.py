@@ -1,9 +1,14 @@
 # app/api/v1/auth.py
 from flask_restx import Namespace, Resource, fields
+from app.business.facade import HBnBFacade
 from app.models.user import User
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from app.passwords import PasswordHasherBusy
+from app.identity import get_current_user
+from app.serializers import serialize_user
+from flask_jwt_extended import create_access_token, jwt_required
 
 
+facade = HBnBFacade()
 api = Namespace("auth", description="Authentication operations")
 
 login_model = api.model("Login", {
@@ -18,8 +23,15 @@ class Login(Resource):
         data = api.payload or {}
 
         user = User.query.filter_by(email=data["email"]).first()
-        if not user or not user.check_password(data["password"]):
-            return {"error": "Invalid credentials"}, 401
+        try:
+            if not user or not user.check_password(data["password"]):
+                return {"error": "Invalid credentials"}, 401
+
+            # upgrade hashes made with a previous BCRYPT_LOG_ROUNDS
+            if user.password_needs_rehash():
+                facade.rehash_password(user, data["password"])
+        except PasswordHasherBusy as e:
+            return {"error": str(e)}, 503
 
         # identity = user.id ، ونضيف claim is_admin
         token = create_access_token(
@@ -31,15 +43,8 @@ class Login(Resource):
 class Me(Resource):
     @jwt_required()
     def get(self):
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = get_current_user()
         if not user:
             return {"error": "User not found"}, 404
 
-        return {
-            "id": user.id,
-            "email": user.email,
-            "first_name": user.first_name,
-            "last_name": user.last_name,
-            "is_admin": user.is_admin,
-        }, 200
+        return serialize_user(user), 200
@@ -0,0 +1,20 @@
+# app/api/v1/internal.py
+from flask_restx import Namespace, Resource
+from flask_jwt_extended import jwt_required, get_jwt
+from app.pool import get_pool_stats
+
+api = Namespace("internal", description="Operational endpoints (admin only)")
+
+
+@api.route("/pool")
+class PoolStatus(Resource):
+    @jwt_required()
+    @api.response(200, "Connection pool statistics")
+    @api.response(403, "Admin only")
+    def get(self):
+        if not get_jwt().get("is_admin"):
+            return {"error": "Admin only"}, 403
+        stats = get_pool_stats()
+        if stats is None:
+            return {"error": "Pool statistics are not enabled"}, 404
+        return stats.snapshot(), 200
@@ -1,11 +1,21 @@
 # app/api/v1/places.py
+from flask import request
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
+from sqlalchemy.exc import IntegrityError
 from app.business.facade import HBnBFacade
 from app.models.place import Place
-from app.models.user import User
 from app.models.review import Review
-from app.extensions import db
+from app.repositories.pagination import parse_limit
+from app.cache import cached_response
+from app.batch import run_batch
+from app.streaming import STREAM_BATCH_SIZE, stream_response, wants_stream
+from app.identity import get_current_user
+from app.serializers import (
+    serialize_place,
+    serialize_place_detail,
+    serialize_review_with_author,
+)
 
 facade = HBnBFacade()
 api = Namespace("places", description="Place operations")
@@ -20,156 +30,267 @@ place_model = api.model(
         "latitude": fields.Float(required=True),
         "longitude": fields.Float(required=True),
         # REMOVE owner_id from input for authenticated flow
+        "amenities": fields.List(fields.String, required=False,
+                                 description="Amenity ids (on update: added to the place's amenities)"),
     },
 )
 
+def _float_arg(name, required=False, low=None, high=None):
+    value = request.args.get(name)
+    if value in (None, ""):
+        if required:
+            raise ValueError(f"{name} is required")
+        return None
+    try:
+        value = float(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number")
+    if (low is not None and value < low) or (high is not None and value > high):
+        raise ValueError(f"{name} must be between {low} and {high}")
+    return value
+
+
+def _list_arg(name):
+    """Comma-separated query argument -> list of non-empty values (or None)"""
+    values = [v.strip() for v in request.args.get(name, "").split(",") if v.strip()]
+    return values or None
+
+
+def _place_with_distance(p, distance_km):
+    out = serialize_place(p)
+    out["distance_km"] = round(distance_km, 3)
+    return out
+
+
 @api.route("/")
 class PlaceList(Resource):
+    @api.doc(params={
+        "limit": "Page size (default 50, max 200)",
+        "cursor": "Opaque cursor returned as next_cursor by the previous page",
+        "min_price": "Minimum price per night",
+        "max_price": "Maximum price per night",
+        "city": "Exact city name",
+        "amenity": "Amenity id or name the place must have",
+        "amenities": "Comma-separated amenity ids or names the place must all have",
+        "stream": "1 to stream every matching place (or send Accept: application/x-ndjson)",
+    })
+    @cached_response("places", "amenities")
     def get(self):
-        places = facade.get_places()
-        return [{
-            "id": p.id,
-            "name": p.name,
-            "description": p.description,
-            "city": p.city,
-            "price_per_night": p.price_per_night,
-            "latitude": p.latitude,
-            "longitude": p.longitude,
-            "owner_id": p.owner_id,
-            "amenities": [a.id for a in (p.amenities or [])],
-            "created_at": p.created_at.isoformat() if p.created_at else None,
-            "updated_at": p.updated_at.isoformat() if p.updated_at else None,
-        } for p in places], 200
+        try:
+            filters = {
+                "min_price": _float_arg("min_price"),
+                "max_price": _float_arg("max_price"),
+                "city": request.args.get("city") or None,
+                "amenity": request.args.get("amenity") or None,
+                "amenities": _list_arg("amenities"),
+            }
+            if wants_stream():
+                rows = facade.iter_places(STREAM_BATCH_SIZE, **filters)
+                return stream_response("places", rows, serialize_place)
+
+            limit = parse_limit(request.args.get("limit"))
+            places, next_cursor = facade.get_places_page(
+                limit, request.args.get("cursor"), **filters
+            )
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        return {
+            "places": [serialize_place(p) for p in places],
+            "next_cursor": next_cursor,
+        }, 200
 
     @jwt_required()
     @api.expect(place_model, validate=True)
     def post(self):
         data = api.payload or {}
 
-        user_id = get_jwt_identity()
-        owner = User.query.get(user_id)
+        owner = get_current_user()
+        if not owner:
+            return {"error": "Owner not found"}, 400
+
+        # place + amenity links are committed together, or not at all
+        try:
+            with facade.transaction():
+                new_place = Place(
+                    name=data["name"],
+                    description=data.get("description", ""),
+                    city=data["city"],
+                    price_per_night=data["price_per_night"],
+                    latitude=data["latitude"],
+                    longitude=data["longitude"],
+                    owner_id=owner.id,
+                )
+                created = facade.create(new_place)
+                if data.get("amenities"):
+                    facade.add_place_amenities(created, data["amenities"])
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        return serialize_place(created), 201
+
+
+@api.route("/batch")
+class PlaceBatch(Resource):
+    @jwt_required()
+    @api.doc(params={"mode": "atomic (default): all or nothing; partial: insert the valid items"})
+    def post(self):
+        owner = get_current_user()
         if not owner:
             return {"error": "Owner not found"}, 400
 
-        new_place = Place(
-            name=data["name"],
-            description=data.get("description", ""),
-            city=data["city"],
-            price_per_night=data["price_per_night"],
-            latitude=data["latitude"],
-            longitude=data["longitude"],
-            owner_id=owner.id,
-        )
-
-        created = facade.create(new_place)
+        def build(item):
+            if not item.get("city"):
+                raise ValueError("city is required")
+            return Place(
+                name=item["name"],
+                description=item.get("description", ""),
+                city=item["city"],
+                price_per_night=item["price_per_night"],
+                latitude=item["latitude"],
+                longitude=item["longitude"],
+                owner_id=owner.id,
+            )
+
+        return run_batch(build, facade.create_many, serialize_place)
+
+
+@api.route("/nearby")
+class PlacesNearby(Resource):
+    @api.doc(params={
+        "lat": "Latitude of the search centre",
+        "lon": "Longitude of the search centre",
+        "radius_km": "Search radius in kilometres (max 1000)",
+        "limit": "Maximum number of results (default 50, max 200)",
+    })
+    def get(self):
+        try:
+            lat = _float_arg("lat", required=True, low=-90, high=90)
+            lon = _float_arg("lon", required=True, low=-180, high=180)
+            radius_km = _float_arg("radius_km", required=True, low=0, high=1000)
+            limit = parse_limit(request.args.get("limit"))
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        hits = facade.get_places_near(lat, lon, radius_km, limit)
+        return {"places": [_place_with_distance(p, d) for p, d in hits]}, 200
+
+
+@api.route("/within")
+class PlacesWithin(Resource):
+    @api.doc(params={
+        "min_lat": "South edge of the box",
+        "min_lon": "West edge of the box (may be greater than max_lon across the antimeridian)",
+        "max_lat": "North edge of the box",
+        "max_lon": "East edge of the box",
+        "limit": "Maximum number of results (default 50, max 200)",
+    })
+    def get(self):
+        try:
+            min_lat = _float_arg("min_lat", required=True, low=-90, high=90)
+            min_lon = _float_arg("min_lon", required=True, low=-180, high=180)
+            max_lat = _float_arg("max_lat", required=True, low=-90, high=90)
+            max_lon = _float_arg("max_lon", required=True, low=-180, high=180)
+            limit = parse_limit(request.args.get("limit"))
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        if min_lat > max_lat:
+            return {"error": "min_lat must not exceed max_lat"}, 400
+
+        # ordered by distance from the centre of the box
+        hits = facade.get_places_in_box(min_lat, min_lon, max_lat, max_lon, limit)
+        return {"places": [_place_with_distance(p, d) for p, d in hits]}, 200
+
+
+@api.route("/search")
+class PlaceSearch(Resource):
+    @api.doc(params={
+        "q": "Keywords matched against place names, descriptions and review text",
+        "limit": "Maximum number of results (default 50, max 200)",
+    })
+    @cached_response("places", "reviews")
+    def get(self):
+        try:
+            limit = parse_limit(request.args.get("limit"))
+            hits = facade.search_places(request.args.get("q", ""), limit)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        # ranked by relevance, higher score first
         return {
-            "id": created.id,
-            "name": created.name,
-            "description": created.description,
-            "city": created.city,
-            "price_per_night": created.price_per_night,
-            "latitude": created.latitude,
-            "longitude": created.longitude,
-            "owner_id": created.owner_id,
-            "amenities": [a.id for a in (created.amenities or [])],
-            "created_at": created.created_at.isoformat() if created.created_at else None,
-            "updated_at": created.updated_at.isoformat() if created.updated_at else None,
-        }, 201
+            "places": [dict(serialize_place(p), score=round(score, 4)) for p, score in hits],
+        }, 200
 
 
 @api.route("/<string:place_id>")
 class PlaceResource(Resource):
+    @cached_response("place:{place_id}", "users", "amenities")
     def get(self, place_id):
-        p = Place.query.get(place_id)
+        p = facade.get_place(place_id, with_owner=True)
         if not p:
             return {"error": "Place not found"}, 404
 
-        owner = User.query.get(p.owner_id)
-
-        return {
-            "id": p.id,
-            "name": p.name,
-            "description": p.description,
-            "city": p.city,
-            "price_per_night": p.price_per_night,
-            "latitude": p.latitude,
-            "longitude": p.longitude,
-            "owner_id": p.owner_id,
-
-            # ✅ اسم الهوست
-            "host_name": f"{owner.first_name} {owner.last_name}" if owner else None,
-
-            "amenities": [a.id for a in (p.amenities or [])],
-            "created_at": p.created_at.isoformat() if p.created_at else None,
-            "updated_at": p.updated_at.isoformat() if p.updated_at else None,
-        }, 200
+        # ✅ اسم الهوست (host_name), loaded with the place
+        return serialize_place_detail(p), 200
 
     @jwt_required()
     @api.expect(place_model)
     def put(self, place_id):
-        p = Place.query.get(place_id)
-        if not p:
-            return {"error": "Place not found"}, 404
-
-        claims = get_jwt()
-        user_id = get_jwt_identity()
-        if not claims.get("is_admin") and p.owner_id != user_id:
-            return {"error": "admin only"}, 403
-
-        data = api.payload or {}
+        data = dict(api.payload or {})
         data.pop("owner_id", None)
+        # a relationship, not a column: linked by id like on create
+        amenity_ids = data.pop("amenities", None)
 
-        updated = facade.update(place_id, data)
+        # the ownership check and the update see the same row; an unknown
+        # amenity rolls the whole update back
+        try:
+            with facade.transaction():
+                p = facade.get_place(place_id, with_owner=True)
+                if not p:
+                    return {"error": "Place not found"}, 404
 
-        owner = User.query.get(updated.owner_id)
+                claims = get_jwt()
+                user_id = get_jwt_identity()
+                if not claims.get("is_admin") and p.owner_id != user_id:
+                    return {"error": "admin only"}, 403
 
-        return {
-            "id": updated.id,
-            "name": updated.name,
-            "description": updated.description,
-            "city": updated.city,
-            "price_per_night": updated.price_per_night,
-            "latitude": updated.latitude,
-            "longitude": updated.longitude,
-            "owner_id": updated.owner_id,
-
-            # ✅ اسم الهوست بعد التحديث
-            "host_name": f"{owner.first_name} {owner.last_name}" if owner else None,
-
-            "amenities": [a.id for a in (updated.amenities or [])],
-            "created_at": updated.created_at.isoformat() if updated.created_at else None,
-            "updated_at": updated.updated_at.isoformat() if updated.updated_at else None,
-        }, 200
+                updated = facade.update(p, data)
+                if amenity_ids:
+                    facade.add_place_amenities(updated, amenity_ids)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        # ✅ اسم الهوست بعد التحديث
+        return serialize_place_detail(updated), 200
 
 
 
 @api.route("/<string:place_id>/reviews")
 class PlaceReviews(Resource):
 
+    @api.doc(params={
+        "limit": "Page size (default 50, max 200)",
+        "cursor": "Opaque cursor returned as next_cursor by the previous page",
+    })
+    @cached_response("place:{place_id}", "users")
     def get(self, place_id):
-        place = Place.query.get(place_id)
-        if not place:
+        # existence only: loading the place would also load its amenities
+        if not facade.existing_place_ids([place_id]):
             return {"error": "Place not found"}, 404
 
-        out = []
-        for r in (place.reviews or []):
-            u = User.query.get(r.user_id)
-
-            out.append({
-                "id": r.id,
-                "text": r.text,
-                "rating": r.rating,
-                "user_id": r.user_id,
-
-                # ✅ اسم اليوزر بدل UUID
-                "user_name": f"{u.first_name} {u.last_name}" if u else None,
-
-                "place_id": r.place_id,
-                "created_at": r.created_at.isoformat() if r.created_at else None,
-                "updated_at": r.updated_at.isoformat() if r.updated_at else None,
-            })
-
-        return out, 200
+        try:
+            limit = parse_limit(request.args.get("limit"))
+            reviews, next_cursor = facade.get_reviews_page(
+                limit, request.args.get("cursor"), place_id=place_id
+            )
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        # ✅ اسم اليوزر بدل UUID; r.user is loaded by the same query (joinedload)
+        return {
+            "reviews": [serialize_review_with_author(r) for r in reviews],
+            "next_cursor": next_cursor,
+        }, 200
 
     @jwt_required()
     def post(self, place_id):
@@ -189,36 +310,32 @@ class PlaceReviews(Resource):
         if rating < 1 or rating > 5:
             return {"error": "Rating must be between 1 and 5"}, 400
 
-        place = Place.query.get(place_id)
-        if not place:
-            return {"error": "Place not found"}, 404
-
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        if not user:
-            return {"error": "User not found"}, 404
-
-        # ✅ منع الأدمن من كتابة reviews
-        if getattr(user, "is_admin", False):
-            return {"error": "Admins are not allowed to create reviews"}, 403
-
-        review = Review(
-            text=text,
-            rating=rating,
-            user_id=user_id,
-            place_id=place_id
-        )
-
-        db.session.add(review)
-        db.session.commit()
-
-        return {
-            "id": review.id,
-            "text": review.text,
-            "rating": review.rating,
-            "user_id": review.user_id,
-            "user_name": f"{user.first_name} {user.last_name}",
-            "place_id": review.place_id,
-            "created_at": review.created_at.isoformat() if review.created_at else None,
-            "updated_at": review.updated_at.isoformat() if review.updated_at else None,
-        }, 201
+        # checks and write share one transaction; the review and the place's
+        # rating aggregates are committed once
+        try:
+            with facade.transaction():
+                if not facade.existing_place_ids([place_id]):
+                    return {"error": "Place not found"}, 404
+
+                user = get_current_user()
+                if not user:
+                    return {"error": "User not found"}, 404
+                user_id = user.id
+
+                # ✅ منع الأدمن من كتابة reviews
+                if getattr(user, "is_admin", False):
+                    return {"error": "Admins are not allowed to create reviews"}, 403
+
+                review = Review(
+                    text=text,
+                    rating=rating,
+                    user_id=user_id,
+                    place_id=place_id
+                )
+
+                # goes through the repository so the place's rating aggregates are updated
+                facade.create(review)
+        except IntegrityError:
+            return {"error": "User already reviewed this place"}, 400
+
+        return serialize_review_with_author(review), 201
@@ -1,10 +1,14 @@
 # app/api/v1/reviews.py
+from flask import request
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from app.business.facade import HBnBFacade
 from app.models.review import Review
-from app.models.user import User
-from app.models.place import Place
+from app.repositories.pagination import parse_limit
+from app.batch import run_batch
+from app.streaming import STREAM_BATCH_SIZE, stream_response, wants_stream
+from app.serializers import serialize_review, serialize_review_with_author
+from app.identity import get_current_user
 from sqlalchemy.exc import IntegrityError
 facade = HBnBFacade()
 api = Namespace("reviews", description="Review operations")
@@ -20,119 +24,144 @@ review_model = api.model(
 
 @api.route("/")
 class ReviewList(Resource):
+    @api.doc(params={
+        "limit": "Page size (default 50, max 200)",
+        "cursor": "Opaque cursor returned as next_cursor by the previous page",
+        "stream": "1 to stream every review (or send Accept: application/x-ndjson)",
+    })
     def get(self):
-        reviews = Review.query.all()
-        return [{
-            "id": r.id,
-            "text": r.text,
-            "rating": r.rating,
-            "user_id": r.user_id,
-            "place_id": r.place_id,
-            "created_at": r.created_at.isoformat() if r.created_at else None,
-            "updated_at": r.updated_at.isoformat() if r.updated_at else None,
-        } for r in reviews], 200
+        if wants_stream():
+            rows = facade.iter_reviews(STREAM_BATCH_SIZE)
+            return stream_response("reviews", rows, serialize_review_with_author)
+
+        try:
+            limit = parse_limit(request.args.get("limit"))
+            reviews, next_cursor = facade.get_reviews_page(limit, request.args.get("cursor"))
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        return {
+            "reviews": [serialize_review_with_author(r) for r in reviews],
+            "next_cursor": next_cursor,
+        }, 200
+
     @jwt_required()
     @api.expect(review_model, validate=True)
     def post(self):
         data = api.payload or {}
 
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = get_current_user()
         if not user:
             return {"error": "User not found"}, 400
 
-        place = Place.query.get(data["place_id"])
-        if not place:
-            return {"error": "Place not found"}, 400
-
         try:
-            new_review = Review(
-                text=data["text"],
-                rating=data["rating"],
-                user_id=user.id,
-                place_id=place.id,
-            )
-        except ValueError as e:
-            return {"error": str(e)}, 400
-
-      
-        try:
-            created = facade.create(new_review)
+            # the place check and the insert share one write-locked transaction
+            with facade.transaction():
+                place = facade.get_place(data["place_id"])
+                if not place:
+                    return {"error": "Place not found"}, 400
+
+                new_review = Review(
+                    text=data["text"],
+                    rating=data["rating"],
+                    user_id=user.id,
+                    place_id=place.id,
+                )
+                created = facade.create(new_review)
         except IntegrityError:
             return {"error": "User already reviewed this place"}, 400
         except ValueError as e:
             # لو facade يسوي validations ويرمي ValueError
             return {"error": str(e)}, 400
 
-        return {
-            "id": created.id,
-            "text": created.text,
-            "rating": created.rating,
-            "user_id": created.user_id,
-            "place_id": created.place_id,
-            "created_at": created.created_at.isoformat() if created.created_at else None,
-            "updated_at": created.updated_at.isoformat() if created.updated_at else None,
-        }, 201
+        return serialize_review(created), 201
+
+
+@api.route("/batch")
+class ReviewBatch(Resource):
+    @jwt_required()
+    @api.doc(params={"mode": "atomic (default): all or nothing; partial: insert the valid items"})
+    def post(self):
+        user = get_current_user()
+        if not user:
+            return {"error": "User not found"}, 400
+        # same rule as POST /places/<id>/reviews
+        if getattr(user, "is_admin", False):
+            return {"error": "Admins are not allowed to create reviews"}, 403
+
+        items = request.get_json(silent=True)
+        place_ids = [i.get("place_id") for i in items if isinstance(i, dict)] if isinstance(items, list) else []
+        place_ids = [pid for pid in place_ids if isinstance(pid, str)]
+        # one IN query for every referenced place, one for the user's reviews of them
+        existing = facade.existing_place_ids(place_ids)
+        reviewed = facade.reviewed_place_ids(user.id, place_ids)
+
+        def build(item):
+            if item.get("place_id") not in existing:
+                raise ValueError("Place not found")
+            rating = item.get("rating")
+            if not isinstance(rating, int) or isinstance(rating, bool):
+                raise ValueError("Rating must be an integer")
+            if item["place_id"] in reviewed:
+                raise ValueError("User already reviewed this place")
+            review = Review(
+                text=item["text"],
+                rating=item["rating"],
+                user_id=user.id,
+                place_id=item["place_id"],
+            )
+            # one review per place within the batch too
+            reviewed.add(review.place_id)
+            return review
+
+        return run_batch(build, facade.create_many, serialize_review)
 
 
 @api.route("/<string:review_id>")
 class ReviewResource(Resource):
     def get(self, review_id):
-        r = Review.query.get(review_id)
+        r = facade.get_review(review_id)
         if not r:
             return {"error": "Review not found"}, 404
-        return {
-            "id": r.id,
-            "text": r.text,
-            "rating": r.rating,
-            "user_id": r.user_id,
-            "place_id": r.place_id,
-            "created_at": r.created_at.isoformat() if r.created_at else None,
-            "updated_at": r.updated_at.isoformat() if r.updated_at else None,
-        }, 200
+        return serialize_review(r), 200
 
     @jwt_required()
     def put(self, review_id):
-        r = Review.query.get(review_id)
-        if not r:
-            return {"error": "Review not found"}, 404
-
-        claims = get_jwt()
-        user_id = get_jwt_identity()
-        if not claims.get("is_admin") and r.user_id != user_id:
-            return {"error": "Forbidden"}, 403
-
-        data = api.payload or {}
-        data.pop("user_id", None)
-        data.pop("place_id", None)
-
-        updated = facade.update(review_id, data)
+        try:
+            # the rating aggregates are adjusted from the rating read here,
+            # so no other write may land in between
+            with facade.transaction():
+                r = facade.get_review(review_id)
+                if not r:
+                    return {"error": "Review not found"}, 404
+
+                claims = get_jwt()
+                user_id = get_jwt_identity()
+                if not claims.get("is_admin") and r.user_id != user_id:
+                    return {"error": "Forbidden"}, 403
+
+                data = api.payload or {}
+                data.pop("user_id", None)
+                data.pop("place_id", None)
+
+                updated = facade.update(r, data)
+        except ValueError as e:
+            return {"error": str(e)}, 400
 
-        return {
-            "id": updated.id,
-            "text": updated.text,
-            "rating": updated.rating,
-            "user_id": updated.user_id,
-            "place_id": updated.place_id,
-            "created_at": updated.created_at.isoformat() if updated.created_at else None,
-            "updated_at": updated.updated_at.isoformat() if updated.updated_at else None,
-        }, 200
+        return serialize_review(updated), 200
 
     @jwt_required()
     def delete(self, review_id):
-        r = Review.query.get(review_id)
-        if not r:
-            return {"error": "Review not found"}, 404
+        with facade.transaction():
+            r = facade.get_review(review_id)
+            if not r:
+                return {"error": "Review not found"}, 404
 
-        claims = get_jwt()
-        user_id = get_jwt_identity()
-        if not claims.get("is_admin") and r.user_id != user_id:
-            return {"error": "Admin only"}, 403
-        r = facade.get(review_id)
-        if not r or not isinstance(r, Review):
-            
-            return {"error": "Review not found"}, 404
+            claims = get_jwt()
+            user_id = get_jwt_identity()
+            if not claims.get("is_admin") and r.user_id != user_id:
+                return {"error": "Admin only"}, 403
 
-        facade.delete(review_id)
+            facade.delete(r)
         return "", 204
 
@@ -4,6 +4,10 @@ from flask_restx import Namespace, Resource
 from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
 from app.business.facade import HBnBFacade
 from app.models.user import User
+from app.passwords import PasswordHasherBusy
+from app.repositories.pagination import parse_limit
+from app.streaming import STREAM_BATCH_SIZE, stream_response, wants_stream
+from app.serializers import serialize_user, serialize_new_user
 
 facade = HBnBFacade()
 api = Namespace("users", description="User operations")
@@ -17,17 +21,20 @@ class UsersList(Resource):
         if not claims.get("is_admin"):
             return {"error": "Forbidden"}, 403
 
-        users = User.query.all()
-        return [
-            {
-                "id": u.id,
-                "email": u.email,
-                "first_name": u.first_name,
-                "last_name": u.last_name,
-                "is_admin": u.is_admin,
-            }
-            for u in users
-        ], 200
+        if wants_stream():
+            rows = facade.iter_users(STREAM_BATCH_SIZE)
+            return stream_response("users", rows, serialize_user)
+
+        try:
+            limit = parse_limit(request.args.get("limit"))
+            users, next_cursor = facade.get_users_page(limit, request.args.get("cursor"))
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        return {
+            "users": [serialize_user(u) for u in users],
+            "next_cursor": next_cursor,
+        }, 200
 
     def post(self):
         data = request.get_json() or {}
@@ -43,16 +50,14 @@ class UsersList(Resource):
             first_name=data.get("first_name", ""),
             last_name=data.get("last_name", ""),
         )
-        user.set_password(data["password"])
+        try:
+            user.set_password(data["password"])
+        except PasswordHasherBusy as e:
+            return {"error": str(e)}, 503
 
         created = facade.create(user)
 
-        return {
-            "id": created.id,
-            "email": created.email,
-            "first_name": created.first_name,
-            "last_name": created.last_name,
-        }, 201
+        return serialize_new_user(created), 201
 
 
 @api.route("/<string:user_id>")
@@ -65,17 +70,11 @@ class UserDetail(Resource):
         if not claims.get("is_admin") and current_user_id != user_id:
             return {"error": "Forbidden"}, 403
 
-        user = User.query.get(user_id)
+        user = facade.get_user(user_id)
         if not user:
             return {"error": "User not found"}, 404
 
-        return {
-            "id": user.id,
-            "email": user.email,
-            "first_name": user.first_name,
-            "last_name": user.last_name,
-            "is_admin": user.is_admin,
-        }, 200
+        return serialize_user(user), 200
 
     @jwt_required()
     def put(self, user_id):
@@ -85,7 +84,7 @@ class UserDetail(Resource):
         if not claims.get("is_admin") and current_user_id != user_id:
             return {"error": "Forbidden"}, 403
 
-        user = User.query.get(user_id)
+        user = facade.get_user(user_id)
         if not user:
             return {"error": "User not found"}, 404
 
@@ -95,20 +94,16 @@ class UserDetail(Resource):
         if claims.get("is_admin"):
             allowed.add("is_admin")
 
-        for k, v in data.items():
-            if k in allowed:
-                setattr(user, k, v)
+        changes = {k: v for k, v in data.items() if k in allowed}
 
         if "password" in data and data["password"]:
             if claims.get("is_admin") or current_user_id == user_id:
-                user.set_password(data["password"])
+                try:
+                    user.set_password(data["password"])
+                except PasswordHasherBusy as e:
+                    return {"error": str(e)}, 503
 
-        facade.create(user)  # commit (create uses session.add+commit)
+        # commits the password too and drops the user from the identity cache
+        facade.update(user, changes)
 
-        return {
-            "id": user.id,
-            "email": user.email,
-            "first_name": user.first_name,
-            "last_name": user.last_name,
-            "is_admin": user.is_admin,
-        }, 200
+        return serialize_user(user), 200
@@ -0,0 +1,64 @@
+# app/batch.py
+"""
+Shared flow for the POST /<entity>/batch endpoints.
+
+Every item is validated with the model constructor first; valid items are
+then inserted by the repository with one bulk statement and one commit.
+`?mode=atomic` (default) rejects the whole batch if any item is invalid,
+`?mode=partial` inserts the valid items and reports the rest by index.
+If the insert itself fails (a constraint, a check in the repository),
+nothing is inserted and the batch gets a 400.
+"""
+from flask import request
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+
+BATCH_MAX_ITEMS = 1000
+MODES = ("atomic", "partial")
+
+
+def _error_message(e):
+    if isinstance(e, KeyError):
+        return f"{e.args[0]} is required"
+    if isinstance(e, TypeError):
+        return "Invalid field type"
+    return str(e)
+
+
+def run_batch(build, bulk_insert, serialize):
+    """
+    Validate request.json items with `build(item) -> model`, insert them with
+    `bulk_insert([models])` and return a (body, status) response.
+    """
+    mode = request.args.get("mode", "atomic")
+    if mode not in MODES:
+        return {"error": "mode must be 'atomic' or 'partial'"}, 400
+
+    items = request.get_json(silent=True)
+    if not isinstance(items, list) or not items:
+        return {"error": "Request body must be a non-empty JSON array"}, 400
+    if len(items) > BATCH_MAX_ITEMS:
+        return {"error": f"At most {BATCH_MAX_ITEMS} items per batch"}, 400
+
+    valid, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            if not isinstance(item, dict):
+                raise ValueError("Item must be an object")
+            valid.append((index, build(item)))
+        except (ValueError, KeyError, TypeError) as e:
+            errors.append({"index": index, "error": _error_message(e)})
+
+    if errors and (mode == "atomic" or not valid):
+        return {"created": [], "errors": errors}, 400
+
+    try:
+        bulk_insert([obj for _, obj in valid])
+    except (ValueError, IntegrityError) as e:
+        db.session.rollback()
+        message = "Batch conflicts with existing data" if isinstance(e, IntegrityError) else str(e)
+        return {"created": [], "errors": [{"index": None, "error": message}]}, 400
+
+    created = [dict(serialize(obj), index=index) for index, obj in valid]
+    return {"created": created, "errors": errors}, 207 if errors else 201
@@ -9,6 +9,17 @@ class HBnBFacade:
     def __init__(self):
         self.repo = SQLAlchemyRepository()
 
+    # ---------- Unit of work ----------
+    def transaction(self):
+        """
+        Context manager committing every write made inside it at once:
+
+            with facade.transaction():
+                facade.create(place)
+                facade.add_place_amenities(place, amenity_ids)
+        """
+        return self.repo.transaction()
+
     # ---------- Create ----------
     def create(self, obj):
         cls_name = obj.__class__.__name__
@@ -24,8 +35,44 @@ class HBnBFacade:
 
         raise ValueError(f"Unsupported object type: {cls_name}")
 
+    def create_many(self, objs):
+        """Insert a list of validated objects of one type in a single transaction"""
+        if not objs:
+            return []
+        cls_name = objs[0].__class__.__name__
+
+        if cls_name == "Place":
+            return self.repo.bulk_add_places(objs)
+        if cls_name == "Review":
+            return self.repo.bulk_add_reviews(objs)
+        if cls_name == "Amenity":
+            return self.repo.bulk_add_amenities(objs)
+
+        raise ValueError(f"Unsupported object type: {cls_name}")
+
+    def add_place_amenities(self, place, amenity_ids):
+        """Attach amenities by id; raises ValueError naming any unknown id"""
+        amenities = self.repo.get_amenities_by_ids(amenity_ids)
+        missing = set(amenity_ids) - {a.id for a in amenities}
+        if missing:
+            raise ValueError(f"Amenity not found: {', '.join(sorted(missing))}")
+        return self.repo.add_place_amenities(place, amenities)
+
     # ---------- Read ----------
+    def get_user(self, user_id):
+        return self.repo.get_user_by_id(user_id)
+
+    def get_place(self, place_id, with_owner=False):
+        return self.repo.get_place_by_id(place_id, with_owner)
+
+    def get_review(self, review_id):
+        return self.repo.get_review_by_id(review_id)
+
+    def get_amenity(self, amenity_id):
+        return self.repo.get_amenity_by_id(amenity_id)
+
     def get(self, obj_id):
+        """Untyped lookup: probes up to four tables. Prefer get_user/get_place/..."""
         for getter in (
             self.repo.get_user_by_id,
             self.repo.get_place_by_id,
@@ -38,6 +85,7 @@ class HBnBFacade:
         return None
 
     def get_all(self):
+        """Load every entity of every type. Prefer the typed *_page methods"""
         return (
             self.repo.list_users()
             + self.repo.list_places()
@@ -48,36 +96,87 @@ class HBnBFacade:
     def get_places(self):
         return self.repo.list_places()
 
+    def get_users_page(self, limit, cursor=None):
+        return self.repo.list_users_page(limit=limit, cursor=cursor)
+
+    def get_amenities_page(self, limit, cursor=None):
+        return self.repo.list_amenities_page(limit=limit, cursor=cursor)
+
+    def existing_place_ids(self, place_ids):
+        return self.repo.existing_place_ids(place_ids)
+
+    def reviewed_place_ids(self, user_id, place_ids):
+        return self.repo.reviewed_place_ids(user_id, place_ids)
+
+    def get_places_page(self, limit, cursor=None, **filters):
+        return self.repo.list_places_page(limit=limit, cursor=cursor, **filters)
+
+    def get_reviews_page(self, limit, cursor=None, place_id=None):
+        return self.repo.list_reviews_page(limit=limit, cursor=cursor, place_id=place_id)
+
+    def iter_places(self, batch_size, **filters):
+        return self.repo.iter_places(batch_size, **filters)
+
+    def iter_reviews(self, batch_size, place_id=None):
+        return self.repo.iter_reviews(batch_size, place_id=place_id)
+
+    def iter_users(self, batch_size):
+        return self.repo.iter_users(batch_size)
+
+    def search_places(self, query, limit):
+        return self.repo.search_places(query, limit=limit)
+
+    def get_places_near(self, lat, lon, radius_km, limit):
+        return self.repo.list_places_near(lat, lon, radius_km, limit=limit)
+
+    def get_places_in_box(self, min_lat, min_lon, max_lat, max_lon, limit):
+        return self.repo.list_places_in_box(min_lat, min_lon, max_lat, max_lon, limit=limit)
+
+    def rebuild_rating_aggregates(self):
+        return self.repo.rebuild_rating_aggregates()
+
+    def rebuild_search_index(self):
+        return self.repo.rebuild_search_index()
+
     # ---------- Update ----------
-    def update(self, obj_id, data):
-        obj = self.get(obj_id)
+    def update(self, obj, data):
+        """Update a loaded instance in place (an id is accepted but costs a lookup)"""
+        if isinstance(obj, str):
+            obj = self.get(obj)
         if not obj:
             return None
 
         if isinstance(obj, User):
-            return self.repo.update_user(obj_id, data)
+            return self.repo.update_user(obj, data)
         if isinstance(obj, Place):
-            return self.repo.update_place(obj_id, data)
+            return self.repo.update_place(obj, data)
         if isinstance(obj, Review):
-            return self.repo.update_review(obj_id, data)
+            return self.repo.update_review(obj, data)
         if isinstance(obj, Amenity):
-            return self.repo.update_amenity(obj_id, data)
+            return self.repo.update_amenity(obj, data)
 
         return None
 
+    def rehash_password(self, user, plain_password):
+        """Store a new hash of a verified password, e.g. after BCRYPT_LOG_ROUNDS changed"""
+        user.set_password(plain_password)
+        return self.repo.set_user_password(user, user.password)
+
     # ---------- Delete ----------
-    def delete(self, obj_id):
-        obj = self.get(obj_id)
+    def delete(self, obj):
+        """Delete a loaded instance (an id is accepted but costs a lookup)"""
+        if isinstance(obj, str):
+            obj = self.get(obj)
         if not obj:
             return False
 
         if isinstance(obj, User):
-            return self.repo.delete_user(obj_id)
+            return self.repo.delete_user(obj)
         if isinstance(obj, Place):
-            return self.repo.delete_place(obj_id)
+            return self.repo.delete_place(obj)
         if isinstance(obj, Review):
-            return self.repo.delete_review(obj_id)
+            return self.repo.delete_review(obj)
         if isinstance(obj, Amenity):
-            return self.repo.delete_amenity(obj_id)
+            return self.repo.delete_amenity(obj)
 
         return False
@@ -0,0 +1,191 @@
+# app/cache.py
+"""
+In-process response cache for read endpoints.
+
+Responses are stored per request path and media type with a strong ETag, a TTL and a set
+of tags. Repository write methods invalidate by tag ("places",
+"place:<id>", ...), so a cached entry lives until the data it was built
+from changes or its TTL runs out. The cache is per process: with several
+workers, the TTL bounds how long another worker can serve a stale entry.
+
+With read replicas (app/replicas.py) the first read after an invalidation
+may come from a replica that has not caught up with the write yet. For
+REPLICA_STICKY_SECONDS after a tag is invalidated, responses with that tag
+that were read from a replica are served but not stored, so a lagging
+replica cannot put the old data back for a whole TTL.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import Response, current_app, g, has_app_context, request
+
+# invalidation times kept before the first sweep of settled ones
+SETTLE_PRUNE_MIN = 1024
+
+
+class CacheEntry:
+    __slots__ = ("data", "status", "etag", "tags", "expires_at")
+
+    def __init__(self, data, status, etag, tags, expires_at):
+        self.data = data
+        self.status = status
+        self.etag = etag
+        self.tags = tags
+        self.expires_at = expires_at
+
+
+class ResponseCache:
+    """LRU + TTL cache of response payloads, invalidated by tag"""
+
+    def __init__(self, max_entries=1024, ttl=30, settle_seconds=0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # how long after an invalidation a replica may still return the old data
+        self.settle_seconds = settle_seconds
+        self._entries = OrderedDict()
+        self._keys_by_tag = {}
+        self._settling_until = {}
+        self._prune_at = SETTLE_PRUNE_MIN
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, data, status, tags, ttl=None, store=True):
+        """Build the entry and store it unless `store` is false"""
+        body = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+        etag = hashlib.sha1(body.encode("utf-8")).hexdigest()
+        entry = CacheEntry(
+            data, status, etag, frozenset(tags),
+            time.monotonic() + (self.ttl if ttl is None else ttl),
+        )
+        if not store or self.max_entries <= 0:
+            return entry
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            for tag in entry.tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+        return entry
+
+    def invalidate(self, *tags):
+        now = time.monotonic()
+        with self._lock:
+            for tag in tags:
+                for key in list(self._keys_by_tag.get(tag, ())):
+                    self._remove(key)
+                if self.settle_seconds > 0:
+                    self._settling_until[tag] = now + self.settle_seconds
+            if len(self._settling_until) >= self._prune_at:
+                self._settling_until = {t: u for t, u in self._settling_until.items() if u > now}
+                self._prune_at = max(2 * len(self._settling_until), SETTLE_PRUNE_MIN)
+
+    def settling(self, tags):
+        """True if any of `tags` was invalidated less than settle_seconds ago"""
+        now = time.monotonic()
+        with self._lock:
+            return any(self._settling_until.get(tag, 0) > now for tag in tags)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_tag.clear()
+            self._settling_until.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+
+def init_app(app):
+    app.extensions["response_cache"] = ResponseCache(
+        max_entries=app.config.get("RESPONSE_CACHE_MAX_ENTRIES", 1024),
+        ttl=app.config.get("RESPONSE_CACHE_TTL", 30),
+        settle_seconds=app.config.get("REPLICA_STICKY_SECONDS", 5)
+        if app.config.get("DATABASE_REPLICA_URIS") else 0,
+    )
+
+
+def get_response_cache():
+    return current_app.extensions.get("response_cache")
+
+
+def register_invalidation_target(app, target):
+    """Have invalidate() also call `target.invalidate(*tags)` (e.g. the user cache)"""
+    app.extensions.setdefault("invalidation_targets", []).append(target)
+
+
+def invalidate(*tags):
+    """Drop cached entries tagged with any of `tags` (no-op outside an app)"""
+    if not has_app_context():
+        return
+    cache = get_response_cache()
+    if cache is not None:
+        cache.invalidate(*tags)
+    for target in current_app.extensions.get("invalidation_targets", ()):
+        target.invalidate(*tags)
+
+
+def cached_response(*tags, ttl=None):
+    """
+    Cache a Resource GET method's 200 responses and answer If-None-Match.
+
+    Tags may reference the view arguments, e.g. "place:{place_id}".
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            cache = get_response_cache()
+            # a caller pinned to the primary (app/replicas.py) must see its own writes
+            if cache is None or g.get("read_primary"):
+                return fn(*args, **kwargs)
+
+            # the representation is part of the key (JSON vs NDJSON streams)
+            key = f"{request.accept_mimetypes.best or ''} {request.full_path}"
+            entry = cache.get(key)
+            if entry is None:
+                g.replica_read = False
+                result = fn(*args, **kwargs)
+                if isinstance(result, Response):
+                    # streamed or otherwise pre-built responses are not cached
+                    return result
+                data, status = result if isinstance(result, tuple) else (result, 200)
+                if status != 200:
+                    return result
+                entry_tags = [t.format(**kwargs) for t in tags]
+                # the replica may not have the write behind a recent invalidation yet
+                store = not (g.replica_read and cache.settling(entry_tags))
+                entry = cache.set(key, data, status, entry_tags, ttl, store=store)
+
+            headers = {"ETag": f'"{entry.etag}"', "Cache-Control": "no-cache"}
+            if request.if_none_match.contains(entry.etag):
+                return Response(status=304, headers=headers)
+            return entry.data, entry.status, headers
+        return wrapper
+    return decorator
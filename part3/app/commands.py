@@ -0,0 +1,167 @@
+# app/commands.py
+import os
+
+import click
+from flask.cli import with_appcontext
+
+
+@click.command("rebuild-rating-aggregates")
+@with_appcontext
+def rebuild_rating_aggregates_command():
+    """Recompute rating_sum, review_count and the star histogram for every place."""
+    from app.business.facade import HBnBFacade
+
+    count = HBnBFacade().rebuild_rating_aggregates()
+    click.echo(f"Rebuilt rating aggregates for {count} places")
+
+
+@click.command("sync-sqlite-replicas")
+@with_appcontext
+def sync_sqlite_replicas_command():
+    """Copy the primary SQLite database over every SQLite replica (local setups)."""
+    import sqlite3
+    from app.extensions import db
+    from app.replicas import get_router
+
+    primary = db.engine.url
+    if primary.get_backend_name() != "sqlite" or not primary.database:
+        raise click.ClickException("The primary database is not a SQLite file")
+
+    router = get_router()
+    synced = 0
+    for engine in (router.engines if router else []):
+        if engine.url.get_backend_name() != "sqlite":
+            continue
+        engine.dispose()
+        # the backup API takes a consistent snapshot, even in WAL mode
+        with sqlite3.connect(primary.database) as src, sqlite3.connect(engine.url.database) as dst:
+            src.backup(dst)
+        synced += 1
+    click.echo(f"Synced {synced} SQLite replica(s)")
+
+
+@click.command("rebuild-search-index")
+@with_appcontext
+def rebuild_search_index_command():
+    """Create the full-text search tables if needed and re-index all places and reviews."""
+    from app.business.facade import HBnBFacade
+
+    counts = HBnBFacade().rebuild_search_index()
+    click.echo(", ".join(f"{fts}: {rows} rows" for fts, rows in counts.items()))
+
+
+@click.command("db-upgrade")
+@click.option("--to", "target", type=int, default=None, help="Stop at this version.")
+@with_appcontext
+def db_upgrade_command(target):
+    """Apply pending schema migrations (migrations/*.sql)."""
+    from app.extensions import db
+    from app.schema import upgrade
+
+    connection = db.session.connection()
+    applied = upgrade(connection, target)
+    db.session.commit()
+    for m in applied:
+        click.echo(f"Applied {m.version:04d}_{m.name}")
+    click.echo(f"Schema is at version {_schema_version()}")
+
+
+@click.command("db-stamp")
+@click.option("--to", "version", type=int, default=None, help="Stamp up to this version.")
+@with_appcontext
+def db_stamp_command(version):
+    """Mark migrations as applied without running them (databases made by create_all)."""
+    from app.extensions import db
+    from app.schema import stamp
+
+    stamped = stamp(db.session.connection(), version)
+    db.session.commit()
+    click.echo(f"Stamped {len(stamped)} migration(s); schema is at version {_schema_version()}")
+
+
+@click.command("db-version")
+@with_appcontext
+def db_version_command():
+    """Show the database schema version and the latest migration."""
+    from app.schema import latest_version
+
+    click.echo(f"Database: {_schema_version()}, latest migration: {latest_version()}")
+
+
+def _schema_version():
+    from app.extensions import db
+    from app.schema import current_version
+
+    return current_version(db.session.connection())
+
+
+@click.command("build-swagger")
+@with_appcontext
+def build_swagger_command():
+    """Build swagger.json into SWAGGER_CACHE ahead of the first request."""
+    from flask import current_app
+
+    if not current_app.config.get("SWAGGER_CACHE"):
+        raise click.ClickException("SWAGGER_CACHE is not set")
+    res = current_app.test_client().get("/api/v1/swagger.json")
+    if res.status_code != 200:
+        raise click.ClickException(f"swagger.json failed with {res.status_code}")
+    click.echo(f"Wrote {os.path.join(current_app.instance_path, current_app.config['SWAGGER_CACHE'])}")
+
+
+@click.command("seed-data")
+@click.option("--users", type=int, default=1000, show_default=True)
+@click.option("--places", type=int, default=10000, show_default=True)
+@click.option("--reviews", type=int, default=100000, show_default=True)
+@click.option("--amenities", type=int, default=20, show_default=True)
+@click.option("--amenities-per-place", type=int, default=5, show_default=True)
+@click.option("--review-skew", type=float, default=1.0, show_default=True,
+              help="Zipf exponent of reviews per place (0 = uniform).")
+@click.option("--clusters", type=int, default=8, show_default=True, help="Cities places are grouped around.")
+@click.option("--city-skew", type=float, default=1.0, show_default=True, help="Zipf exponent of city sizes.")
+@click.option("--spread-km", type=float, default=10.0, show_default=True, help="Spread around a city centre.")
+@click.option("--seed", type=int, default=42, show_default=True)
+@click.option("--chunk-size", type=int, default=50000, show_default=True)
+@click.option("--password", default="password123", show_default=True, help="Password of every user.")
+@click.option("--reset", is_flag=True, help="Delete all existing data first.")
+@with_appcontext
+def seed_data_command(reset, password, **options):
+    """Bulk-generate synthetic users, places, reviews and amenities (one transaction)."""
+    import time
+    from app.extensions import db
+    from app.passwords import get_hasher
+    from app import seeding
+
+    def progress(step, rows, seconds):
+        if rows is None:
+            click.echo(f"  {step:<24} {'':>12} {seconds:>8.1f}s")
+        else:
+            click.echo(f"  {step:<24} {rows:>12,} {seconds:>8.1f}s {rows / max(seconds, 1e-9):>12,.0f} rows/s")
+
+    start = time.perf_counter()
+    connection = db.session.connection()
+    if reset:
+        seeding.reset(connection)
+    elif not seeding.is_empty(connection):
+        raise click.ClickException("The database already has data: pass --reset to replace it")
+    try:
+        stats = seeding.generate(connection, get_hasher().hash(password), progress=progress, **options)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    db.session.commit()
+
+    elapsed = time.perf_counter() - start
+    rows = sum(count for step, (count, _) in stats.items() if step not in ("indexes", "search index"))
+    click.echo(f"Inserted {rows:,} rows in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s); "
+               f"users log in as {seeding.seed_email(0)} / {password}")
+
+
+def register_commands(app):
+    app.cli.add_command(rebuild_rating_aggregates_command)
+    app.cli.add_command(sync_sqlite_replicas_command)
+    app.cli.add_command(rebuild_search_index_command)
+    app.cli.add_command(db_upgrade_command)
+    app.cli.add_command(db_stamp_command)
+    app.cli.add_command(db_version_command)
+    app.cli.add_command(build_swagger_command)
+    app.cli.add_command(seed_data_command)
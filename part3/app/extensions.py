@@ -2,7 +2,12 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
+from app.replicas import RoutingSession
 
-db = SQLAlchemy()
+# Sessions live for one request (app context). Objects are not expired on
+# commit: a handler serializing what it just wrote would otherwise reload
+# every row. Columns assigned SQL expressions (rating aggregates) are still
+# expired at flush and reloaded on access.
+db = SQLAlchemy(session_options={"class_": RoutingSession, "expire_on_commit": False})
 bcrypt = Bcrypt()
 jwt = JWTManager()
@@ -0,0 +1,151 @@
+# app/geo.py
+"""
+Fixed-size lat/lon grid used as a spatial index for places.
+
+Each place stores the integer id of the grid cell it falls in
+(row * GRID_COLS + col). Cells on one grid row are numbered contiguously,
+so a bounding box becomes one BETWEEN range per row on the indexed
+`places.geocell` column instead of a full table scan.
+"""
+import math
+
+CELL_DEG = 0.1  # ~11 km of latitude per row
+GRID_ROWS = int(round(180 / CELL_DEG))
+GRID_COLS = int(round(360 / CELL_DEG))
+EARTH_RADIUS_KM = 6371.0088
+
+# Above this many grid rows the per-row ranges are collapsed into one range
+# spanning whole rows; the exact lat/lon check still trims the result.
+MAX_ROW_RANGES = 256
+
+# search_windows(): the first window is 1/WINDOW_GROWTH**2 of the box, each
+# next one WINDOW_GROWTH times larger, so the box is reached by the third
+WINDOW_GROWTH = 4
+
+
+def _row(lat):
+    return min(max(int((lat + 90.0) / CELL_DEG), 0), GRID_ROWS - 1)
+
+
+def _col(lon):
+    return min(max(int((lon + 180.0) / CELL_DEG), 0), GRID_COLS - 1)
+
+
+def grid_cell(lat, lon):
+    """Return the grid cell id containing (lat, lon)"""
+    if lat is None or lon is None:
+        return None
+    return _row(lat) * GRID_COLS + _col(lon)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance between two points in kilometres"""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(lat, lon, radius_km):
+    """
+    Return (min_lat, min_lon, max_lat, max_lon) enclosing a circle.
+
+    min_lon > max_lon means the box crosses the antimeridian.
+    """
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = lat - dlat, lat + dlat
+    if min_lat <= -90 or max_lat >= 90:
+        # circle covers a pole: every longitude is in range
+        return max(min_lat, -90.0), -180.0, min(max_lat, 90.0), 180.0
+
+    dlon = math.degrees(radius_km / (EARTH_RADIUS_KM * math.cos(math.radians(lat))))
+    if dlon >= 180:
+        return min_lat, -180.0, max_lat, 180.0
+
+    min_lon, max_lon = lon - dlon, lon + dlon
+    if min_lon < -180:
+        min_lon += 360
+    if max_lon > 180:
+        max_lon -= 360
+    return min_lat, min_lon, max_lat, max_lon
+
+
+def cell_ranges(min_lat, min_lon, max_lat, max_lon):
+    """Return the (lo, hi) grid cell id ranges covering a bounding box"""
+    row_lo, row_hi = _row(min_lat), _row(max_lat)
+
+    if min_lon <= max_lon:
+        col_spans = [(_col(min_lon), _col(max_lon))]
+    else:
+        col_spans = [(_col(min_lon), GRID_COLS - 1), (0, _col(max_lon))]
+
+    full_width = col_spans == [(0, GRID_COLS - 1)]
+    if full_width or row_hi - row_lo + 1 > MAX_ROW_RANGES:
+        return [(row_lo * GRID_COLS, row_hi * GRID_COLS + GRID_COLS - 1)]
+
+    return [
+        (row * GRID_COLS + c_lo, row * GRID_COLS + c_hi)
+        for row in range(row_lo, row_hi + 1)
+        for c_lo, c_hi in col_spans
+    ]
+
+
+def _wrap_lon(lon):
+    if lon < -180:
+        return lon + 360
+    if lon > 180:
+        return lon - 360
+    return lon
+
+
+def _meridian_km(lat, dlon):
+    """Distance from (lat, lon) to the meridian dlon degrees (< 90) east or west of it"""
+    return EARTH_RADIUS_KM * math.asin(math.cos(math.radians(lat)) * math.sin(math.radians(dlon)))
+
+
+def search_windows(min_lat, min_lon, max_lat, max_lon, center):
+    """
+    Yield (window, covered_km) for boxes growing around `center`, clipped to
+    the bounding box: every point of the box within covered_km of the
+    centre lies inside the window. The last window is the box itself, with
+    covered_km = inf.
+    """
+    c_lat, c_lon = center
+    west, east = (c_lon - min_lon) % 360, (max_lon - c_lon) % 360
+    if min_lon == -180 and max_lon == 180:
+        west, east = c_lon + 180, 180 - c_lon
+    # windows roughly square on the ground: wider in longitude towards the poles
+    lon_scale = 1 / max(math.cos(math.radians(c_lat)), 0.01)
+    extent = max(c_lat - min_lat, max_lat - c_lat, west / lon_scale, east / lon_scale)
+
+    h = max(CELL_DEG, extent / WINDOW_GROWTH ** 2)
+    while True:
+        h_lon = h * lon_scale
+        s_lat, n_lat = max(min_lat, c_lat - h), min(max_lat, c_lat + h)
+        w, e = min(west, h_lon), min(east, h_lon)
+        edges = []
+        if n_lat < max_lat or s_lat > min_lat:
+            edges.append(EARTH_RADIUS_KM * math.radians(h))
+        if (w < west or e < east) and h_lon < 90:
+            edges.append(_meridian_km(c_lat, h_lon))
+        if not edges or h_lon >= 90:
+            yield (min_lat, min_lon, max_lat, max_lon), math.inf
+            return
+        yield (s_lat, _wrap_lon(c_lon - w), n_lat, _wrap_lon(c_lon + e)), min(edges)
+        h *= WINDOW_GROWTH
+
+
+def box_center(min_lat, min_lon, max_lat, max_lon):
+    lon = (min_lon + max_lon) / 2
+    if min_lon > max_lon:
+        lon = lon + 180 if lon <= 0 else lon - 180
+    return (min_lat + max_lat) / 2, lon
+
+
+def in_box(lat, lon, min_lat, min_lon, max_lat, max_lon):
+    if not (min_lat <= lat <= max_lat):
+        return False
+    if min_lon <= max_lon:
+        return min_lon <= lon <= max_lon
+    return lon >= min_lon or lon <= max_lon
@@ -0,0 +1,130 @@
+# app/identity.py
+"""
+Current user for JWT-authenticated requests.
+
+get_current_user() resolves the token's identity lazily, at most once per
+request (memoized on `g`), so endpoints that only authorize with claims
+(is_admin(), get_jwt_identity()) never touch the users table.
+
+Lookups go through a process-wide UserCache of column snapshots with a
+short TTL (USER_CACHE_TTL seconds). A hit is attached to the request's
+session with merge(load=False), which costs no SQL. Repository writes
+to a user invalidate its "user:<id>" tag; other processes see the change
+when the TTL runs out.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, g
+from flask_jwt_extended import get_jwt, get_jwt_identity
+from sqlalchemy.orm import make_transient_to_detached, object_session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.cache import register_invalidation_target
+from app.extensions import db
+from app.models import User
+
+_MISSING = object()
+
+
+class UserCache:
+    """TTL + LRU map of user id -> column values, invalidated by "user:<id>" tags"""
+
+    def __init__(self, max_entries=10000, ttl=30):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            values, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return values
+
+    def set(self, user_id, values):
+        if self.max_entries <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (values, time.monotonic() + self.ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *tags):
+        with self._lock:
+            for tag in tags:
+                if tag.startswith("user:"):
+                    self._entries.pop(tag[len("user:"):], None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_COLUMNS = tuple(c.key for c in User.__table__.columns)
+
+
+def _snapshot(user):
+    return {key: getattr(user, key) for key in _COLUMNS}
+
+
+def _attach(values):
+    """Build a clean User from cached values and merge it into the session without SQL"""
+    user = User.__mapper__.class_manager.new_instance()
+    for key, value in values.items():
+        set_committed_value(user, key, value)
+    make_transient_to_detached(user)
+    return db.session.merge(user, load=False)
+
+
+def load_user(user_id):
+    """Return the User for `user_id` (cached), or None"""
+    if user_id is None:
+        return None
+    cache = current_app.extensions.get("user_cache")
+    values = cache.get(user_id) if cache is not None else None
+    if values is not None:
+        return _attach(values)
+
+    user = db.session.get(User, user_id)
+    if user is not None and cache is not None:
+        cache.set(user_id, _snapshot(user))
+    return user
+
+
+def get_current_user():
+    """The User behind the request's JWT (call after @jwt_required), or None"""
+    identity = get_jwt_identity()
+    # an app context (and its `g`) can outlive one request and its session,
+    # so the memo is only reused for the same identity and session
+    cached_identity, user = g.get("_current_user", (None, _MISSING))
+    if (user is _MISSING or cached_identity != identity
+            or (user is not None and object_session(user) is not db.session())):
+        user = load_user(identity)
+        g._current_user = (identity, user)
+    return user
+
+
+def is_admin():
+    """Authorization from the token's is_admin claim, without loading the user"""
+    return bool(get_jwt().get("is_admin"))
+
+
+def init_app(app):
+    cache = UserCache(
+        max_entries=app.config.get("USER_CACHE_MAX_ENTRIES", 10000),
+        ttl=app.config.get("USER_CACHE_TTL", 30),
+    )
+    app.extensions["user_cache"] = cache
+    register_invalidation_target(app, cache)
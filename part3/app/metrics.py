@@ -0,0 +1,227 @@
+# app/metrics.py
+"""
+Request and SQL metrics, exported on GET /metrics in the Prometheus text
+format.
+
+Per (method, endpoint) the app records:
+
+  hbnb_http_requests_total              counter, also labelled by status
+  hbnb_http_request_duration_seconds    histogram
+  hbnb_http_response_size_bytes         histogram (responses with a known length)
+  hbnb_db_queries_per_request           histogram of SQL statements
+  hbnb_db_query_duration_seconds_total  counter, time spent in SQL
+
+`endpoint` is the URL rule ("/api/v1/places/<place_id>"), never the raw
+path, so ids don't multiply the series; requests matching no rule share
+"<unmatched>". SQL statements are counted with cursor events on the app's
+engines (the primary and any read replicas) into the current request's
+stats, held in a ContextVar, so counting costs no lock. A request's
+numbers are merged into the totals once, in teardown_request, which also
+runs after a streamed body has been sent (stream_with_context).
+
+Metrics are per process: with several workers, scrape each one. Set
+METRICS_TOKEN to require `Authorization: Bearer <token>` on /metrics, or
+METRICS_ENABLED=0 to turn the whole thing off.
+"""
+import hmac
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from flask import Response, current_app, request
+from sqlalchemy import event
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (128, 512, 2048, 8192, 32768, 131072, 524288, 2097152)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+UNMATCHED = "<unmatched>"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_current = ContextVar("hbnb_request_metrics", default=None)
+
+
+class RequestStats:
+    """What one request has done so far"""
+    __slots__ = ("start", "queries", "sql_seconds", "status", "size")
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.status = 500  # unless after_request saw a response
+        self.size = None
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last one is +Inf
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            total += count
+            yield bound, total
+
+
+class EndpointStats:
+    __slots__ = ("statuses", "duration", "size", "queries", "sql_seconds")
+
+    def __init__(self):
+        self.statuses = {}
+        self.duration = Histogram(DURATION_BUCKETS)
+        self.size = Histogram(SIZE_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.sql_seconds = 0.0
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metrics:
+    """Process-wide totals per (method, endpoint)"""
+
+    def __init__(self):
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def record(self, method, endpoint, stats, duration):
+        with self._lock:
+            entry = self._endpoints.get((method, endpoint))
+            if entry is None:
+                entry = self._endpoints[method, endpoint] = EndpointStats()
+            entry.statuses[stats.status] = entry.statuses.get(stats.status, 0) + 1
+            entry.duration.observe(duration)
+            if stats.size is not None:
+                entry.size.observe(stats.size)
+            entry.queries.observe(stats.queries)
+            entry.sql_seconds += stats.sql_seconds
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+    def render(self):
+        """All series in the Prometheus text exposition format"""
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            lines = []
+
+            def family(name, kind, help_text):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+
+            def histogram(name, labels, hist):
+                for bound, count in hist.cumulative():
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f"{name}_sum{{{labels}}} {_number(hist.sum)}")
+                lines.append(f"{name}_count{{{labels}}} {hist.count}")
+
+            labelled = [(f'method="{_escape(m)}",endpoint="{_escape(e)}"', s) for (m, e), s in endpoints]
+
+            family("hbnb_http_requests_total", "counter", "HTTP requests by endpoint and status")
+            for labels, stats in labelled:
+                for status, count in sorted(stats.statuses.items()):
+                    lines.append(f'hbnb_http_requests_total{{{labels},status="{status}"}} {count}')
+            family("hbnb_http_request_duration_seconds", "histogram", "Request handling time")
+            for labels, stats in labelled:
+                histogram("hbnb_http_request_duration_seconds", labels, stats.duration)
+            family("hbnb_http_response_size_bytes", "histogram", "Response body size")
+            for labels, stats in labelled:
+                histogram("hbnb_http_response_size_bytes", labels, stats.size)
+            family("hbnb_db_queries_per_request", "histogram", "SQL statements per request")
+            for labels, stats in labelled:
+                histogram("hbnb_db_queries_per_request", labels, stats.queries)
+            family("hbnb_db_query_duration_seconds_total", "counter", "Time spent in SQL statements")
+            for labels, stats in labelled:
+                lines.append(f"hbnb_db_query_duration_seconds_total{{{labels}}} {_number(stats.sql_seconds)}")
+        return "\n".join(lines) + "\n"
+
+
+# ---------- SQL (engine events) ----------
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info["metrics_query_start"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        start = conn.info.pop("metrics_query_start", None)
+        if start is not None:
+            stats.sql_seconds += time.perf_counter() - start
+
+
+def instrument_engine(engine):
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ---------- request hooks ----------
+def _start_request():
+    _current.set(RequestStats())
+
+
+def _capture_response(response):
+    stats = _current.get()
+    if stats is not None:
+        stats.status = response.status_code
+        if not response.is_streamed:
+            stats.size = response.content_length
+    return response
+
+
+def _finish_request(exc):
+    stats = _current.get()
+    if stats is None:
+        return
+    _current.set(None)
+    rule = request.url_rule
+    current_app.extensions["metrics"].record(
+        request.method, rule.rule if rule is not None else UNMATCHED,
+        stats, time.perf_counter() - stats.start,
+    )
+
+
+def metrics_view():
+    token = current_app.config.get("METRICS_TOKEN")
+    if token and not hmac.compare_digest(
+        request.headers.get("Authorization", "").encode(), f"Bearer {token}".encode()
+    ):
+        return Response("Unauthorized\n", status=401, content_type="text/plain")
+    return Response(current_app.extensions["metrics"].render(), content_type=CONTENT_TYPE)
+
+
+def init_app(app, engines):
+    """Record every request and the SQL it runs on `engines` (inside an app context)"""
+    if not app.config.get("METRICS_ENABLED", True):
+        return
+    app.extensions["metrics"] = Metrics()
+    for engine in engines:
+        instrument_engine(engine)
+    # first before_request hook, so the time spent in the others is counted
+    app.before_request_funcs.setdefault(None, []).insert(0, _start_request)
+    app.after_request(_capture_response)
+    app.teardown_request(_finish_request)
+    app.add_url_rule("/metrics", "metrics", metrics_view, methods=["GET"])
+
+
+def get_metrics():
+    return current_app.extensions.get("metrics")
@@ -4,8 +4,12 @@ from .base_model import BaseModel
 
 class Amenity(BaseModel):
     __tablename__ = "amenities"
+    __table_args__ = (
+        # keyset pagination: ORDER BY created_at, id
+        db.Index("ix_amenities_created_at_id", "created_at", "id"),
+    )
 
-    name = db.Column(db.String(128), nullable=False)
+    name = db.Column(db.String(128), nullable=False, unique=True)
     description = db.Column(db.String(255), default="", nullable=True)
 
     def __repr__(self):
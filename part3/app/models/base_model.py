@@ -11,10 +11,8 @@ class BaseModel(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     def to_dict(self):
-        data = {}
-        for c in self.__table__.columns:
-            val = getattr(self, c.name)
-            if isinstance(val, datetime):
-                val = val.isoformat()
-            data[c.name] = val
-        return data
+        # compiled once per model class, see app/serializers.py
+        from app.serializers import make_serializer
+
+        fields = tuple(c.name for c in self.__table__.columns)
+        return make_serializer(type(self), fields)(self)
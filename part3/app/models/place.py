@@ -1,16 +1,26 @@
 # app/models/place.py
 from app.extensions import db
 from .base_model import BaseModel
+from app.geo import grid_cell
 
 
 place_amenities = db.Table(
     "place_amenities",
     db.Column("place_id", db.String(36), db.ForeignKey("places.id"), primary_key=True),
     db.Column("amenity_id", db.String(36), db.ForeignKey("amenities.id"), primary_key=True),
+    # amenity -> places lookups (EXISTS filters, amenity deletes); the PK covers place -> amenities
+    db.Index("ix_place_amenities_amenity_place", "amenity_id", "place_id"),
 )
 
 class Place(BaseModel):
     __tablename__ = "places"
+    __table_args__ = (
+        # keyset pagination: ORDER BY created_at, id
+        db.Index("ix_places_created_at_id", "created_at", "id"),
+        # browse filters: ?city=&min_price=&max_price=
+        db.Index("ix_places_city_price", "city", "price_per_night"),
+        db.Index("ix_places_price", "price_per_night"),
+    )
 
     name = db.Column(db.String(128), nullable=False)
     description = db.Column(db.String(1024), default="", nullable=True)
@@ -18,13 +28,26 @@ class Place(BaseModel):
     price_per_night = db.Column(db.Float, nullable=False, default=0.0)
     latitude = db.Column(db.Float, nullable=False)
     longitude = db.Column(db.Float, nullable=False)
+    # spatial index: grid cell of (latitude, longitude), see app/geo.py
+    geocell = db.Column(db.Integer, nullable=True, index=True)
+
+    # rating aggregates, maintained by SQLAlchemyRepository on review writes
+    rating_sum = db.Column(db.Integer, nullable=False, default=0)
+    review_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_1 = db.Column(db.Integer, nullable=False, default=0)
+    rating_2 = db.Column(db.Integer, nullable=False, default=0)
+    rating_3 = db.Column(db.Integer, nullable=False, default=0)
+    rating_4 = db.Column(db.Integer, nullable=False, default=0)
+    rating_5 = db.Column(db.Integer, nullable=False, default=0)
 
     # owner relationship
     owner_id = db.Column(db.String(36), db.ForeignKey("users.id"), nullable=False)
 
     # relationships
     reviews = db.relationship("Review", backref="place", lazy=True, cascade="all, delete-orphan")
-    amenities = db.relationship("Amenity", secondary=place_amenities, lazy="subquery",
+    # selectin: one IN query per batch of loaded places, instead of re-running
+    # the whole place query as a subquery join
+    amenities = db.relationship("Amenity", secondary=place_amenities, lazy="selectin",
                                 backref=db.backref("places", lazy=True))
 
     def __init__(self, name, description, city, price_per_night, latitude, longitude, owner_id=None, **kwargs):
@@ -45,11 +68,25 @@ class Place(BaseModel):
         self.price_per_night = price_per_night
         self.latitude = latitude
         self.longitude = longitude
+        self.update_geocell()
 
        
         if owner_id is not None:
             self.owner_id = owner_id
 
+    @property
+    def avg_rating(self):
+        if not self.review_count:
+            return None
+        return round(self.rating_sum / self.review_count, 2)
+
+    @property
+    def rating_histogram(self):
+        return {str(star): getattr(self, f"rating_{star}") or 0 for star in range(1, 6)}
+
+    def update_geocell(self):
+        self.geocell = grid_cell(self.latitude, self.longitude)
+
     def add_amenity(self, amenity):
         if amenity not in self.amenities:
             self.amenities.append(amenity)
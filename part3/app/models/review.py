@@ -4,6 +4,15 @@ from .base_model import BaseModel
 
 class Review(BaseModel):
     __tablename__ = "reviews"
+    __table_args__ = (
+        # GET /places/<id>/reviews: WHERE place_id = ? ORDER BY created_at, id
+        db.Index("ix_reviews_place_created_at", "place_id", "created_at", "id"),
+        # GET /reviews/: ORDER BY created_at, id
+        db.Index("ix_reviews_created_at_id", "created_at", "id"),
+        # one review per user and place; POST /reviews/ reports the IntegrityError
+        db.UniqueConstraint("user_id", "place_id", name="uq_reviews_user_place"),
+        db.CheckConstraint("rating BETWEEN 1 AND 5", name="ck_reviews_rating"),
+    )
 
     text = db.Column(db.String(1024), nullable=False)
     rating = db.Column(db.Integer, nullable=False)
@@ -1,9 +1,14 @@
 # app/models/user.py
-from app.extensions import db, bcrypt
+from app.extensions import db
+from app.passwords import get_hasher
 from .base_model import BaseModel
 
 class User(BaseModel):
     __tablename__ = "users"
+    __table_args__ = (
+        # keyset pagination: ORDER BY created_at, id
+        db.Index("ix_users_created_at_id", "created_at", "id"),
+    )
 
     email = db.Column(db.String(255), unique=True, nullable=False)
     password = db.Column(db.String(255), nullable=False)  # hashed password
@@ -11,24 +16,25 @@ class User(BaseModel):
     last_name = db.Column(db.String(128), default="", nullable=False)
     is_admin = db.Column(db.Boolean, default=False, nullable=False)
 
+    SAFE_FIELDS = ("id", "email", "first_name", "last_name", "is_admin", "created_at", "updated_at")
+
     # Relationships (بتفيدك في التاسكات الجاية)
     places = db.relationship("Place", backref="owner", lazy=True)
     reviews = db.relationship("Review", backref="user", lazy=True)
 
     def set_password(self, plain_password: str):
-        self.password = bcrypt.generate_password_hash(plain_password).decode("utf-8")
+        # bcrypt runs in the app's hashing pool (app/passwords.py)
+        self.password = get_hasher().hash(plain_password)
 
     def check_password(self, plain_password: str) -> bool:
-        return bcrypt.check_password_hash(self.password, plain_password)
+        return get_hasher().check(self.password, plain_password)
+
+    def password_needs_rehash(self) -> bool:
+        """True when the stored hash was made with another BCRYPT_LOG_ROUNDS"""
+        return get_hasher().needs_rehash(self.password)
     
     def to_dict(self):
         """Return safe user data (NO PASSWORD)"""
-        return {
-            "id": self.id,
-            "email": self.email,
-            "first_name": self.first_name,
-            "last_name": self.last_name,
-            "is_admin": self.is_admin,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-        }
\ No newline at end of file
+        from app.serializers import make_serializer
+
+        return make_serializer(User, self.SAFE_FIELDS)(self)
\ No newline at end of file
@@ -0,0 +1,126 @@
+# app/passwords.py
+"""
+bcrypt hashing off the request thread.
+
+Hashing and verification run in a small process pool so a burst of logins
+uses at most PASSWORD_HASH_WORKERS cores instead of every request thread
+of the worker. At most PASSWORD_HASH_MAX_PENDING jobs may wait for the
+pool or run in it; past that, callers get PasswordHasherBusy after
+PASSWORD_HASH_TIMEOUT seconds instead of queueing forever, and so does a
+caller whose job has not finished within that time (the job keeps its
+slot until it is done).
+PASSWORD_HASH_WORKERS = 0 hashes inline (tests, CLI scripts).
+
+The cost is BCRYPT_LOG_ROUNDS; hashes made with another cost are
+reported by needs_rehash() so login can upgrade them.
+"""
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+
+import bcrypt
+from flask import current_app, has_app_context
+
+DEFAULT_ROUNDS = 12
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Too many hashing jobs are already waiting for the pool"""
+
+
+def _hash(plain, rounds):
+    return bcrypt.hashpw(plain.encode("utf-8"), bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def _check(hashed, plain):
+    try:
+        return bcrypt.checkpw(plain.encode("utf-8"), hashed.encode("utf-8"))
+    except ValueError:
+        # malformed stored hash
+        return False
+
+
+def hash_cost(hashed):
+    """Return the bcrypt cost encoded in "$2b$<cost>$...", or None"""
+    try:
+        return int(hashed.split("$")[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+class PasswordHasher:
+    def __init__(self, rounds=DEFAULT_ROUNDS, workers=0, max_pending=None, timeout=30):
+        self.rounds = rounds
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending or max(workers, 1) * 4)
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def _executor(self):
+        # created on first use, so forking servers start the pool per worker;
+        # spawn avoids forking a process that already runs request threads
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    def _run(self, fn, *args):
+        if self.workers <= 0:
+            return fn(*args)
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PasswordHasherBusy("Password hashing is saturated, retry later")
+        try:
+            future = self._executor().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # released when the job is done, not when this caller stops waiting
+        future.add_done_callback(self._release_slot)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            future.cancel()  # frees the slot now if the job has not started
+            raise PasswordHasherBusy("Password hashing timed out, retry later") from None
+
+    def _release_slot(self, future):
+        self._slots.release()
+
+    def hash(self, plain):
+        return self._run(_hash, plain, self.rounds)
+
+    def check(self, hashed, plain):
+        if not hashed:
+            return False
+        return self._run(_check, hashed, plain)
+
+    def needs_rehash(self, hashed):
+        return hash_cost(hashed) != self.rounds
+
+    def shutdown(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+
+_inline = PasswordHasher()
+
+
+def init_app(app):
+    app.extensions["password_hasher"] = PasswordHasher(
+        rounds=app.config.get("BCRYPT_LOG_ROUNDS", DEFAULT_ROUNDS),
+        workers=app.config.get("PASSWORD_HASH_WORKERS", 0),
+        max_pending=app.config.get("PASSWORD_HASH_MAX_PENDING"),
+        timeout=app.config.get("PASSWORD_HASH_TIMEOUT", 30),
+    )
+
+
+def get_hasher():
+    """The app's hasher, or an inline one with the default cost outside an app"""
+    if has_app_context():
+        return current_app.extensions.get("password_hasher", _inline)
+    return _inline
@@ -0,0 +1,70 @@
+# app/pool.py
+"""
+Connection pool statistics for sizing workers.
+
+Pool events keep cumulative counters (connections opened, checkouts) and
+the peak number of connections checked out at once; snapshot() combines
+them with the pool's own size/overflow figures. If peak_checked_out keeps
+reaching pool_size + max_overflow, requests are queueing for connections.
+"""
+import threading
+
+from flask import current_app
+from sqlalchemy import event
+
+
+class PoolStats:
+    def __init__(self, engine):
+        self.engine = engine
+        self.connects = 0
+        self.checkouts = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self._lock = threading.Lock()
+
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checked_out = max(self.checked_out - 1, 0)
+
+    def snapshot(self):
+        pool = self.engine.pool
+        data = {
+            "pool_class": type(pool).__name__,
+            "status": pool.status(),
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "checked_out": self.checked_out,
+            "peak_checked_out": self.peak_checked_out,
+        }
+        # QueuePool only; SQLite :memory: uses StaticPool/SingletonThreadPool
+        for name in ("size", "checkedin", "overflow"):
+            fn = getattr(pool, name, None)
+            if callable(fn):
+                data[name] = fn()
+        if hasattr(pool, "_max_overflow"):
+            data["max_overflow"] = pool._max_overflow
+        if hasattr(pool, "_timeout"):
+            data["timeout"] = pool._timeout
+        return data
+
+
+def init_app(app, engine):
+    app.extensions["pool_stats"] = PoolStats(engine)
+
+
+def get_pool_stats():
+    return current_app.extensions.get("pool_stats")
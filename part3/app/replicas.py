@@ -0,0 +1,165 @@
+# app/replicas.py
+"""
+Read-replica routing.
+
+Replica engines are built from DATABASE_REPLICA_URIS (DATABASE_REPLICA_URLS
+in the environment) with the primary's engine options. They are not
+Flask-SQLAlchemy binds: no model belongs to them, create_all() never
+touches them. RoutingSession sends a SELECT to a replica only when all of
+these hold:
+
+- it runs inside a repository read method (SQLAlchemyRepository._read_only)
+  during a GET/HEAD request; everything else, including lazy loads
+  after the method returned, goes to the primary;
+- the session has not flushed anything and is not inside transaction();
+- the caller's JWT identity has not written in the last
+  REPLICA_STICKY_SECONDS (read-your-writes across requests).
+
+Expired stickiness entries are swept when the map has doubled since the
+last sweep, so it stays proportional to the identities that wrote within
+the window, not to every identity that ever wrote.
+"""
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import current_app, g, has_request_context, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event, make_url
+
+from app.sqlite import configure_sqlite
+
+SAFE_METHODS = ("GET", "HEAD")
+# stickiness entries kept before the first sweep of expired ones
+STICKY_PRUNE_MIN = 1024
+
+
+class ReplicaRouter:
+    """Replica engines plus the per-identity stickiness window"""
+
+    def __init__(self, engines, sticky_seconds=5):
+        self.engines = list(engines)
+        self.sticky_seconds = sticky_seconds
+        self._next = itertools.cycle(self.engines)
+        self._sticky_until = {}
+        self._prune_at = STICKY_PRUNE_MIN
+        self._lock = threading.Lock()
+
+    def pick(self):
+        with self._lock:
+            return next(self._next)
+
+    def dispose(self):
+        for engine in self.engines:
+            engine.dispose()
+
+    def mark_written(self, identity):
+        now = time.monotonic()
+        with self._lock:
+            self._sticky_until[identity] = now + self.sticky_seconds
+            if len(self._sticky_until) >= self._prune_at:
+                self._sticky_until = {i: t for i, t in self._sticky_until.items() if t > now}
+                self._prune_at = max(2 * len(self._sticky_until), STICKY_PRUNE_MIN)
+
+    def is_sticky(self, identity):
+        with self._lock:
+            until = self._sticky_until.get(identity)
+            if until is None:
+                return False
+            if until <= time.monotonic():
+                del self._sticky_until[identity]
+                return False
+            return True
+
+
+def get_router():
+    return current_app.extensions.get("replica_router")
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy session that can send repository reads to a replica"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._replica_allowed(clause):
+            router = get_router()
+            if router is not None:
+                # seen by the response cache (app/cache.py)
+                g.replica_read = True
+                return router.pick()
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _replica_allowed(self, clause):
+        info = self.info
+        if not info.get("replica_reads") or info.get("wrote") or info.get("uow_depth"):
+            return False
+        if self._flushing or not getattr(clause, "is_select", False):
+            return False
+        return not g.get("read_primary", False)
+
+
+@contextmanager
+def replica_reads(session):
+    """Allow the reads issued inside the block to use a replica (GET/HEAD only)"""
+    if not (has_request_context() and request.method in SAFE_METHODS):
+        yield
+        return
+    info = session.info
+    previous = info.get("replica_reads", False)
+    info["replica_reads"] = True
+    try:
+        yield
+    finally:
+        info["replica_reads"] = previous
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _remember_write(session, flush_context):
+    # later reads in this session must see what it just wrote
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _stick_writer(session):
+    if not session.info.get("wrote") or not has_request_context():
+        return
+    router = get_router()
+    identity = g.get("replica_identity")
+    if router is not None and identity is not None:
+        router.mark_written(identity)
+
+
+def _pin_sticky_identity():
+    try:
+        verify_jwt_in_request(optional=True)
+        identity = get_jwt_identity()
+    except Exception:
+        # invalid/expired tokens are rejected by the endpoint itself
+        identity = None
+    g.replica_identity = identity
+    g.read_primary = identity is not None and get_router().is_sticky(identity)
+
+
+def _make_engine(app, uri):
+    url = make_url(uri)
+    # same rule as Flask-SQLAlchemy: relative SQLite paths live in the instance folder
+    if url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:") \
+            and not os.path.isabs(url.database):
+        url = url.set(database=os.path.join(app.instance_path, url.database))
+    engine = create_engine(url, **app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {}))
+    configure_sqlite(engine, app.config.get("SQLITE_PRAGMAS"))
+    return engine
+
+
+def init_app(app):
+    """Enable routing if any replica URIs are configured"""
+    uris = app.config.get("DATABASE_REPLICA_URIS") or []
+    if not uris:
+        return
+    app.extensions["replica_router"] = ReplicaRouter(
+        [_make_engine(app, uri) for uri in uris],
+        sticky_seconds=app.config.get("REPLICA_STICKY_SECONDS", 5),
+    )
+    app.before_request(_pin_sticky_identity)
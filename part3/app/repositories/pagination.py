@@ -0,0 +1,59 @@
+# app/repositories/pagination.py
+import base64
+from datetime import datetime
+
+from sqlalchemy import tuple_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(created_at: datetime, obj_id: str) -> str:
+    """Encode a (created_at, id) keyset position as an opaque cursor"""
+    raw = f"{created_at.isoformat()}|{obj_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """Decode a cursor produced by encode_cursor, raising ValueError if malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        created_at, obj_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), obj_id
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def parse_limit(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE) -> int:
+    """Parse a ?limit= query parameter, clamping it to [1, maximum]"""
+    if value in (None, ""):
+        return default
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer")
+    if limit < 1:
+        raise ValueError("limit must be positive")
+    return min(limit, maximum)
+
+
+def keyset_page(query, model, limit=DEFAULT_PAGE_SIZE, cursor=None):
+    """
+    Return (items, next_cursor) for one page of `query` ordered by (created_at, id).
+
+    The position is carried in the cursor instead of an OFFSET, so every page
+    is a range scan on the (created_at, id) index and costs the same.
+    """
+    if cursor:
+        created_at, obj_id = decode_cursor(cursor)
+        query = query.filter(tuple_(model.created_at, model.id) > tuple_(created_at, obj_id))
+
+    rows = query.order_by(model.created_at, model.id).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return rows, next_cursor
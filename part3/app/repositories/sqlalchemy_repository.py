@@ -1,28 +1,169 @@
 # app/repositories/sqlalchemy_repository.py
+import math
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+
+from sqlalchemy import bindparam, false, func, insert, or_, select, update
+from sqlalchemy.orm import joinedload
 from app.extensions import db
 from app.models import User, Place, Review, Amenity
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, keyset_page
+from app import geo, search
+from app.cache import invalidate
+from app.replicas import replica_reads
+from app.sqlite import begin_immediate
+from app.amenity_index import get_amenity_index, record_changes
+
+# largest amenity-index result passed to SQL as an id list
+AMENITY_INDEX_MAX_IN = 2000
+# place columns that update_place() never takes from the caller: the rating
+# aggregates are maintained by review writes only
+PLACE_READ_ONLY = frozenset(
+    ["id", "geocell", "rating_sum", "review_count"] + [f"rating_{star}" for star in range(1, 6)]
+)
+
+
+def _read_only(method):
+    """Mark a repository method as read-only: on GET requests its queries may go to a replica"""
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        with replica_reads(db.session):
+            return method(*args, **kwargs)
+    return wrapper
 
 
 class SQLAlchemyRepository:
     """SQLAlchemy repository implementing CRUD for all entities"""
 
+    @staticmethod
+    def _resolve(model, obj_or_id):
+        """Accept an already loaded instance or a primary key, so callers that
+        hold the row don't pay for a second lookup"""
+        if isinstance(obj_or_id, model):
+            return obj_or_id
+        return db.session.get(model, obj_or_id)
+
+    # ---------- Unit of work ----------
+    @contextmanager
+    def transaction(self):
+        """
+        Group several writes into one commit.
+
+        Write methods called inside the block only flush; the outermost block
+        commits once on exit and rolls everything back if it raises. Nested
+        blocks run in a SAVEPOINT, so an inner failure that the caller catches
+        only undoes the inner writes. Cache invalidations are deferred until
+        the outer commit succeeds.
+        """
+        info = db.session.info
+        depth = info.get("uow_depth", 0)
+        info["uow_depth"] = depth + 1
+        try:
+            if depth:
+                with db.session.begin_nested():
+                    yield
+                return
+
+            info["uow_tags"] = set()
+            # reads and writes of the block share one write-locked SQLite
+            # transaction, also when the session already read before the
+            # block (see app/sqlite.py)
+            begin_immediate(db.session.connection())
+            try:
+                yield
+                db.session.commit()
+            except BaseException:
+                db.session.rollback()
+                raise
+            invalidate(*info["uow_tags"])
+        finally:
+            info["uow_depth"] = depth
+            if not depth:
+                info.pop("uow_tags", None)
+
+    @staticmethod
+    def in_transaction():
+        return db.session.info.get("uow_depth", 0) > 0
+
+    def _commit(self, *tags):
+        """Commit and invalidate `tags`, or only flush when inside transaction()"""
+        if self.in_transaction():
+            db.session.flush()
+            db.session.info["uow_tags"].update(tags)
+            return
+        db.session.commit()
+        invalidate(*tags)
+
+    @staticmethod
+    def _bulk_insert(objs):
+        """
+        Insert already validated transient instances with one executemany.
+
+        Ids, timestamps and scalar column defaults are filled in here and
+        copied back onto the instances so callers can serialize them.
+        """
+        if not objs:
+            return objs
+        table = objs[0].__table__
+        now = datetime.utcnow()
+        rows = []
+        for obj in objs:
+            row = {}
+            for column in table.columns:
+                value = getattr(obj, column.key)
+                if value is None and column.default is not None and column.default.is_scalar:
+                    value = column.default.arg
+                row[column.key] = value
+            row["id"] = row["id"] or str(uuid.uuid4())
+            row["created_at"] = row["created_at"] or now
+            row["updated_at"] = row["updated_at"] or now
+            for key, value in row.items():
+                setattr(obj, key, value)
+            rows.append(row)
+        db.session.execute(insert(table), rows)
+        return objs
+
+    @staticmethod
+    def _stream(query, model, batch_size):
+        """Iterate a query in (created_at, id) order, buffering batch_size rows at a time"""
+        query = query.order_by(model.created_at, model.id).yield_per(batch_size)
+
+        def rows():
+            # runs while the response streams, after the repository method returned
+            with replica_reads(db.session):
+                yield from query
+        return rows()
+
     # ---------- Users ----------
     def add_user(self, user: User) -> User:
         db.session.add(user)
-        db.session.commit()
+        self._commit("users")
         return user
 
+    @_read_only
     def get_user_by_id(self, user_id: str):
-        return User.query.get(user_id)
+        return db.session.get(User, user_id)
 
+    @_read_only
     def get_user_by_email(self, email: str):
         return User.query.filter_by(email=email).first()
 
+    @_read_only
     def list_users(self):
         return User.query.all()
 
-    def update_user(self, user_id: str, data: dict):
-        user = self.get_user_by_id(user_id)
+    @_read_only
+    def list_users_page(self, limit=DEFAULT_PAGE_SIZE, cursor=None):
+        return keyset_page(User.query, User, limit=limit, cursor=cursor)
+
+    def iter_users(self, batch_size):
+        return self._stream(User.query, User, batch_size)
+
+    def update_user(self, user_or_id, data: dict):
+        user = self._resolve(User, user_or_id)
         if not user:
             return None
 
@@ -30,95 +171,386 @@ class SQLAlchemyRepository:
             if hasattr(user, key) and key not in ("id", "password"):
                 setattr(user, key, value)
 
-        db.session.commit()
+        self._commit("users", f"user:{user.id}")
+        return user
+
+    def set_user_password(self, user_or_id, password_hash: str):
+        user = self._resolve(User, user_or_id)
+        if not user:
+            return None
+        user.password = password_hash
+        self._commit("users", f"user:{user.id}")
         return user
 
-    def delete_user(self, user_id: str) -> bool:
-        user = self.get_user_by_id(user_id)
+    def delete_user(self, user_or_id) -> bool:
+        user = self._resolve(User, user_or_id)
         if not user:
             return False
+        user_id = user.id
         db.session.delete(user)
-        db.session.commit()
+        self._commit("users", f"user:{user_id}")
         return True
 
     # ---------- Places ----------
     def add_place(self, place: Place) -> Place:
+        place.update_geocell()
         db.session.add(place)
-        db.session.commit()
+        self._commit("places")
         return place
 
-    def get_place_by_id(self, place_id: str):
-        return Place.query.get(place_id)
+    def bulk_add_places(self, places):
+        for place in places:
+            place.update_geocell()
+        self._bulk_insert(places)
+        self._commit("places")
+        return places
 
+    def add_place_amenities(self, place_or_id, amenities):
+        """Attach amenities the place does not have yet; returns the place"""
+        place = self._resolve(Place, place_or_id)
+        if not place:
+            return None
+        current = {a.id for a in place.amenities}
+        for amenity in amenities:
+            if amenity.id not in current:
+                place.amenities.append(amenity)
+                current.add(amenity.id)
+        self._commit("places", f"place:{place.id}")
+        return place
+
+    @_read_only
+    def existing_place_ids(self, place_ids) -> set:
+        ids = list(set(place_ids))
+        if not ids:
+            return set()
+        return set(db.session.scalars(select(Place.id).where(Place.id.in_(ids))))
+
+    @_read_only
+    def get_place_by_id(self, place_id: str, with_owner=False):
+        """with_owner loads the owner in the same query (for host_name)"""
+        options = [joinedload(Place.owner)] if with_owner else []
+        return db.session.get(Place, place_id, options=options)
+
+    @_read_only
     def list_places(self):
         return Place.query.all()
 
-    def update_place(self, place_id: str, data: dict):
-        place = self.get_place_by_id(place_id)
+    def query_places(self, min_price=None, max_price=None, city=None, amenity=None, amenities=None):
+        """
+        Build a Place query with the browse filters applied in SQL.
+
+        `amenities` (ids or names) must all be present. They are resolved with
+        the in-memory amenity index; when more than AMENITY_INDEX_MAX_IN
+        places match, an EXISTS per amenity is cheaper than a long id list.
+        """
+        query = Place.query
+        if city:
+            query = query.filter(Place.city == city)
+        if min_price is not None:
+            query = query.filter(Place.price_per_night >= min_price)
+        if max_price is not None:
+            query = query.filter(Place.price_per_night <= max_price)
+        if amenity:
+            # EXISTS over place_amenities; accepts an amenity id or its name
+            query = query.filter(
+                Place.amenities.any(or_(Amenity.id == amenity, Amenity.name == amenity))
+            )
+        if amenities:
+            index = get_amenity_index()
+            place_ids = index.places_with_all(amenities, max_results=AMENITY_INDEX_MAX_IN)
+            if place_ids is None:
+                for key in amenities:
+                    query = query.filter(Place.amenities.any(Amenity.id == index.resolve(key)))
+            elif not place_ids:
+                query = query.filter(false())
+            else:
+                query = query.filter(Place.id.in_(place_ids))
+        return query
+
+    @_read_only
+    def list_places_page(self, limit=DEFAULT_PAGE_SIZE, cursor=None, **filters):
+        """Return (places, next_cursor) for one keyset page ordered by (created_at, id)"""
+        return keyset_page(self.query_places(**filters), Place, limit=limit, cursor=cursor)
+
+    def iter_places(self, batch_size, **filters):
+        # Place.amenities is selectin-loaded: one IN query per yield_per batch
+        return self._stream(self.query_places(**filters), Place, batch_size)
+
+    @_read_only
+    def search_places(self, query, limit=DEFAULT_PAGE_SIZE):
+        """
+        Return [(place, relevance)] for a keyword query, most relevant first.
+
+        Ranked by FTS5 bm25 over place names/descriptions and review text
+        (app/search.py); other databases fall back to a LIKE scan, unranked.
+        """
+        match = search.match_expression(query)
+        if db.engine.dialect.name != "sqlite":
+            like = f"%{query.strip()}%"
+            places = Place.query.filter(
+                or_(Place.name.ilike(like), Place.description.ilike(like))
+            ).limit(limit).all()
+            return [(p, 0.0) for p in places]
+
+        hits = db.session.execute(search.SEARCH_SQL, {
+            "match": match, "limit": limit, "candidates": limit * search.CANDIDATES_PER_RESULT,
+        }).all()
+        by_id = {p.id: p for p in Place.query.filter(Place.id.in_([h.place_id for h in hits]))}
+        return [(by_id[h.place_id], -h.score) for h in hits if h.place_id in by_id]
+
+    @_read_only
+    def list_places_in_box(self, min_lat, min_lon, max_lat, max_lon, center=None, limit=DEFAULT_PAGE_SIZE):
+        """
+        Return [(place, distance_km)] inside a bounding box, nearest to `center` first.
+
+        Candidates come from BETWEEN ranges on the geocell index, read as
+        (id, latitude, longitude) rows in windows growing around the centre
+        (geo.search_windows) until the `limit` nearest are known, so a wide
+        box does not read whole regions; only those places are loaded.
+        """
+        if center is None:
+            center = geo.box_center(min_lat, min_lon, max_lat, max_lon)
+        c_lat, c_lon = center
+        box = (min_lat, min_lon, max_lat, max_lon)
+
+        windows = geo.search_windows(*box, center) if limit else [(box, math.inf)]
+        for window, covered_km in windows:
+            rows = db.session.execute(
+                select(Place.id, Place.latitude, Place.longitude).where(
+                    or_(*[Place.geocell.between(lo, hi) for lo, hi in geo.cell_ranges(*window)])
+                )
+            ).all()
+            nearest = sorted(
+                (geo.haversine_km(c_lat, c_lon, lat, lon), place_id)
+                for place_id, lat, lon in rows
+                if geo.in_box(lat, lon, *box)
+            )
+            # past covered_km, a place outside the window could be nearer
+            nearest = [hit for hit in nearest if hit[0] <= covered_km]
+            if len(nearest) >= (limit or 0):
+                break
+
+        nearest = nearest[:limit]
+        if not nearest:
+            return []
+        by_id = {p.id: p for p in Place.query.filter(Place.id.in_([place_id for _, place_id in nearest]))}
+        return [(by_id[place_id], distance) for distance, place_id in nearest if place_id in by_id]
+
+    @_read_only
+    def list_places_near(self, lat, lon, radius_km, limit=DEFAULT_PAGE_SIZE):
+        """Return [(place, distance_km)] within radius_km of (lat, lon), nearest first"""
+        box = geo.bounding_box(lat, lon, radius_km)
+        # the box's corners are farther than any place inside the circle, so
+        # the `limit` nearest of the box include every hit of the circle's top `limit`
+        hits = self.list_places_in_box(*box, center=(lat, lon), limit=limit)
+        return [hit for hit in hits if hit[1] <= radius_km]
+
+    def update_place(self, place_or_id, data: dict):
+        place = self._resolve(Place, place_or_id)
         if not place:
             return None
 
         for key, value in (data or {}).items():
-            if hasattr(place, key) and key != "id":
+            if hasattr(place, key) and key not in PLACE_READ_ONLY:
                 setattr(place, key, value)
+        place.update_geocell()
 
-        db.session.commit()
+        self._commit("places", f"place:{place.id}")
         return place
 
-    def delete_place(self, place_id: str) -> bool:
-        place = self.get_place_by_id(place_id)
+    def delete_place(self, place_or_id) -> bool:
+        place = self._resolve(Place, place_or_id)
         if not place:
             return False
+        place_id = place.id
         db.session.delete(place)
-        db.session.commit()
+        self._commit("places", f"place:{place_id}", "reviews")
         return True
 
     # ---------- Reviews ----------
+    @staticmethod
+    def _check_rating(rating):
+        if not isinstance(rating, int) or isinstance(rating, bool) or not (1 <= rating <= 5):
+            raise ValueError("Rating must be between 1 and 5")
+
+    def _apply_rating(self, place_id, rating, delta):
+        """Adjust a place's rating aggregates in the current transaction"""
+        star = getattr(Place, f"rating_{rating}")
+        db.session.execute(
+            update(Place)
+            .where(Place.id == place_id)
+            .values({
+                Place.rating_sum: Place.rating_sum + delta * rating,
+                Place.review_count: Place.review_count + delta,
+                star: star + delta,
+            })
+        )
+
     def add_review(self, review: Review) -> Review:
+        self._check_rating(review.rating)
         db.session.add(review)
-        db.session.commit()
+        self._apply_rating(review.place_id, review.rating, +1)
+        self._commit("reviews", "places", f"place:{review.place_id}")
         return review
 
+    def bulk_add_reviews(self, reviews):
+        for review in reviews:
+            self._check_rating(review.rating)
+        self._bulk_insert(reviews)
+
+        # one executemany UPDATE for the rating aggregates of all touched places
+        deltas = defaultdict(lambda: {"d_sum": 0, "d_count": 0, **{f"d_{s}": 0 for s in range(1, 6)}})
+        for review in reviews:
+            delta = deltas[review.place_id]
+            delta["d_sum"] += review.rating
+            delta["d_count"] += 1
+            delta[f"d_{review.rating}"] += 1
+        places = Place.__table__
+        stmt = (
+            update(places)
+            .where(places.c.id == bindparam("p_id"))
+            .values(
+                rating_sum=places.c.rating_sum + bindparam("d_sum"),
+                review_count=places.c.review_count + bindparam("d_count"),
+                **{f"rating_{s}": places.c[f"rating_{s}"] + bindparam(f"d_{s}") for s in range(1, 6)},
+            )
+        )
+        db.session.execute(stmt, [dict(delta, p_id=place_id) for place_id, delta in deltas.items()])
+
+        self._commit("reviews", "places", *(f"place:{place_id}" for place_id in deltas))
+        return reviews
+
+    @_read_only
     def get_review_by_id(self, review_id: str):
-        return Review.query.get(review_id)
+        return db.session.get(Review, review_id)
 
+    @_read_only
+    def reviewed_place_ids(self, user_id, place_ids) -> set:
+        """The places among `place_ids` that `user_id` has already reviewed"""
+        ids = list(set(place_ids))
+        if not ids:
+            return set()
+        return set(db.session.scalars(
+            select(Review.place_id).where(Review.user_id == user_id, Review.place_id.in_(ids))
+        ))
+
+    @_read_only
     def list_reviews(self):
         return Review.query.all()
 
-    def update_review(self, review_id: str, data: dict):
-        review = self.get_review_by_id(review_id)
+    @_read_only
+    def list_reviews_page(self, limit=DEFAULT_PAGE_SIZE, cursor=None, place_id=None):
+        """
+        Return (reviews, next_cursor) ordered by (created_at, id).
+
+        Authors are joined in the same SELECT, so building user names costs
+        no extra query per review.
+        """
+        query = Review.query.options(joinedload(Review.user))
+        if place_id is not None:
+            query = query.filter(Review.place_id == place_id)
+        return keyset_page(query, Review, limit=limit, cursor=cursor)
+
+    def iter_reviews(self, batch_size, place_id=None):
+        query = Review.query.options(joinedload(Review.user))
+        if place_id is not None:
+            query = query.filter(Review.place_id == place_id)
+        return self._stream(query, Review, batch_size)
+
+    def update_review(self, review_or_id, data: dict):
+        review = self._resolve(Review, review_or_id)
         if not review:
             return None
 
-        for key, value in (data or {}).items():
+        data = data or {}
+        self._check_rating(data.get("rating", review.rating))
+
+        old_place_id, old_rating = review.place_id, review.rating
+        for key, value in data.items():
             if hasattr(review, key) and key != "id":
                 setattr(review, key, value)
 
-        db.session.commit()
+        if (review.place_id, review.rating) != (old_place_id, old_rating):
+            self._apply_rating(old_place_id, old_rating, -1)
+            self._apply_rating(review.place_id, review.rating, +1)
+
+        self._commit("reviews", "places", f"place:{old_place_id}", f"place:{review.place_id}")
         return review
 
-    def delete_review(self, review_id: str) -> bool:
-        review = self.get_review_by_id(review_id)
+    def delete_review(self, review_or_id) -> bool:
+        review = self._resolve(Review, review_or_id)
         if not review:
             return False
+        place_id = review.place_id
+        self._apply_rating(place_id, review.rating, -1)
         db.session.delete(review)
-        db.session.commit()
+        self._commit("reviews", "places", f"place:{place_id}")
         return True
 
+    def rebuild_rating_aggregates(self) -> int:
+        """Recompute every place's rating aggregates from the reviews table"""
+        def per_place(expr, *extra):
+            return (
+                select(expr)
+                .where(Review.place_id == Place.id, *extra)
+                .scalar_subquery()
+            )
+
+        values = {
+            Place.review_count: per_place(func.count(Review.id)),
+            Place.rating_sum: per_place(func.coalesce(func.sum(Review.rating), 0)),
+        }
+        for star in range(1, 6):
+            values[getattr(Place, f"rating_{star}")] = per_place(
+                func.count(Review.id), Review.rating == star
+            )
+
+        result = db.session.execute(
+            update(Place).values(values).execution_options(synchronize_session=False)
+        )
+        self._commit("places")
+        return result.rowcount
+
+    def rebuild_search_index(self) -> dict:
+        """Create the FTS5 tables if missing and re-index places and reviews"""
+        counts = search.rebuild_search_index(db.session.connection())
+        self._commit("places", "reviews")
+        return counts
+
     # ---------- Amenities ----------
     def add_amenity(self, amenity: Amenity) -> Amenity:
         db.session.add(amenity)
-        db.session.commit()
+        self._commit("amenities")
         return amenity
 
+    def bulk_add_amenities(self, amenities):
+        self._bulk_insert(amenities)
+        # a Core insert: no flush for the amenity index to pick the names up from
+        record_changes(db.session, [("amenity", a.id, a.name) for a in amenities])
+        self._commit("amenities")
+        return amenities
+
+    @_read_only
     def get_amenity_by_id(self, amenity_id: str):
-        return Amenity.query.get(amenity_id)
+        return db.session.get(Amenity, amenity_id)
 
+    @_read_only
+    def get_amenities_by_ids(self, amenity_ids):
+        ids = list(set(amenity_ids))
+        if not ids:
+            return []
+        return Amenity.query.filter(Amenity.id.in_(ids)).all()
+
+    @_read_only
     def list_amenities(self):
         return Amenity.query.all()
 
-    def update_amenity(self, amenity_id: str, data: dict):
-        amenity = self.get_amenity_by_id(amenity_id)
+    @_read_only
+    def list_amenities_page(self, limit=DEFAULT_PAGE_SIZE, cursor=None):
+        return keyset_page(Amenity.query, Amenity, limit=limit, cursor=cursor)
+
+    def update_amenity(self, amenity_or_id, data: dict):
+        amenity = self._resolve(Amenity, amenity_or_id)
         if not amenity:
             return None
 
@@ -126,13 +558,13 @@ class SQLAlchemyRepository:
             if hasattr(amenity, key) and key != "id":
                 setattr(amenity, key, value)
 
-        db.session.commit()
+        self._commit("amenities")
         return amenity
 
-    def delete_amenity(self, amenity_id: str) -> bool:
-        amenity = self.get_amenity_by_id(amenity_id)
+    def delete_amenity(self, amenity_or_id) -> bool:
+        amenity = self._resolve(Amenity, amenity_or_id)
         if not amenity:
             return False
         db.session.delete(amenity)
-        db.session.commit()
+        self._commit("amenities")
         return True
@@ -0,0 +1,204 @@
+# app/schema.py
+"""
+Database schema setup: versioned SQL migrations instead of create_all().
+
+Migrations are the numbered scripts in part3/migrations/
+(`0001_initial.sql`, `0002_<what>.sql`, ...). Pending ones are applied in
+order, in one transaction, and recorded in the schema_version table.
+
+The scripts are portable SQL and run on any database SQLAlchemy supports.
+What only one dialect has goes in a companion script named after it, run
+right after the shared one on that dialect only, the way search.py puts
+its DDL behind execute_if(dialect="sqlite"): `0001_initial.sqlite.sql`
+creates the FTS5 search index, which other databases do without (search
+falls back to LIKE). On databases whose DDL is not transactional (MySQL)
+a failed upgrade can leave the statements before the failure applied.
+
+create_app() prepares the schema according to SCHEMA_SETUP:
+
+  "create_all"  db.create_all() (development: follow model edits freely)
+  "migrate"     apply pending migrations (tests, single-process setups)
+  "check"       one query: refuse to start if migrations are pending
+                (production: run `flask --app run db-upgrade` on deploy)
+
+Both "migrate" on an up-to-date database and "check" cost a single query,
+where create_all() inspects every table on every boot.
+
+A database created by create_all() has no schema_version table; mark it as
+up to date with `flask --app run db-stamp`.
+"""
+import os
+import re
+import sqlite3
+from collections import namedtuple
+from datetime import datetime
+from functools import lru_cache
+
+from sqlalchemy import inspect, text
+
+from app.extensions import db
+from app.sqlite import begin_immediate
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+VERSION_TABLE = "schema_version"
+
+# dialect_paths: ((dialect, path), ...) of the dialect-only companion scripts
+Migration = namedtuple("Migration", "version name path dialect_paths")
+
+
+class SchemaOutOfDate(RuntimeError):
+    """The database is behind the migrations shipped with the code"""
+
+
+@lru_cache(maxsize=None)
+def discover(directory=MIGRATIONS_DIR):
+    """The migrations in `directory`, oldest first"""
+    shared, companions = [], {}
+    for filename in sorted(os.listdir(directory)):
+        match = re.fullmatch(r"(\d+)_(\w+)(?:\.(\w+))?\.sql", filename)
+        if not match:
+            continue
+        version, name, dialect = int(match[1]), match[2], match[3]
+        path = os.path.join(directory, filename)
+        if dialect:
+            companions.setdefault((version, name), []).append((dialect, path))
+        else:
+            shared.append((version, name, path))
+    versions = [version for version, _, _ in shared]
+    if len(set(versions)) != len(versions):
+        raise RuntimeError(f"Duplicate migration versions in {directory}")
+    orphans = set(companions) - {(version, name) for version, name, _ in shared}
+    if orphans:
+        raise RuntimeError(f"Dialect scripts without a shared migration in {directory}: {sorted(orphans)}")
+    return tuple(sorted(
+        Migration(version, name, path, tuple(companions.get((version, name), ())))
+        for version, name, path in shared
+    ))
+
+
+def scripts(migration, dialect):
+    """Paths of the scripts that apply `migration` on `dialect`, in order"""
+    return [migration.path] + [path for name, path in migration.dialect_paths if name == dialect]
+
+
+def latest_version(directory=MIGRATIONS_DIR):
+    migrations = discover(directory)
+    return migrations[-1].version if migrations else 0
+
+
+def split_statements(sql):
+    """
+    Split a script into statements (trigger bodies contain ';' too).
+
+    sqlite3 only tokenizes here, so scripts for other dialects split the
+    same way, except dollar-quoted PostgreSQL bodies.
+    """
+    statements, buffer = [], ""
+    for line in sql.splitlines(keepends=True):
+        if not buffer and (not line.strip() or line.lstrip().startswith("--")):
+            continue
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            statements.append(buffer.strip())
+            buffer = ""
+    if buffer.strip():
+        raise ValueError(f"Incomplete SQL statement: {buffer.strip()[:60]}")
+    return statements
+
+
+def current_version(connection):
+    """Highest applied version, or None if the database has no schema_version table"""
+    if not inspect(connection).has_table(VERSION_TABLE):
+        return None
+    return connection.execute(text(f"SELECT max(version) FROM {VERSION_TABLE}")).scalar() or 0
+
+
+def _record(connection, migration):
+    connection.execute(
+        text(f"INSERT INTO {VERSION_TABLE} (version, name, applied_at) VALUES (:version, :name, :applied_at)"),
+        {"version": migration.version, "name": migration.name,
+         "applied_at": datetime.utcnow().isoformat(sep=" ")},
+    )
+
+
+def _create_version_table(connection):
+    connection.exec_driver_sql(
+        f"CREATE TABLE IF NOT EXISTS {VERSION_TABLE} ("
+        "version INTEGER NOT NULL PRIMARY KEY, name VARCHAR(128) NOT NULL, "
+        "applied_at TIMESTAMP NOT NULL)"
+    )
+
+
+def upgrade(connection, target=None, directory=MIGRATIONS_DIR):
+    """
+    Apply the migrations newer than the database, up to `target` (default:
+    all), in the caller's transaction. Returns the applied migrations.
+    """
+    # SQLite: write lock before reading the version, so two processes cannot
+    # both apply; elsewhere the second one fails on the tables or on the
+    # schema_version primary key and rolls back
+    begin_immediate(connection)
+    version = current_version(connection)
+    if version is None:
+        if inspect(connection).has_table("users"):
+            raise SchemaOutOfDate(
+                "The database has tables but no schema_version "
+                "(created by create_all?): run `flask --app run db-stamp`"
+            )
+        _create_version_table(connection)
+        version = 0
+
+    applied = []
+    for migration in discover(directory):
+        if migration.version <= version or (target is not None and migration.version > target):
+            continue
+        for path in scripts(migration, connection.dialect.name):
+            with open(path, encoding="utf-8") as f:
+                for statement in split_statements(f.read()):
+                    connection.exec_driver_sql(statement)
+        _record(connection, migration)
+        applied.append(migration)
+    return applied
+
+
+def stamp(connection, version=None, directory=MIGRATIONS_DIR):
+    """Record the migrations up to `version` (default: all) as applied, without running them"""
+    begin_immediate(connection)
+    _create_version_table(connection)
+    current = current_version(connection)
+    stamped = []
+    for migration in discover(directory):
+        if current < migration.version and (version is None or migration.version <= version):
+            _record(connection, migration)
+            stamped.append(migration)
+    return stamped
+
+
+def check(connection, directory=MIGRATIONS_DIR):
+    """Raise SchemaOutOfDate unless every migration has been applied"""
+    version = current_version(connection)
+    latest = latest_version(directory)
+    if version is None or version < latest:
+        raise SchemaOutOfDate(
+            f"Database schema is at version {version or 0}, the code expects {latest}: "
+            "run `flask --app run db-upgrade`"
+        )
+    return version
+
+
+def setup_schema(app):
+    """Prepare the schema for `app` according to SCHEMA_SETUP (inside an app context)"""
+    mode = app.config.get("SCHEMA_SETUP", "migrate")
+    if mode == "create_all":
+        db.create_all()
+        return
+    with db.engine.begin() as connection:
+        if mode == "migrate":
+            applied = upgrade(connection)
+            if applied:
+                app.logger.info("Applied migrations: %s", ", ".join(
+                    f"{m.version:04d}_{m.name}" for m in applied))
+        elif mode == "check":
+            check(connection)
+        else:
+            raise ValueError(f"Unknown SCHEMA_SETUP: {mode!r}")
@@ -0,0 +1,120 @@
+# app/search.py
+"""
+Full-text search over places and reviews (SQLite FTS5).
+
+places_fts (name, description) and reviews_fts (text) are external-content
+FTS5 tables: they index the rows of `places` / `reviews` by rowid and keep
+no copy of the text. Triggers keep them in sync with every INSERT, UPDATE
+and DELETE, so ORM writes and the bulk executemany inserts are covered
+alike.
+
+The tables are created with `places` / `reviews` by create_all(). For a
+database created before, or after a VACUUM (which may renumber rowids),
+run `flask --app run rebuild-search-index`.
+"""
+import re
+
+from sqlalchemy import DDL, event, text
+
+from app.models import Place, Review
+
+TOKENIZER = "porter unicode61 remove_diacritics 2"
+MAX_TERMS = 8
+# name matches weigh more than description matches; review matches count half
+PLACE_WEIGHTS = (10.0, 1.0)
+REVIEW_WEIGHT = 0.5
+# best-ranked rows taken from each index per requested result
+CANDIDATES_PER_RESULT = 4
+
+_INDEXES = {
+    "places": ("places_fts", ("name", "description")),
+    "reviews": ("reviews_fts", ("text",)),
+}
+
+
+def _ddl(table, fts, columns):
+    cols = ", ".join(columns)
+    new = ", ".join(f"new.{c}" for c in columns)
+    old = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{cols}, content='{table}', content_rowid='rowid', tokenize='{TOKENIZER}')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new}); END",
+    ]
+
+
+for _model in (Place, Review):
+    _table = _model.__table__
+    _fts, _columns = _INDEXES[_table.name]
+    for _statement in _ddl(_table.name, _fts, _columns):
+        event.listen(_table, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+    # triggers go with the table; the FTS table has to be dropped explicitly
+    event.listen(_table, "before_drop",
+                 DDL(f"DROP TABLE IF EXISTS {_fts}").execute_if(dialect="sqlite"))
+
+
+def create_search_index(connection):
+    """Create the FTS tables and triggers if missing (existing databases)"""
+    for table, (fts, columns) in _INDEXES.items():
+        for statement in _ddl(table, fts, columns):
+            connection.exec_driver_sql(statement)
+
+
+def rebuild_search_index(connection):
+    """Re-read every place and review into the FTS tables; returns {fts: rows}"""
+    create_search_index(connection)
+    counts = {}
+    for table, (fts, _) in _INDEXES.items():
+        connection.exec_driver_sql(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+        counts[fts] = connection.exec_driver_sql(f"SELECT count(*) FROM {table}").scalar()
+    return counts
+
+
+def match_expression(query):
+    """
+    Turn user input into a safe FTS5 MATCH expression.
+
+    Words are quoted (so FTS5 operators in the input are plain text) and
+    ANDed; the last word is a prefix match for search-as-you-type.
+    Raises ValueError if the query has no words.
+    """
+    terms = re.findall(r"\w+", query or "")[:MAX_TERMS]
+    if not terms:
+        raise ValueError("q must contain at least one word")
+    quoted = [f'"{t}"' for t in terms]
+    quoted[-1] += "*"
+    return " AND ".join(quoted)
+
+
+# place id + score, best (lowest bm25) first. Each index contributes its
+# best :candidates rows only: FTS5 answers "ORDER BY rank LIMIT n" without
+# sorting every match, which keeps frequent terms cheap.
+SEARCH_SQL = text(f"""
+WITH place_hits AS MATERIALIZED (
+    SELECT rowid AS fts_rowid, rank AS score
+    FROM places_fts
+    WHERE places_fts MATCH :match AND rank MATCH 'bm25({PLACE_WEIGHTS[0]}, {PLACE_WEIGHTS[1]})'
+    ORDER BY rank LIMIT :candidates
+), review_hits AS MATERIALIZED (
+    SELECT rowid AS fts_rowid, rank AS score
+    FROM reviews_fts WHERE reviews_fts MATCH :match
+    ORDER BY rank LIMIT :candidates
+)
+SELECT place_id, SUM(score) AS score FROM (
+    SELECT p.id AS place_id, h.score AS score
+    FROM place_hits h JOIN places p ON p.rowid = h.fts_rowid
+    UNION ALL
+    SELECT r.place_id, {REVIEW_WEIGHT} * MIN(h.score)
+    FROM review_hits h JOIN reviews r ON r.rowid = h.fts_rowid
+    GROUP BY r.place_id
+)
+GROUP BY place_id
+ORDER BY score
+LIMIT :limit
+""")
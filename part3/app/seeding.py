@@ -0,0 +1,294 @@
+# app/seeding.py
+"""
+Synthetic data at load-test volumes (1M places, 20M reviews).
+
+generate() writes users, amenities, places (with their amenity links) and
+reviews in one transaction on the caller's connection:
+
+- rows are built as tuples and sent with the driver's executemany, in
+  chunks of `chunk_size`; ORM objects, or Core inserts with per-row bind
+  processing, cost several times more than SQLite itself
+- secondary indexes and the full-text search triggers are dropped for the
+  load, then indexes are rebuilt and the FTS tables re-indexed in bulk,
+  which is much faster than maintaining them row by row
+- reviews per place follow a Zipf law (review_skew, 0 = uniform), capped
+  at one review per user and place (the excess goes to other places), and
+  places are spread around `clusters` cities (Zipf-weighted by city_skew) with a
+  normal spread of spread_km; rating aggregates are computed as reviews are
+  generated, so places are consistent without a rebuild
+- the same `seed` produces the same data; ids are deterministic, so
+  generate() expects empty tables (see reset())
+
+Every user gets the same password hash: bcrypt per user would dominate.
+"""
+import random
+import time
+from array import array
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from app import search
+from app.geo import grid_cell
+from app.models import Amenity, Place, Review, User
+from app.models.place import place_amenities
+
+RATINGS = (1, 2, 3, 4, 5)
+# cumulative rating weights per place "quality" tier
+QUALITY_TIERS = tuple(tuple(accumulate(w)) for w in (
+    (1, 2, 4, 8, 6), (1, 1, 3, 10, 12), (0.5, 0.5, 2, 8, 20), (4, 4, 6, 5, 2), (1, 1, 2, 4, 30),
+))
+CITIES = (
+    ("Riyadh", 24.7136, 46.6753), ("Jeddah", 21.4858, 39.1925), ("Mecca", 21.3891, 39.8579),
+    ("Medina", 24.5247, 39.5692), ("Dammam", 26.4207, 50.0888), ("Abha", 18.2164, 42.5053),
+    ("Taif", 21.2703, 40.4158), ("Tabuk", 28.3838, 36.5550), ("Al Khobar", 26.2172, 50.1971),
+    ("AlUla", 26.6087, 37.9232), ("Hail", 27.5114, 41.7208), ("Jazan", 16.8892, 42.5511),
+    ("Najran", 17.5656, 44.2289), ("Yanbu", 24.0895, 38.0618), ("Al Baha", 20.0129, 41.4677),
+    ("Buraidah", 26.3592, 43.9818),
+)
+AMENITY_NAMES = (
+    "WiFi", "Kitchen", "Air Conditioning", "Free Parking", "Washer", "TV", "Workspace",
+    "Pool", "Gym", "Hot Tub", "Breakfast", "Balcony", "Garden", "BBQ Grill", "Elevator",
+    "Fireplace", "Sea View", "Crib", "EV Charger", "Sauna",
+)
+ADJECTIVES = ("Cozy", "Modern", "Spacious", "Bright", "Quiet", "Charming", "Elegant", "Rustic", "Sunny")
+KINDS = ("Apartment", "Villa", "Studio", "Loft", "Chalet", "House", "Suite", "Cabin", "Room")
+REVIEW_TEXTS = (
+    "Great place to stay, clean and comfortable.",
+    "Amazing location, would come back.",
+    "Nice host and easy check-in.",
+    "Good value for the price.",
+    "Quiet and cozy, perfect for a weekend.",
+    "A bit noisy at night but overall fine.",
+    "Not as described, the room needed cleaning.",
+    "Fast WiFi and a great workspace.",
+)
+# entity kind in the first id group, so ids of different tables never clash
+_USER, _AMENITY, _PLACE, _REVIEW = 1, 2, 3, 4
+
+
+def seed_id(kind, n):
+    """Deterministic UUID-shaped id of the n-th generated row of a kind"""
+    return f"{kind:08x}-0000-4000-8000-{n:012x}"
+
+
+def seed_email(n):
+    return f"user{n}@seed.hbnb.io"
+
+
+def _zipf_cum_weights(n, exponent):
+    return list(accumulate(1.0 / (rank ** exponent) for rank in range(1, n + 1)))
+
+
+def _split(total, n, exponent, rng):
+    """Split `total` into n Zipf-distributed counts, ranks assigned at random"""
+    if n == 0:
+        return []
+    weights = [1.0 / (rank ** exponent) for rank in range(1, n + 1)]
+    rng.shuffle(weights)
+    scale = total / sum(weights)
+    counts = [int(w * scale) for w in weights]
+    for i in rng.sample(range(n), total - sum(counts)):
+        counts[i] += 1
+    return counts
+
+
+def _cap(counts, cap, rng):
+    """Limit every count to `cap`, moving the excess to random counts still below it"""
+    excess = sum(c - cap for c in counts if c > cap)
+    counts = [min(c, cap) for c in counts]
+    room = [i for i, c in enumerate(counts) if c < cap]
+    while excess:
+        for i in rng.sample(room, min(excess, len(room))):
+            counts[i] += 1
+            excess -= 1
+        room = [i for i in room if counts[i] < cap]
+    return counts
+
+
+def _insert_sql(connection, table, columns):
+    """INSERT with positional parameters in `columns` order (a compiled Core insert uses table order)"""
+    quote = connection.dialect.identifier_preparer
+    return (f"INSERT INTO {quote.format_table(table)} ({', '.join(quote.quote(c) for c in columns)}) "
+            f"VALUES ({', '.join('?' * len(columns))})")
+
+
+def _executemany(connection, table, columns, rows):
+    if rows:
+        connection.exec_driver_sql(_insert_sql(connection, table, columns), rows)
+
+
+class _Writer:
+    """Buffer rows for one table and flush them every chunk_size rows"""
+
+    def __init__(self, connection, table, columns, chunk_size):
+        self.connection, self.table, self.columns = connection, table, columns
+        self.chunk_size = chunk_size
+        self.rows = []
+        self.count = 0
+
+    def add(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= self.chunk_size:
+            self.flush()
+
+    def extend(self, rows):
+        self.rows.extend(rows)
+        if len(self.rows) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        _executemany(self.connection, self.table, self.columns, self.rows)
+        self.count += len(self.rows)
+        self.rows = []
+
+
+_BULK_TABLES = (User.__table__, Amenity.__table__, Place.__table__, Review.__table__, place_amenities)
+
+
+def _drop_search_triggers(connection):
+    for table, (fts, _) in search._INDEXES.items():
+        for suffix in ("ai", "ad", "au"):
+            connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+
+
+def reset(connection):
+    """Empty every table (and the FTS index) in the caller's transaction"""
+    search.create_search_index(connection)  # databases older than the FTS tables
+    _drop_search_triggers(connection)  # DELETE without triggers truncates
+    for table in reversed(_BULK_TABLES):
+        connection.exec_driver_sql(f"DELETE FROM {table.name}")
+    for fts, _ in search._INDEXES.values():
+        connection.exec_driver_sql(f"INSERT INTO {fts}({fts}) VALUES ('delete-all')")
+    search.create_search_index(connection)
+
+
+def is_empty(connection):
+    return all(
+        connection.exec_driver_sql(f"SELECT 1 FROM {t.name} LIMIT 1").first() is None
+        for t in _BULK_TABLES
+    )
+
+
+def generate(connection, password_hash, users=1000, places=10000, reviews=100000,
+             amenities=20, amenities_per_place=5, review_skew=1.0, clusters=8,
+             city_skew=1.0, spread_km=10.0, seed=42, chunk_size=50000, progress=None):
+    """
+    Insert synthetic rows into empty tables; returns {step: (rows, seconds)}
+    (rows is None for the index rebuild).
+
+    `progress(step, rows, seconds)` is called after each step.
+    """
+    if (places and not users) or (reviews and not places):
+        raise ValueError("places need users (owners) and reviews need places")
+    if reviews > users * places:
+        raise ValueError("one review per user and place: reviews cannot exceed users * places")
+    rng = random.Random(seed)
+    stats = {}
+    clock = time.perf_counter()
+    now = datetime.utcnow().replace(microsecond=0)
+
+    def done(table, count):
+        nonlocal clock
+        elapsed = time.perf_counter() - clock
+        stats[table] = (count, elapsed)
+        if progress:
+            progress(table, count, elapsed)
+        clock = time.perf_counter()
+
+    # timestamps over the last two years, formatted once the way SQLAlchemy
+    # stores DateTime on SQLite (keyset cursors compare them as strings)
+    timestamps = [(now - timedelta(minutes=37 * i)).strftime("%Y-%m-%d %H:%M:%S.%f")
+                  for i in range(28000)]
+
+    indexes = [index for table in _BULK_TABLES for index in table.indexes]
+    _drop_search_triggers(connection)
+    for index in indexes:
+        index.drop(connection, checkfirst=True)
+
+    # ---------- users ----------
+    user_ids = [seed_id(_USER, i) for i in range(users)]
+    columns = ("id", "email", "password", "first_name", "last_name", "is_admin", "created_at", "updated_at")
+    writer = _Writer(connection, User.__table__, columns, chunk_size)
+    for i, user_id in enumerate(user_ids):
+        ts = timestamps[-1 - i % len(timestamps)]
+        writer.add((user_id, seed_email(i), password_hash, "Seed", f"User {i}", False, ts, ts))
+    writer.flush()
+    done("users", writer.count)
+
+    # ---------- amenities ----------
+    amenity_ids = [seed_id(_AMENITY, i) for i in range(amenities)]
+    names = [AMENITY_NAMES[i] if i < len(AMENITY_NAMES) else f"Amenity {i}" for i in range(amenities)]
+    ts = timestamps[-1]
+    _executemany(connection, Amenity.__table__, ("id", "name", "created_at", "updated_at"),
+                 [(aid, name, ts, ts) for aid, name in zip(amenity_ids, names)])
+    done("amenities", amenities)
+
+    # ---------- places and amenity links ----------
+    cities = CITIES[:max(1, min(clusters, len(CITIES)))]
+    city_weights = _zipf_cum_weights(len(cities), city_skew)
+    amenity_weights = _zipf_cum_weights(amenities, 1.0) if amenities else []
+    review_counts = _cap(_split(reviews, places, review_skew, rng), users, rng)
+    histograms = array("I")  # 5 star counts per place, flat
+    spread = spread_km / 111.0  # degrees of latitude
+
+    place_columns = ("id", "name", "description", "city", "price_per_night", "latitude", "longitude",
+                     "geocell", "rating_sum", "review_count", "rating_1", "rating_2", "rating_3",
+                     "rating_4", "rating_5", "owner_id", "created_at", "updated_at")
+    places_writer = _Writer(connection, Place.__table__, place_columns, chunk_size)
+    links_writer = _Writer(connection, place_amenities, ("place_id", "amenity_id"), chunk_size)
+    place_cities = rng.choices(cities, cum_weights=city_weights, k=places)
+    owners = rng.choices(user_ids, k=places) if users else []
+    for i in range(places):
+        place_id = seed_id(_PLACE, i)
+        city, lat0, lon0 = place_cities[i]
+        lat = round(rng.gauss(lat0, spread), 6)
+        lon = round(rng.gauss(lon0, spread), 6)
+
+        count = review_counts[i]
+        ratings = rng.choices(RATINGS, cum_weights=rng.choice(QUALITY_TIERS), k=count)
+        histogram = [ratings.count(r) for r in RATINGS]
+        histograms.extend(histogram)
+
+        name = f"{rng.choice(ADJECTIVES)} {rng.choice(KINDS)} in {city}"
+        ts = timestamps[-1 - (i * 7) % len(timestamps)]
+        places_writer.add((
+            place_id, name, f"{name}, {rng.randint(1, 6)} guests", city,
+            round(rng.lognormvariate(5.0, 0.5), 2), lat, lon, grid_cell(lat, lon),
+            sum(r * n for r, n in zip(RATINGS, histogram)), count, *histogram,
+            owners[i], ts, ts,
+        ))
+        if amenities:
+            k = min(amenities, max(0, int(rng.gauss(amenities_per_place, 2))))
+            chosen = set(rng.choices(amenity_ids, cum_weights=amenity_weights, k=k))
+            links_writer.extend([(place_id, aid) for aid in chosen])
+    places_writer.flush()
+    links_writer.flush()
+    done("places + amenity links", places_writer.count + links_writer.count)
+
+    # ---------- reviews ----------
+    columns = ("id", "text", "rating", "user_id", "place_id", "created_at", "updated_at")
+    writer = _Writer(connection, Review.__table__, columns, chunk_size)
+    n = 0
+    for i, count in enumerate(review_counts):
+        if not count:
+            continue
+        place_id = seed_id(_PLACE, i)
+        ratings = [r for r, times in zip(RATINGS, histograms[5 * i:5 * i + 5]) for _ in range(times)]
+        authors = rng.sample(user_ids, count)
+        texts = rng.choices(REVIEW_TEXTS, k=count)
+        stamps = [timestamps[(n + k) * 13 % len(timestamps)] for k in range(count)]
+        writer.extend([
+            (seed_id(_REVIEW, n + k), texts[k], ratings[k], authors[k], place_id, stamps[k], stamps[k])
+            for k in range(count)
+        ])
+        n += count
+    writer.flush()
+    done("reviews", writer.count)
+
+    # ---------- indexes and full-text search ----------
+    for index in indexes:
+        index.create(connection)
+    done("indexes", None)
+    counts = search.rebuild_search_index(connection)
+    done("search index", sum(counts.values()))
+    return stats
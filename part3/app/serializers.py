@@ -0,0 +1,123 @@
+# app/serializers.py
+"""
+Precompiled response serializers.
+
+make_serializer() generates the source of one function per (model, field
+set), e.g.
+
+    def serialize(obj):
+        return {"id": obj.id, "created_at": (v.isoformat() if (v := obj.created_at) is not None else None)}
+
+and compiles it once. DateTime columns are detected from the table
+metadata at build time, so nothing inspects columns per object.
+"""
+import json
+
+from flask import make_response
+
+from app.extensions import db
+from app.models import User, Place, Review, Amenity
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib encoder
+    orjson = None
+
+_registry = {}
+
+
+def make_serializer(model, fields, computed=None):
+    """
+    Return a compiled `obj -> dict` function for `fields` of `model`.
+
+    `computed` maps field names to callables taking the object, for values
+    that are not plain attributes. Serializers are cached per
+    (model, fields, computed) so repeated calls are free.
+    """
+    fields = tuple(fields)
+    computed = dict(computed or {})
+    key = (model, fields, tuple(sorted(computed.items(), key=lambda kv: kv[0])))
+    fn = _registry.get(key)
+    if fn is not None:
+        return fn
+
+    columns = model.__table__.columns
+    namespace = {}
+    parts = []
+    for i, name in enumerate(fields):
+        if name in computed:
+            namespace[f"_c{i}"] = computed[name]
+            expr = f"_c{i}(obj)"
+        elif name in columns and isinstance(columns[name].type, db.DateTime):
+            expr = f"(v.isoformat() if (v := obj.{name}) is not None else None)"
+        else:
+            expr = f"obj.{name}"
+        parts.append(f"{name!r}: {expr}")
+
+    source = "def serialize(obj):\n    return {" + ", ".join(parts) + "}\n"
+    exec(compile(source, f"<serializer {model.__name__}>", "exec"), namespace)
+    fn = namespace["serialize"]
+    _registry[key] = fn
+    return fn
+
+
+def full_name(user):
+    return f"{user.first_name} {user.last_name}" if user else None
+
+
+def _amenity_ids(place):
+    return [a.id for a in (place.amenities or [])]
+
+
+def _review_count(place):
+    return place.review_count or 0
+
+
+TIMESTAMPS = ("created_at", "updated_at")
+
+serialize_user = make_serializer(User, ("id", "email", "first_name", "last_name", "is_admin"))
+serialize_new_user = make_serializer(User, ("id", "email", "first_name", "last_name"))
+
+serialize_amenity = make_serializer(Amenity, ("id", "name", "description") + TIMESTAMPS)
+
+serialize_review = make_serializer(
+    Review, ("id", "text", "rating", "user_id", "place_id") + TIMESTAMPS
+)
+serialize_review_with_author = make_serializer(
+    Review,
+    ("id", "text", "rating", "user_id", "user_name", "place_id") + TIMESTAMPS,
+    computed={"user_name": lambda r: full_name(r.user)},
+)
+
+PLACE_FIELDS = (
+    "id", "name", "description", "city", "price_per_night",
+    "latitude", "longitude", "owner_id", "amenities", "avg_rating", "review_count",
+)
+serialize_place = make_serializer(
+    Place,
+    PLACE_FIELDS + TIMESTAMPS,
+    computed={"amenities": _amenity_ids, "review_count": _review_count},
+)
+serialize_place_detail = make_serializer(
+    Place,
+    PLACE_FIELDS + ("host_name", "rating_histogram") + TIMESTAMPS,
+    computed={
+        "amenities": _amenity_ids,
+        "review_count": _review_count,
+        "host_name": lambda p: full_name(p.owner),
+    },
+)
+
+
+def dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def output_json(data, code, headers=None):
+    """Flask-RESTX representation for application/json using the fastest encoder available"""
+    resp = make_response(dumps(data), code)
+    resp.headers.extend(headers or {})
+    resp.mimetype = "application/json"
+    return resp
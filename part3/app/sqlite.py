@@ -0,0 +1,73 @@
+# app/sqlite.py
+"""
+SQLite connection setup.
+
+pysqlite opens transactions lazily (only before DML) and treats SAVEPOINT
+as a plain statement, so a savepoint taken before the first write would
+start, and RELEASE would commit, the real transaction. Turning the
+driver's own transaction handling off and emitting BEGIN ourselves gives
+SQLAlchemy proper transactions and nested savepoints.
+
+BEGIN stays lazy: plain reads run outside any transaction, and the first
+statement that is not a read (DML, DDL, SAVEPOINT) starts one with BEGIN
+IMMEDIATE. Compiled statements are classified by their execution context,
+so an INSERT ... SELECT or a DML statement with a CTE counts as a write;
+raw SQL by its first keyword, with WITH taken as a read (raw DML with a
+CTE would need a compiled construct). That takes the write lock up front, waiting up to busy_timeout,
+instead of upgrading a read transaction at the first write, which fails at
+once with "database is locked" (no busy_timeout retry) if another
+connection committed in between.
+
+begin_immediate(connection) takes the write lock before the next
+statement, reads included: facade.transaction() uses it so that the reads
+of a block and the writes that depend on them see the same data.
+
+Configured pragmas (SQLITE_PRAGMAS, e.g. WAL and busy_timeout in
+production) are applied once per new connection, before it enters the pool.
+"""
+from sqlalchemy import event
+
+# raw SQL starting with these never starts a transaction
+_READS = ("SELECT", "WITH", "PRAGMA", "EXPLAIN")
+
+
+def configure_sqlite(engine, pragmas=None):
+    """Attach the connection hooks to `engine` if it is a SQLite engine"""
+    if engine.dialect.name != "sqlite":
+        return
+    pragmas = dict(pragmas or {})
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        for name, value in pragmas.items():
+            dbapi_connection.execute(f"PRAGMA {name}={value}")
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _on_execute(conn, cursor, statement, parameters, context, executemany):
+        if _is_write(statement, context):
+            begin_immediate(conn)
+
+
+def _is_write(statement, context):
+    if context is not None and (context.isinsert or context.isupdate
+                                or context.isdelete or context.isddl):
+        return True
+    return not statement.lstrip()[:7].upper().startswith(_READS)
+
+
+def begin_immediate(conn):
+    """Start a write-locked transaction on `conn` unless one is already open (SQLite only)"""
+    if conn.dialect.name != "sqlite":
+        return
+    # straight on the driver connection: transaction control is not a
+    # statement, so it stays out of the cursor events used to count queries
+    driver_connection = conn.connection.driver_connection
+    if not driver_connection.in_transaction:
+        driver_connection.execute("BEGIN IMMEDIATE")
+
+
+def read_pragmas(engine, names):
+    """Return {name: value} as seen by a pooled connection"""
+    with engine.connect() as conn:
+        return {name: conn.exec_driver_sql(f"PRAGMA {name}").scalar() for name in names}
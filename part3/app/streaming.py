@@ -0,0 +1,46 @@
+# app/streaming.py
+"""
+Opt-in streaming for large list endpoints.
+
+`?stream=1` streams the usual `{"<key>": [...], "next_cursor": null}`
+envelope; `Accept: application/x-ndjson` streams one JSON object per line.
+Rows come from a yield_per query and are encoded one at a time, so memory
+stays flat however many rows there are.
+"""
+from flask import Response, request, stream_with_context
+
+from app.serializers import dumps
+
+NDJSON = "application/x-ndjson"
+STREAM_BATCH_SIZE = 500
+
+
+def wants_stream():
+    if request.args.get("stream", "").lower() in ("1", "true", "yes"):
+        return True
+    return request.accept_mimetypes.best == NDJSON
+
+
+def stream_response(key, rows, serialize):
+    """Return a chunked Response encoding `rows` with `serialize` as they are read"""
+    ndjson = request.accept_mimetypes.best == NDJSON
+
+    def generate():
+        if ndjson:
+            for row in rows:
+                yield dumps(serialize(row)) + b"\n"
+            return
+
+        yield b'{"' + key.encode("utf-8") + b'":['
+        first = True
+        for row in rows:
+            if not first:
+                yield b","
+            first = False
+            yield dumps(serialize(row))
+        yield b'],"next_cursor":null}'
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype=NDJSON if ndjson else "application/json",
+    )
@@ -0,0 +1,76 @@
+# app/swagger.py
+"""
+swagger.json built lazily and cached on disk.
+
+Flask-RESTX builds the spec on the first request for /swagger.json, in
+every worker. With SWAGGER_CACHE set (a path, relative to the instance
+folder) the first worker writes the spec there and the others, and later
+restarts, load it instead. The file carries a fingerprint of the API
+version and of the modules defining the resources, so editing an endpoint
+invalidates it. `flask --app run build-swagger` writes it ahead of time.
+"""
+import hashlib
+import json
+import os
+import sys
+from functools import cached_property
+
+import flask_restx
+from flask_restx import Api
+
+try:
+    import orjson
+except ImportError:  # optional, as in app/serializers.py
+    orjson = None
+
+FINGERPRINT_KEY = "x-fingerprint"
+
+
+def _loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _dumps(spec):
+    if orjson is not None:
+        return orjson.dumps(spec)
+    return json.dumps(spec, separators=(",", ":")).encode("utf-8")
+
+
+class CachedSpecApi(Api):
+    def _spec_fingerprint(self):
+        sources = set()
+        for resource, *_ in self.resources:
+            module = sys.modules.get(resource.__module__)
+            if getattr(module, "__file__", None):
+                st = os.stat(module.__file__)
+                sources.add((module.__file__, st.st_mtime_ns, st.st_size))
+        key = repr((flask_restx.__version__, self.version, self.title, self.prefix, sorted(sources)))
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def _spec_cache_path(self):
+        path = self.app.config.get("SWAGGER_CACHE") if self.app else None
+        return os.path.join(self.app.instance_path, path) if path else None
+
+    @cached_property
+    def __schema__(self):
+        path = self._spec_cache_path()
+        if path is None:
+            return super().__schema__
+        fingerprint = self._spec_fingerprint()
+        try:
+            with open(path, "rb") as f:
+                spec = _loads(f.read())
+            if spec.get(FINGERPRINT_KEY) == fingerprint:
+                return spec
+        except (OSError, ValueError):
+            pass
+
+        spec = super().__schema__
+        if "paths" in spec:  # not Flask-RESTX's {"error": ...} fallback
+            spec = {**spec, FINGERPRINT_KEY: fingerprint}
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(_dumps(spec))
+            os.replace(tmp, path)  # atomic: concurrent workers never read half a file
+        return spec
@@ -0,0 +1,133 @@
+"""
+Benchmark: "places with all of these amenities" via the in-memory index vs SQL.
+
+Bulk-inserts --places places with a skewed number of amenity links (common
+amenities are on most places, rare ones on few) into a file-backed database,
+then times, for amenity sets of different selectivity:
+
+  index       AmenityIndex.places_with_all() (bitmap AND + decoding ids)
+  group by    SELECT place_id ... WHERE amenity_id IN (...) GROUP BY HAVING count = n
+  exists      one EXISTS per amenity on places (the SQL fallback)
+
+    python -m benchmarks.amenity_filter --places 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import insert, text
+
+from app import create_app
+from app.amenity_index import get_amenity_index
+from app.extensions import db
+from app.models import Amenity, User, Place
+from app.models.place import place_amenities
+from config import config, TestingConfig
+
+# name -> share of places having it
+AMENITIES = {
+    "WiFi": 0.9, "Kitchen": 0.7, "Parking": 0.5, "Air conditioning": 0.6, "Washer": 0.4,
+    "Pool": 0.15, "Gym": 0.1, "Hot tub": 0.05, "Fireplace": 0.04, "Sauna": 0.01,
+}
+QUERIES = (("WiFi",), ("WiFi", "Kitchen"), ("Pool", "Gym"), ("WiFi", "Pool", "Hot tub"), ("Sauna", "Fireplace"))
+
+
+def _seed(places, batch=10000, seed=42):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    owner_id = str(uuid.uuid4())
+    db.session.execute(insert(User), [{
+        "id": owner_id, "email": "owner@bench.io", "password": "x",
+        "first_name": "Bench", "last_name": "Owner", "is_admin": False,
+        "created_at": now, "updated_at": now,
+    }])
+    amenity_ids = {name: str(uuid.uuid4()) for name in AMENITIES}
+    db.session.execute(insert(Amenity), [
+        {"id": amenity_ids[name], "name": name, "created_at": now, "updated_at": now}
+        for name in AMENITIES
+    ])
+    links = 0
+    for start in range(0, places, batch):
+        rows, link_rows = [], []
+        for _ in range(start, min(start + batch, places)):
+            place_id = str(uuid.uuid4())
+            rows.append({
+                "id": place_id, "name": "Place", "description": "", "city": "Riyadh",
+                "price_per_night": 100.0, "latitude": 24.7, "longitude": 46.6,
+                "owner_id": owner_id, "created_at": now, "updated_at": now,
+            })
+            link_rows += [{"place_id": place_id, "amenity_id": amenity_ids[name]}
+                          for name, share in AMENITIES.items() if rng.random() < share]
+        db.session.execute(insert(Place), rows)
+        db.session.execute(insert(place_amenities), link_rows)
+        links += len(link_rows)
+    db.session.commit()
+    return amenity_ids, links
+
+
+def _time(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000, result
+
+
+GROUP_BY = """
+SELECT place_id FROM place_amenities WHERE amenity_id IN ({ids})
+GROUP BY place_id HAVING count(*) = {n}
+"""
+EXISTS = """
+SELECT id FROM places p WHERE {clauses}
+"""
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--places", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "amenities.db")
+        config["benchmark"] = type("BenchmarkConfig", (TestingConfig,), {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}",
+        })
+        app = create_app("benchmark")
+        with app.app_context():
+            amenity_ids, links = _seed(args.places)
+            start = time.perf_counter()
+            index = get_amenity_index()
+            print(f"{args.places} places, {links} links; index built in "
+                  f"{(time.perf_counter() - start) * 1000:.0f} ms")
+
+            print(f"  {'amenities':<28} {'matches':>8} {'index ms':>9} {'group by ms':>12} {'exists ms':>10}")
+            for names in QUERIES:
+                ids = [amenity_ids[n] for n in names]
+                index_ms, matches = _time(lambda: index.places_with_all(names), args.repeat)
+
+                params = {f"a{i}": a for i, a in enumerate(ids)}
+                group_by = text(GROUP_BY.format(
+                    ids=", ".join(f":a{i}" for i in range(len(ids))), n=len(ids)))
+                group_ms, rows = _time(lambda: db.session.execute(group_by, params).all(), args.repeat)
+                exists = text(EXISTS.format(clauses=" AND ".join(
+                    f"EXISTS (SELECT 1 FROM place_amenities pa WHERE pa.place_id = p.id "
+                    f"AND pa.amenity_id = :a{i})" for i in range(len(ids)))))
+                exists_ms, _ = _time(lambda: db.session.execute(exists, params).all(), args.repeat)
+                assert len(rows) == len(matches)
+                print(f"  {', '.join(names):<28} {len(matches):>8} {index_ms:>9.2f} "
+                      f"{group_ms:>12.2f} {exists_ms:>10.2f}")
+            db.session.remove()
+            db.engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Regression benchmark: GET /api/v1/amenities/ must not depend on how many
+places and reviews exist.
+
+Times the endpoint against the same amenities with a small and a large
+place/review volume, and fails if the large run is noticeably slower or
+touches any table other than `amenities`.
+
+    python -m benchmarks.amenity_list --places 20000 --reviews 100000
+"""
+import argparse
+import gc
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import event, insert
+
+from app import create_app
+from app.extensions import db
+from app.models import User, Place, Review, Amenity
+
+
+def _seed(amenities, places, reviews):
+    now = datetime.utcnow()
+    owner_id = str(uuid.uuid4())
+    db.session.execute(insert(User), [{
+        "id": owner_id, "email": "owner@bench.io", "password": "x",
+        "first_name": "Bench", "last_name": "Owner", "is_admin": False,
+        "created_at": now, "updated_at": now,
+    }])
+    db.session.execute(insert(Amenity), [
+        {"id": str(uuid.uuid4()), "name": f"amenity-{i}", "created_at": now, "updated_at": now}
+        for i in range(amenities)
+    ])
+    place_ids = [str(uuid.uuid4()) for _ in range(places)]
+    if place_ids:
+        db.session.execute(insert(Place), [{
+            "id": pid, "name": "p", "description": "", "city": "Riyadh",
+            "price_per_night": 100.0, "latitude": 24.7, "longitude": 46.6,
+            "owner_id": owner_id, "created_at": now, "updated_at": now,
+        } for pid in place_ids])
+    if place_ids and reviews:
+        db.session.execute(insert(Review), [{
+            "id": str(uuid.uuid4()), "text": "ok", "rating": 4, "user_id": owner_id,
+            "place_id": place_ids[i % len(place_ids)], "created_at": now, "updated_at": now,
+        } for i in range(reviews)])
+    db.session.commit()
+
+
+def measure(amenities, places, reviews, requests):
+    """Return (median seconds per request, SQL statements of one request)"""
+    app = create_app("testing")
+    # measure the query path, not response cache hits
+    app.extensions.pop("response_cache", None)
+    with app.app_context():
+        _seed(amenities, places, reviews)
+        client = app.test_client()
+
+        statements = []
+
+        def before_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", before_execute)
+        client.get("/api/v1/amenities/")
+        event.remove(db.engine, "before_cursor_execute", before_execute)
+
+        for _ in range(20):
+            client.get("/api/v1/amenities/")
+        gc.collect()
+
+        timings = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            res = client.get("/api/v1/amenities/")
+            timings.append(time.perf_counter() - start)
+            assert res.status_code == 200
+
+        db.session.remove()
+        db.drop_all()
+    return statistics.median(timings), statements
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--amenities", type=int, default=50)
+    parser.add_argument("--places", type=int, default=20000)
+    parser.add_argument("--reviews", type=int, default=100000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--max-ratio", type=float, default=2.0,
+                        help="fail if large/small median latency exceeds this")
+    args = parser.parse_args(argv)
+
+    small, small_sql = measure(args.amenities, 0, 0, args.requests)
+    large, large_sql = measure(args.amenities, args.places, args.reviews, args.requests)
+    ratio = large / small
+
+    print(f"amenities={args.amenities}")
+    print(f"  empty catalogue : {small * 1e3:.3f} ms/request, {len(small_sql)} queries")
+    print(f"  {args.places} places / {args.reviews} reviews: "
+          f"{large * 1e3:.3f} ms/request, {len(large_sql)} queries")
+    print(f"  ratio: {ratio:.2f} (max {args.max_ratio})")
+
+    foreign = [s for s in large_sql if "places" in s or "reviews" in s or "users" in s]
+    if foreign:
+        print("FAIL: amenity listing touched other tables:\n  " + "\n  ".join(foreign))
+        return 1
+    if ratio > args.max_ratio:
+        print("FAIL: amenity listing cost grows with place/review volume")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+Benchmark: commits per write request with the unit-of-work transaction.
+
+Creates places with N amenities and one review each on a file-backed
+SQLite database, once with every repository write committing on its own
+(the way seed.py builds places) and once inside facade.transaction(), and
+reports commits and time per operation. Then counts the commits of the
+POST /places and POST /places/<id>/reviews endpoints.
+
+    python -m benchmarks.commits_per_request --operations 200 --amenities 5
+"""
+import argparse
+import contextlib
+import os
+import sys
+import tempfile
+import time
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+
+from app import create_app
+from app.business.facade import HBnBFacade
+from app.extensions import db
+from app.models import User, Place, Review, Amenity
+from config import config, TestingConfig
+
+
+class CommitCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, session):
+        self.count += 1
+
+
+def _create(facade, owner, guest, amenity_ids, i):
+    place = facade.create(Place(name=f"Place {i}", description="", city="Riyadh",
+                                price_per_night=100, latitude=24.7, longitude=46.6,
+                                owner_id=owner.id))
+    for amenity_id in amenity_ids:
+        facade.add_place_amenities(place, [amenity_id])
+    facade.create(Review(text="ok", rating=4, user_id=guest.id, place_id=place.id))
+
+
+def run_flow(facade, owner, guest, amenity_ids, operations, grouped, counter):
+    counter.count = 0
+    start = time.perf_counter()
+    for i in range(operations):
+        scope = facade.transaction() if grouped else contextlib.nullcontext()
+        with scope:
+            _create(facade, owner, guest, amenity_ids, i)
+    elapsed = time.perf_counter() - start
+    return counter.count / operations, elapsed / operations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--operations", type=int, default=200)
+    parser.add_argument("--amenities", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config["benchmark"] = type("BenchmarkConfig", (TestingConfig,), {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+        })
+        app = create_app("benchmark")
+        with app.app_context():
+            facade = HBnBFacade()
+            owner = User(email="owner@bench.io", first_name="Bench", last_name="Owner")
+            guest = User(email="guest@bench.io", first_name="Bench", last_name="Guest")
+            amenities = [Amenity(name=f"amenity-{i}") for i in range(args.amenities)]
+            for user in (owner, guest):
+                user.set_password("bench1234")
+            db.session.add_all([owner, guest, *amenities])
+            db.session.commit()
+            amenity_ids = [a.id for a in amenities]
+
+            counter = CommitCounter()
+            event.listen(db.session, "after_commit", counter)
+
+            print(f"{args.operations} x (place + {args.amenities} amenity links + 1 review)")
+            for label, grouped in (("commit per write", False), ("facade.transaction()", True)):
+                commits, seconds = run_flow(facade, owner, guest, amenity_ids,
+                                            args.operations, grouped, counter)
+                print(f"  {label:<22} {commits:>5.1f} commits/op {seconds * 1000:>8.2f} ms/op")
+
+            client = app.test_client()
+            headers = {"Authorization": "Bearer " + create_access_token(
+                identity=owner.id, additional_claims={"is_admin": False})}
+            counter.count = 0
+            res = client.post("/api/v1/places/", headers=headers, json={
+                "name": "Loft", "city": "Riyadh", "price_per_night": 90,
+                "latitude": 24.7, "longitude": 46.6, "amenities": amenity_ids,
+            })
+            print(f"  {'POST /places/ (%d)' % res.status_code:<32} {counter.count} commit(s)")
+
+            headers = {"Authorization": "Bearer " + create_access_token(
+                identity=guest.id, additional_claims={"is_admin": False})}
+            counter.count = 0
+            res = client.post(f"/api/v1/places/{res.get_json()['id']}/reviews", headers=headers,
+                              json={"text": "Great", "rating": 5})
+            print(f"  {'POST /places/<id>/reviews (%d)' % res.status_code:<32} {counter.count} commit(s)")
+
+            event.remove(db.session, "after_commit", counter)
+            db.session.remove()
+            db.engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,432 @@
+"""
+Benchmark: HTTP load test of the main API endpoints.
+
+Seeds a file-backed database with --users/--places/--reviews, then N client
+threads send a weighted mix of requests for --duration seconds:
+
+  list          GET  /api/v1/places/?limit=20
+  detail        GET  /api/v1/places/<id>
+  reviews       GET  /api/v1/places/<id>/reviews
+  login         POST /api/v1/auth/login
+  review_post   POST /api/v1/places/<id>/reviews (one per user and place:
+                a (user, place) pair is used once, then POSTs get 400)
+
+and reports, per endpoint, throughput, p50/p95/p99 latency and SQL
+queries per request. Requests run in-process through the Flask test client
+by default; --live starts the app in a local threaded HTTP server and
+drives it over real sockets, --url targets a server that is already
+running (with --email/--password of an existing user).
+
+--save writes the results to a JSON baseline; --compare reads one and exits
+with status 1 when p95 latency, throughput or queries per request regress
+by more than --tolerance.
+
+    python -m benchmarks.load --places 2000 --concurrency 8 --duration 10 --save baseline.json
+    python -m benchmarks.load --live --compare baseline.json
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from datetime import datetime
+
+from flask import g, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from config import config, ProductionConfig, TestingConfig
+
+PASSWORD = "bench1234"
+QUERY_COUNT_HEADER = "X-Query-Count"
+# run settings that must match for a baseline comparison to mean much
+COMPARABLE = ("mode", "users", "places", "reviews", "concurrency", "mix", "cache", "bcrypt_rounds")
+DEFAULT_MIX = "list=30,detail=30,reviews=20,login=5,review_post=15"
+
+
+# ---------- server side ----------
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        g._load_queries = g.get("_load_queries", 0) + 1
+
+
+def instrument(app):
+    """Report the SQL statements of each request in an X-Query-Count header"""
+    if not event.contains(Engine, "before_cursor_execute", _count_query):
+        event.listen(Engine, "before_cursor_execute", _count_query)
+
+    @app.after_request
+    def _query_count_header(response):
+        response.headers[QUERY_COUNT_HEADER] = str(g.get("_load_queries", 0))
+        return response
+
+
+def make_app(db_path, bcrypt_rounds, hash_workers, cache):
+    from app import create_app
+
+    config["load"] = type("LoadConfig", (TestingConfig,), {
+        "TESTING": False,
+        "JWT_SECRET_KEY": "load-test-secret-key-of-at-least-32-bytes",
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_path}",
+        "SQLALCHEMY_ENGINE_OPTIONS": ProductionConfig.SQLALCHEMY_ENGINE_OPTIONS,
+        "SQLITE_PRAGMAS": ProductionConfig.SQLITE_PRAGMAS,
+        "BCRYPT_LOG_ROUNDS": bcrypt_rounds,
+        "PASSWORD_HASH_WORKERS": hash_workers,
+        "RESPONSE_CACHE_MAX_ENTRIES": 1024 if cache else 0,
+    })
+    app = create_app("load")
+    instrument(app)
+    return app
+
+
+def seed(app, users, places, reviews, seed=42):
+    """Bulk-generate the data set (app/seeding.py); returns the users' emails"""
+    from app import seeding
+    from app.extensions import db
+
+    with app.app_context():
+        password = app.extensions["password_hasher"].hash(PASSWORD)  # one hash for everyone
+        seeding.generate(db.session.connection(), password, users=users, places=places,
+                         reviews=reviews, seed=seed)
+        db.session.commit()
+        db.session.remove()
+    return [seeding.seed_email(i) for i in range(users)]
+
+
+def serve(db_path, port, bcrypt_rounds, hash_workers, cache):
+    """Child process for --live: a threaded HTTP server on 127.0.0.1:port"""
+    import logging
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    app = make_app(db_path, bcrypt_rounds, hash_workers, cache)
+    app.run(host="127.0.0.1", port=port, threaded=True, use_reloader=False)
+
+
+# ---------- clients ----------
+class InProcessClient:
+    def __init__(self, app):
+        self._client = app.test_client()
+
+    def request(self, method, path, body=None, headers=None):
+        res = self._client.open(path, method=method, json=body, headers=headers)
+        data = res.get_data()
+        return res.status_code, res.headers.get(QUERY_COUNT_HEADER), data
+
+
+class HttpClient:
+    """One keep-alive connection per client thread"""
+
+    def __init__(self, base_url):
+        url = urllib.parse.urlsplit(base_url)
+        self._prefix = url.path.rstrip("/")
+        self._conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=60)
+
+    def request(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+        try:
+            self._conn.request(method, self._prefix + path, payload, headers)
+            res = self._conn.getresponse()
+        except (http.client.HTTPException, ConnectionError):
+            self._conn.close()  # reconnect on next request
+            raise
+        data = res.read()
+        return res.status, res.getheader(QUERY_COUNT_HEADER), data
+
+
+# ---------- workload ----------
+class Workload:
+    """Picks requests from the mix; shared read-only state plus per-thread rngs"""
+
+    def __init__(self, mix, place_ids, credentials, password, tokens):
+        self.names = list(mix)
+        self.weights = [mix[n] for n in self.names]
+        self.place_ids = place_ids
+        self.credentials = credentials
+        self.password = password
+        self.tokens = tokens
+        # a user reviews a place once: each POST takes a pair not used yet
+        pairs = [(token, pid) for token in tokens for pid in place_ids]
+        random.Random(0).shuffle(pairs)
+        self._review_pairs = iter(pairs)
+        self._pairs_lock = threading.Lock()
+
+    def next_request(self, rng):
+        name = rng.choices(self.names, weights=self.weights)[0]
+        place_id = rng.choice(self.place_ids)
+        if name == "list":
+            return name, "GET", "/api/v1/places/?limit=20", None, None
+        if name == "detail":
+            return name, "GET", f"/api/v1/places/{place_id}", None, None
+        if name == "reviews":
+            return name, "GET", f"/api/v1/places/{place_id}/reviews?limit=20", None, None
+        if name == "login":
+            email = rng.choice(self.credentials)
+            return name, "POST", "/api/v1/auth/login", {"email": email, "password": self.password}, None
+        if name == "review_post":
+            with self._pairs_lock:
+                token, place_id = next(self._review_pairs, (rng.choice(self.tokens), place_id))
+            headers = {"Authorization": f"Bearer {token}"}
+            body = {"text": "Load test review", "rating": rng.randint(1, 5)}
+            return name, "POST", f"/api/v1/places/{place_id}/reviews", body, headers
+        raise ValueError(f"Unknown endpoint in mix: {name}")
+
+
+def prepare(client, credentials, password, logins=8):
+    """Place ids from the API and a few tokens for review POSTs (not timed)"""
+    status, _, data = client.request("GET", "/api/v1/places/?limit=200")
+    if status != 200:
+        raise RuntimeError(f"GET /places/ failed with {status}")
+    place_ids = [p["id"] for p in json.loads(data)["places"]]
+    if not place_ids:
+        raise RuntimeError("No places to load test")
+    tokens = []
+    for email in credentials[:logins]:
+        status, _, data = client.request(
+            "POST", "/api/v1/auth/login", {"email": email, "password": password})
+        if status != 200:
+            raise RuntimeError(f"Login as {email} failed with {status}")
+        tokens.append(json.loads(data)["access_token"])
+    return place_ids, tokens
+
+
+def run_load(make_client, workload, concurrency, duration, seed=42):
+    """Drive the workload from `concurrency` threads; returns [(name, status, seconds, queries)]"""
+    results = [[] for _ in range(concurrency)]
+    errors = []
+    deadline = time.perf_counter() + duration
+
+    def worker(i):
+        rng = random.Random(seed + i)
+        client = make_client()
+        out = results[i]
+        while time.perf_counter() < deadline:
+            name, method, path, body, headers = workload.next_request(rng)
+            start = time.perf_counter()
+            try:
+                status, queries, _ = client.request(method, path, body, headers)
+            except Exception as e:  # connection errors count as failed requests
+                status, queries = 599, None
+                errors.append(repr(e))
+            out.append((name, status, time.perf_counter() - start,
+                        int(queries) if queries is not None else None))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return [r for rs in results for r in rs], elapsed, errors
+
+
+# ---------- reporting ----------
+def _percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def summarize(samples, elapsed):
+    groups = {}
+    for name, status, seconds, queries in samples:
+        groups.setdefault(name, []).append((status, seconds, queries))
+    groups["total"] = [(s, t, q) for _, s, t, q in samples]
+    summary = {}
+    for name, rows in groups.items():
+        latencies = [t * 1000 for _, t, _ in rows]
+        queries = [q for _, _, q in rows if q is not None]
+        summary[name] = {
+            "requests": len(rows),
+            "errors": sum(1 for s, _, _ in rows if s >= 400),
+            "rps": len(rows) / elapsed,
+            "p50_ms": _percentile(latencies, 50),
+            "p95_ms": _percentile(latencies, 95),
+            "p99_ms": _percentile(latencies, 99),
+            "queries_per_request": statistics.mean(queries) if queries else None,
+        }
+    return summary
+
+
+def print_summary(summary):
+    print(f"  {'endpoint':<12} {'requests':>8} {'errors':>6} {'req/s':>8} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8}")
+    for name, s in summary.items():
+        q = f"{s['queries_per_request']:.2f}" if s["queries_per_request"] is not None else "-"
+        print(f"  {name:<12} {s['requests']:>8} {s['errors']:>6} {s['rps']:>8.1f} "
+              f"{s['p50_ms']:>8.2f} {s['p95_ms']:>8.2f} {s['p99_ms']:>8.2f} {q:>8}")
+
+
+def compare(summary, baseline, tolerance):
+    """Print the change against a baseline; returns the list of regressions"""
+    regressions = []
+    print(f"  {'endpoint':<12} {'p95 ms':>18} {'req/s':>18} {'queries':>14}")
+    for name, base in baseline["endpoints"].items():
+        now = summary.get(name)
+        if now is None:
+            continue
+        print(f"  {name:<12} {base['p95_ms']:>8.2f} -> {now['p95_ms']:<7.2f} "
+              f"{base['rps']:>8.1f} -> {now['rps']:<7.1f} "
+              f"{base['queries_per_request'] or 0:>5.2f} -> {now['queries_per_request'] or 0:<5.2f}")
+        if now["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {base['p95_ms']:.2f} -> {now['p95_ms']:.2f} ms")
+        if now["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: {base['rps']:.1f} -> {now['rps']:.1f} req/s")
+        if (base["queries_per_request"] is not None and now["queries_per_request"] is not None
+                and now["queries_per_request"] > base["queries_per_request"] + 0.5):
+            regressions.append(f"{name}: {base['queries_per_request']:.2f} -> "
+                               f"{now['queries_per_request']:.2f} queries/request")
+    return regressions
+
+
+def _parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    return {n: w for n, w in mix.items() if w > 0}
+
+
+def _wait_for(url, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            status, _, _ = HttpClient(url).request("GET", "/api/v1/amenities/")
+            if status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"Server at {url} did not start")
+
+
+def _free_port():
+    import socket
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--places", type=int, default=2000)
+    parser.add_argument("--reviews", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="endpoint=weight,... (default %(default)s)")
+    parser.add_argument("--bcrypt-rounds", type=int, default=ProductionConfig.BCRYPT_LOG_ROUNDS)
+    parser.add_argument("--hash-workers", type=int, default=ProductionConfig.PASSWORD_HASH_WORKERS)
+    parser.add_argument("--no-cache", action="store_true", help="disable the GET response cache")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--live", action="store_true", help="run the app in a local HTTP server")
+    parser.add_argument("--url", help="load test an already running server instead")
+    parser.add_argument("--email", help="existing user for --url")
+    parser.add_argument("--password", default=PASSWORD, help="password of --email")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare with a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--serve", nargs=2, metavar=("DB", "PORT"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    cache = not args.no_cache
+
+    if args.serve:
+        serve(args.serve[0], int(args.serve[1]), args.bcrypt_rounds, args.hash_workers, cache)
+        return 0
+
+    mix = _parse_mix(args.mix)
+    server = None
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            if args.url:
+                mode = "url"
+                if not args.email:
+                    parser.error("--url needs --email of an existing user")
+                credentials = [args.email]
+                make_client = lambda: HttpClient(args.url)  # noqa: E731
+            else:
+                db_path = os.path.join(tmp, "load.db")
+                app = make_app(db_path, args.bcrypt_rounds, args.hash_workers, cache)
+                start = time.perf_counter()
+                credentials = seed(app, args.users, args.places, args.reviews, args.seed)
+                print(f"seeded {args.users} users, {args.places} places, {args.reviews} reviews "
+                      f"in {time.perf_counter() - start:.1f}s")
+                if args.live:
+                    mode = "live"
+                    with app.app_context():
+                        from app.extensions import db
+                        db.engine.dispose()
+                    app.extensions["password_hasher"].shutdown()
+                    port = _free_port()
+                    server = subprocess.Popen([
+                        sys.executable, "-m", "benchmarks.load", "--serve", db_path, str(port),
+                        "--bcrypt-rounds", str(args.bcrypt_rounds),
+                        "--hash-workers", str(args.hash_workers),
+                    ] + (["--no-cache"] if args.no_cache else []),
+                        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        start_new_session=True)  # its own group: the hashing pool goes with it
+                    url = f"http://127.0.0.1:{port}"
+                    _wait_for(url)
+                    make_client = lambda: HttpClient(url)  # noqa: E731
+                else:
+                    mode = "in-process"
+                    make_client = lambda: InProcessClient(app)  # noqa: E731
+
+            place_ids, tokens = prepare(make_client(), credentials, args.password)
+            workload = Workload(mix, place_ids, credentials, args.password, tokens)
+            print(f"{mode}: {args.concurrency} clients for {args.duration:.0f}s, mix {args.mix}")
+            samples, elapsed, errors = run_load(make_client, workload, args.concurrency,
+                                                args.duration, args.seed)
+        finally:
+            if server is not None:
+                os.killpg(server.pid, signal.SIGTERM)
+                server.wait()
+
+    summary = summarize(samples, elapsed)
+    print_summary(summary)
+    if errors:
+        print(f"  {len(errors)} connection errors, first: {errors[0]}")
+
+    meta = {
+        "mode": mode, "users": args.users, "places": args.places,
+        "reviews": args.reviews, "concurrency": args.concurrency,
+        "duration": args.duration, "mix": args.mix, "cache": cache,
+        "bcrypt_rounds": args.bcrypt_rounds, "python": platform.python_version(),
+        "date": datetime.utcnow().isoformat(timespec="seconds"),
+    }
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"meta": meta, "endpoints": summary}, f, indent=2)
+        print(f"baseline saved to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"compared with {args.compare} ({baseline['meta']['mode']}, {baseline['meta']['date']})")
+        differs = [f"{k}: {baseline['meta'].get(k)} -> {meta[k]}"
+                   for k in COMPARABLE if baseline["meta"].get(k) != meta[k]]
+        if differs:
+            print("  note: the baseline ran with other settings (" + ", ".join(differs) + ")")
+        regressions = compare(summary, baseline, args.tolerance)
+        if regressions:
+            print("REGRESSIONS:\n  " + "\n  ".join(regressions))
+            return 1
+        print(f"OK: within {args.tolerance:.0%} of the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Benchmark: login throughput and latency at several bcrypt work factors.
+
+For each cost, N client threads log in repeatedly against a file-backed
+database while a probe thread times GET /api/v1/amenities/, once with
+hashing inline on the request threads and once in the hashing pool. Use
+it to pick BCRYPT_LOG_ROUNDS against the login latency budget and to see
+how much a login burst delays other requests.
+
+    python -m benchmarks.login_throughput --rounds 10 11 12 --threads 8 --logins 64
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app import create_app
+from app.extensions import db
+from app.models import User
+from config import config, TestingConfig
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def run(rounds, workers, threads, logins, db_path):
+    config["benchmark"] = type("BenchmarkConfig", (TestingConfig,), {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_path}",
+        "BCRYPT_LOG_ROUNDS": rounds,
+        "PASSWORD_HASH_WORKERS": workers,
+        "PASSWORD_HASH_MAX_PENDING": max(threads, 1) * 2,
+        "PASSWORD_HASH_TIMEOUT": 120,
+    })
+    app = create_app("benchmark")
+    app.extensions.pop("response_cache", None)
+    hasher = app.extensions["password_hasher"]
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        for i in range(threads):
+            user = User(email=f"user{i}@bench.io", first_name="Bench", last_name=str(i))
+            user.set_password("bench1234")
+            db.session.add(user)
+        db.session.commit()
+        db.session.remove()
+
+    def login(i):
+        client = app.test_client()
+        body = {"email": f"user{i % threads}@bench.io", "password": "bench1234"}
+        start = time.perf_counter()
+        res = client.post("/api/v1/auth/login", json=body)
+        assert res.status_code == 200, res.get_json()
+        return time.perf_counter() - start
+
+    # warm up the pool (spawned processes) outside the timed section
+    login(0)
+
+    probe_latencies, done = [], threading.Event()
+
+    def probe():
+        client = app.test_client()
+        while not done.is_set():
+            start = time.perf_counter()
+            client.get("/api/v1/amenities/")
+            probe_latencies.append(time.perf_counter() - start)
+            time.sleep(0.005)
+
+    prober = threading.Thread(target=probe)
+    prober.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = list(pool.map(login, range(logins)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    prober.join()
+    hasher.shutdown()
+
+    return {
+        "logins_per_s": logins / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": _percentile(latencies, 95) * 1000,
+        "probe_p95_ms": _percentile(probe_latencies, 95) * 1000 if probe_latencies else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="hashing pool size for the pooled runs")
+    args = parser.parse_args(argv)
+
+    print(f"{args.logins} logins from {args.threads} threads, pool of {args.workers} process(es)")
+    print(f"  {'cost':>4} {'mode':<7} {'logins/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'GET p95 ms':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rounds in args.rounds:
+            for label, workers in (("inline", 0), ("pool", args.workers)):
+                r = run(rounds, workers, args.threads, args.logins, os.path.join(tmp, "bench.db"))
+                print(f"  {rounds:>4} {label:<7} {r['logins_per_s']:>9.1f} {r['p50_ms']:>8.1f} "
+                      f"{r['p95_ms']:>8.1f} {r['probe_p95_ms']:>11.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+Benchmark: per-request cost of the /metrics instrumentation.
+
+Builds two apps on the same file-backed SQLite database (generated with
+app/seeding.py), one with METRICS_ENABLED and one without, with the
+response cache off so every request runs its SQL. Rounds of requests go to
+the two apps in random order; the median time per request of each endpoint
+gives the end-to-end difference. That difference is within the run-to-run
+noise of the test client (tens of us), so the recording is also timed on
+its own: the Flask hooks plus Metrics.record() once per request, and the
+cursor event listeners once per SQL statement. Their cost times the
+endpoint's measured queries per request is the overhead estimate.
+
+Exits with status 1 when that estimate is above --max-us microseconds for
+any endpoint.
+
+    python -m benchmarks.metrics_overhead --requests 300 --rounds 9
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import timeit
+
+from flask import Response
+
+from app import create_app, seeding
+from app.extensions import db
+from app.metrics import (
+    RequestStats, _after_cursor_execute, _before_cursor_execute, _capture_response, _current,
+    _finish_request, _start_request, get_metrics,
+)
+from config import config, TestingConfig
+
+ENDPOINTS = {
+    "detail": "/api/v1/places/{place_id}",
+    "list": "/api/v1/places/?limit=20",
+    "reviews": "/api/v1/places/{place_id}/reviews?limit=20",
+}
+
+
+def make_app(path, enabled):
+    name = f"benchmark-metrics-{'on' if enabled else 'off'}"
+    config[name] = type("BenchmarkConfig", (TestingConfig,), {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}",
+        "RESPONSE_CACHE_MAX_ENTRIES": 0,
+        "METRICS_ENABLED": enabled,
+    })
+    return create_app(name)
+
+
+def time_requests(client, url, requests):
+    timer = timeit.Timer(lambda: client.get(url))
+    return timer.timeit(requests) / requests
+
+
+def per_request_cost(app, url, n=20000):
+    """Seconds for the three request hooks, record() included, outside the test client"""
+    response = Response("{}", content_type="application/json")
+    with app.test_request_context(url):
+        def cycle():
+            _start_request()
+            _capture_response(response)
+            _finish_request(None)
+        seconds = timeit.timeit(cycle, number=n) / n
+        get_metrics().reset()
+    return seconds
+
+
+def per_statement_cost(n=100000):
+    """Seconds for the before/after cursor listeners of one statement"""
+    class Conn:
+        info = {}
+    conn = Conn()
+    token = _current.set(RequestStats())
+    try:
+        return timeit.timeit(
+            lambda: (_before_cursor_execute(conn, None, "", (), None, False),
+                     _after_cursor_execute(conn, None, "", (), None, False)),
+            number=n) / n
+    finally:
+        _current.reset(token)
+
+
+def queries_per_request(route):
+    stats = get_metrics()._endpoints[("GET", route)]
+    return stats.queries.sum / stats.queries.count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--places", type=int, default=2000)
+    parser.add_argument("--reviews", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=300, help="requests per endpoint per round")
+    parser.add_argument("--rounds", type=int, default=9)
+    parser.add_argument("--max-us", type=float, default=50.0,
+                        help="fail if the estimated overhead per request is above this")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "metrics.db")
+        apps = {"off": make_app(path, False), "on": make_app(path, True)}
+        with apps["off"].app_context():
+            seeding.generate(db.session.connection(), "x", users=200, places=args.places,
+                             reviews=args.reviews)
+            db.session.commit()
+        place_id = seeding.seed_id(3, 0)
+
+        clients = {mode: app.test_client() for mode, app in apps.items()}
+        urls = {name: url.format(place_id=place_id) for name, url in ENDPOINTS.items()}
+        samples = {(name, mode): [] for name in ENDPOINTS for mode in apps}
+        rng = random.Random(0)
+        for _ in range(args.rounds):
+            for name, url in urls.items():
+                for mode in rng.sample(list(clients), len(clients)):
+                    assert clients[mode].get(url).status_code == 200, url
+                    samples[name, mode].append(time_requests(clients[mode], url, args.requests))
+
+        app = apps["on"]
+        with app.app_context():
+            routes = {name: app.url_map.bind("").match(url.split("?")[0], return_rule=True)[0].rule
+                      for name, url in urls.items()}
+            queries = {name: queries_per_request(routes[name]) for name in ENDPOINTS}
+        hooks = per_request_cost(app, urls["detail"])
+        statement = per_statement_cost()
+
+        print(f"median of {args.rounds} rounds x {args.requests} requests (us per request)")
+        print(f"  {'endpoint':<10} {'off':>9} {'on':>9} {'diff':>8} {'queries':>8} {'estimate':>9}")
+        worst = 0.0
+        for name in ENDPOINTS:
+            off = statistics.median(samples[name, "off"]) * 1e6
+            on = statistics.median(samples[name, "on"]) * 1e6
+            estimate = (hooks + queries[name] * statement) * 1e6
+            worst = max(worst, estimate)
+            print(f"  {name:<10} {off:>9.1f} {on:>9.1f} {on - off:>+8.1f} {queries[name]:>8.1f} "
+                  f"{estimate:>9.1f}  ({estimate / off * 100:.2f}%)")
+        print(f"request hooks + record(): {hooks * 1e6:.2f} us; "
+              f"cursor listeners: {statement * 1e6:.2f} us per SQL statement")
+        for app in apps.values():
+            with app.app_context():
+                db.engine.dispose()
+
+    if worst > args.max_us:
+        print(f"FAIL: overhead {worst:.0f} us > {args.max_us:.0f} us per request")
+        return 1
+    print(f"OK: overhead {worst:.0f} us <= {args.max_us:.0f} us per request")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+Benchmark: FTS5 place search vs LIKE scans over synthetic descriptions.
+
+Bulk-inserts --places synthetic places with Zipf-distributed words (the
+FTS triggers index them on the way in) into a file-backed database, then times GET /api/v1/places/search
+for a few terms of different selectivity against the equivalent
+`LIKE '%term%'` query over name and description.
+
+    python -m benchmarks.search --places 1000000
+"""
+import argparse
+import itertools
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import insert, text
+
+from app import create_app
+from app.extensions import db
+from app.models import User, Place
+from app.search import match_expression
+from config import config, TestingConfig
+
+WORDS = (
+    "quiet cozy modern spacious bright sunny rustic charming elegant private family "
+    "villa cabin loft studio apartment chalet cottage house suite room garden terrace "
+    "balcony pool jacuzzi kitchen fireplace parking wifi workspace view ocean sea beach "
+    "mountain desert forest lake river city downtown old town market museum park "
+    "breakfast sunset sunrise stars hiking diving surfing skiing quietude retreat"
+).split()
+# terms from common to rare: a frequent word, a mid one, a rare one and a prefix
+QUERIES = ("beach", "fireplace jacuzzi", "zanzibar", "moun")
+RARE = "zanzibar"
+SYLLABLES = "ka lo mi ru sa te vo na pe di zu ha bo ri fe".split()
+
+
+def _vocabulary(rng, size=20000):
+    """WORDS plus made-up words, with cumulative Zipf-like weights (rank 1 is the most common)"""
+    words = list(WORDS)
+    while len(words) < size:
+        words.append("".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))))
+    rng.shuffle(words)
+    return words, list(itertools.accumulate(1.0 / rank for rank in range(1, len(words) + 1)))
+
+
+def _seed(places, batch=10000, seed=42):
+    rng = random.Random(seed)
+    vocabulary, cum_weights = _vocabulary(rng)
+    now = datetime.utcnow()
+    owner_id = str(uuid.uuid4())
+    db.session.execute(insert(User), [{
+        "id": owner_id, "email": "owner@bench.io", "password": "x",
+        "first_name": "Bench", "last_name": "Owner", "is_admin": False,
+        "created_at": now, "updated_at": now,
+    }])
+    for start in range(0, places, batch):
+        rows = []
+        for i in range(start, min(start + batch, places)):
+            words = rng.choices(vocabulary, cum_weights=cum_weights, k=rng.randint(20, 60))
+            if i % 10000 == 0:
+                words.append(RARE)
+            rows.append({
+                "id": str(uuid.uuid4()), "name": " ".join(rng.choices(WORDS, k=3)).title(),
+                "description": " ".join(words), "city": "Riyadh", "price_per_night": 100.0,
+                "latitude": 24.7, "longitude": 46.6, "owner_id": owner_id,
+                "created_at": now, "updated_at": now,
+            })
+        db.session.execute(insert(Place), rows)
+    db.session.commit()
+
+
+def _time(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--places", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "search.db")
+        config["benchmark"] = type("BenchmarkConfig", (TestingConfig,), {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}",
+        })
+        app = create_app("benchmark")
+        app.extensions.pop("response_cache", None)
+        with app.app_context():
+            start = time.perf_counter()
+            _seed(args.places)
+            elapsed = time.perf_counter() - start
+            print(f"{args.places} places inserted and indexed in {elapsed:.1f}s "
+                  f"({args.places / elapsed:,.0f} rows/s), database {os.path.getsize(path) / 2**20:.0f} MiB")
+
+            client = app.test_client()
+            print(f"  {'query':<20} {'matches':>8} {'FTS5 ms':>9} {'LIKE ms':>9}")
+            for q in QUERIES:
+                fts_ms, res = _time(lambda: client.get(
+                    "/api/v1/places/search", query_string={"q": q, "limit": args.limit}), args.repeat)
+                assert res.status_code == 200, res.get_json()
+                matches = db.session.execute(
+                    text("SELECT count(*) FROM places_fts WHERE places_fts MATCH :m"),
+                    {"m": match_expression(q)}).scalar()
+
+                clauses = " AND ".join(
+                    f"(name LIKE :t{i} OR description LIKE :t{i})" for i in range(len(q.split())))
+                params = {f"t{i}": f"%{t}%" for i, t in enumerate(q.split())}
+                like = text(f"SELECT id FROM places WHERE {clauses} LIMIT {args.limit}")
+                like_ms, _ = _time(lambda: db.session.execute(like, params).all(), args.repeat)
+                print(f"  {q:<20} {matches:>8} {fts_ms:>9.2f} {like_ms:>9.2f}")
+            db.session.remove()
+            db.engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
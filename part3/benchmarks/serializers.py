@@ -0,0 +1,108 @@
+"""
+Microbenchmark: objects serialized per second on large lists.
+
+Compares the compiled serializers in app/serializers.py with the previous
+approaches (hand-built dicts in the handlers and the column-walking
+BaseModel.to_dict), and the stdlib JSON encoder with the one used for
+responses.
+
+    python -m benchmarks.serializers --objects 50000
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+
+from app import create_app
+from app.models import Place
+from app import serializers
+
+
+def hand_built(p):
+    # what PlaceList.get used to build per place
+    return {
+        "id": p.id,
+        "name": p.name,
+        "description": p.description,
+        "city": p.city,
+        "price_per_night": p.price_per_night,
+        "latitude": p.latitude,
+        "longitude": p.longitude,
+        "owner_id": p.owner_id,
+        "amenities": [a.id for a in (p.amenities or [])],
+        "avg_rating": p.avg_rating,
+        "review_count": p.review_count or 0,
+        "created_at": p.created_at.isoformat() if p.created_at else None,
+        "updated_at": p.updated_at.isoformat() if p.updated_at else None,
+    }
+
+
+def column_walk(p):
+    # the former BaseModel.to_dict
+    data = {}
+    for c in p.__table__.columns:
+        val = getattr(p, c.name)
+        if isinstance(val, datetime):
+            val = val.isoformat()
+        data[c.name] = val
+    return data
+
+
+def _rate(fn, items, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for obj in items:
+            fn(obj)
+        best = min(best, time.perf_counter() - start)
+    return len(items) / best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--objects", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    app = create_app("testing")
+    with app.app_context():
+        now = datetime.utcnow()
+        places = []
+        for i in range(args.objects):
+            p = Place(name=f"Place {i}", description="A quiet place " * 8, city="Riyadh",
+                      price_per_night=100.0 + i % 50, latitude=24.7, longitude=46.6,
+                      owner_id="owner-id", id=f"place-{i}", created_at=now, updated_at=now,
+                      rating_sum=i % 40, review_count=i % 10)
+            p.amenities  # load the (empty) collection outside the timed loop
+            places.append(p)
+
+        columns = tuple(c.name for c in Place.__table__.columns)
+        compiled_columns = serializers.make_serializer(Place, columns)
+
+        results = [
+            ("hand-built dict", _rate(hand_built, places, args.repeat)),
+            ("serialize_place", _rate(serializers.serialize_place, places, args.repeat)),
+            ("column walk (old to_dict)", _rate(column_walk, places, args.repeat)),
+            ("compiled to_dict", _rate(compiled_columns, places, args.repeat)),
+        ]
+        print(f"{args.objects} places, best of {args.repeat}")
+        for label, rate in results:
+            print(f"  {label:<28} {rate:>12,.0f} objects/s")
+        print(f"  speedup vs hand-built: {results[1][1] / results[0][1]:.2f}x, "
+              f"vs column walk: {results[3][1] / results[2][1]:.2f}x")
+
+        payload = {"places": [serializers.serialize_place(p) for p in places]}
+        for label, encode in (
+            ("json.dumps", lambda d: json.dumps(d).encode("utf-8")),
+            ("serializers.dumps" + (" (orjson)" if serializers.orjson else ""), serializers.dumps),
+        ):
+            start = time.perf_counter()
+            encode(payload)
+            elapsed = time.perf_counter() - start
+            print(f"  {label:<28} {args.objects / elapsed:>12,.0f} objects/s encoded")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+Benchmark: application cold start, per schema setup mode.
+
+Each sample is a fresh interpreter that imports the app, runs create_app()
+against a file-backed SQLite database and serves /api/v1/swagger.json once,
+like a new gunicorn worker. Modes:
+
+  create_all        db.create_all() on every boot (development)
+  migrate           migrations, database already up to date (tests, single process)
+  check             schema version check only (production) + swagger.json from cache
+
+It also times create_app() inside one process (what every test case pays)
+for an in-memory database. Exits with status 1 when the median cold start
+in "check" mode is above --max-ms, so CI catches startup regressions.
+
+    python -m benchmarks.startup --samples 7 --max-ms 1500
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+MODES = ("create_all", "migrate", "check")
+
+
+def child(mode, path, swagger):
+    """Run in the fresh interpreter: time the boot and print it as JSON"""
+    start = time.perf_counter()
+    from app import create_app
+    from config import config, TestingConfig
+    imported = time.perf_counter()
+
+    config["benchmark"] = type("BenchmarkConfig", (TestingConfig,), {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}",
+        "SCHEMA_SETUP": mode,
+        "SWAGGER_CACHE": swagger if mode == "check" else None,
+    })
+    app = create_app("benchmark")
+    created = time.perf_counter()
+    res = app.test_client().get("/api/v1/swagger.json")
+    assert res.status_code == 200, res.status_code
+    served = time.perf_counter()
+    print(json.dumps({
+        "import": (imported - start) * 1000,
+        "create_app": (created - imported) * 1000,
+        "swagger": (served - created) * 1000,
+        "total": (served - start) * 1000,
+    }))
+
+
+def _sample(mode, path, swagger):
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", "--child", mode, path, swagger],
+        check=True, capture_output=True, text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def _in_process(mode, repeat):
+    from app import create_app
+    from app.extensions import db
+    from config import config, TestingConfig
+
+    config["benchmark-memory"] = type("BenchmarkMemoryConfig", (TestingConfig,), {"SCHEMA_SETUP": mode})
+    create_app("benchmark-memory")  # imports
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        app = create_app("benchmark-memory")
+        samples.append((time.perf_counter() - start) * 1000)
+        with app.app_context():
+            db.engine.dispose()
+    return statistics.median(samples)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--samples", type=int, default=7)
+    parser.add_argument("--max-ms", type=float, default=1500.0,
+                        help="fail if the median cold start in check mode is slower")
+    parser.add_argument("--child", nargs=3, metavar=("MODE", "DB", "SWAGGER"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        child(*args.child)
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "startup.db")
+        swagger = os.path.join(tmp, "swagger.json")
+        _sample("migrate", path, swagger)  # create the schema
+        _sample("check", path, swagger)  # fill the swagger.json cache
+
+        print(f"cold start, median of {args.samples} fresh interpreters (ms)")
+        print(f"  {'mode':<12} {'import':>8} {'create_app':>11} {'swagger':>8} {'total':>8}")
+        medians = {}
+        for mode in MODES:
+            samples = [_sample(mode, path, swagger) for _ in range(args.samples)]
+            medians[mode] = {k: statistics.median(s[k] for s in samples) for k in samples[0]}
+            m = medians[mode]
+            print(f"  {mode:<12} {m['import']:>8.1f} {m['create_app']:>11.1f} "
+                  f"{m['swagger']:>8.1f} {m['total']:>8.1f}")
+
+    print("create_app() in a warm process, in-memory database (ms)")
+    for mode in ("create_all", "migrate"):
+        print(f"  {mode:<12} {_in_process(mode, args.samples * 3):>8.2f}")
+
+    total = medians["check"]["total"]
+    if total > args.max_ms:
+        print(f"FAIL: cold start {total:.0f} ms > {args.max_ms:.0f} ms")
+        return 1
+    print(f"OK: cold start {total:.0f} ms <= {args.max_ms:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
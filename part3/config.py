@@ -1,21 +1,76 @@
 import os
 
+def _replica_uris():
+    # DATABASE_REPLICA_URLS=sqlite:///replica.db,postgresql://...
+    return [u.strip() for u in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if u.strip()]
+
 class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "default_secret_key")
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", SECRET_KEY)
     DEBUG = False
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # GET response cache (app/cache.py); 0 entries disables it
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "30"))
+    # PRAGMA name -> value, applied to every new SQLite connection (app/sqlite.py)
+    SQLITE_PRAGMAS = {}
+    # read replicas (app/replicas.py); a writer reads from the primary for this long
+    DATABASE_REPLICA_URIS = _replica_uris()
+    REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+    # bcrypt cost and hashing pool (app/passwords.py); 0 workers hashes inline
+    BCRYPT_LOG_ROUNDS = int(os.getenv("BCRYPT_LOG_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "16"))
+    PASSWORD_HASH_TIMEOUT = int(os.getenv("PASSWORD_HASH_TIMEOUT", "10"))
+    # per-process cache of JWT users (app/identity.py); 0 disables it
+    USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "30"))
+    USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+    # in-memory amenity -> places index (app/amenity_index.py), rebuilt when older
+    AMENITY_INDEX_MAX_AGE = int(os.getenv("AMENITY_INDEX_MAX_AGE", "300"))
+    # create_all | migrate | check, see app/schema.py
+    SCHEMA_SETUP = os.getenv("SCHEMA_SETUP", "migrate")
+    # swagger.json cache file, relative to the instance folder (app/swagger.py)
+    SWAGGER_CACHE = os.getenv("SWAGGER_CACHE") or None
+    # GET /metrics, Prometheus text format (app/metrics.py); optional bearer token
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN") or None
 
 class DevelopmentConfig(Config):
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = "sqlite:///development.db"
+    SCHEMA_SETUP = os.getenv("SCHEMA_SETUP", "create_all")
 
 class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    BCRYPT_LOG_ROUNDS = 4
+    PASSWORD_HASH_WORKERS = 0
+
+class ProductionConfig(Config):
+    SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "sqlite:///production.db")
+    # migrations run on deploy (flask --app run db-upgrade), workers only check
+    SCHEMA_SETUP = os.getenv("SCHEMA_SETUP", "check")
+    SWAGGER_CACHE = os.getenv("SWAGGER_CACHE", "swagger.json")
+    # QueuePool sizing: keep pool_size + max_overflow >= threads per worker
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "1") == "1",
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    }
+    SQLITE_PRAGMAS = {
+        "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+        "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+        "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+        "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+        # negative = KiB, so -64000 is ~64 MB of page cache per connection
+        "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-64000")),
+    }
 
 config = {
     "development": DevelopmentConfig,
     "testing": TestingConfig,
+    "production": ProductionConfig,
     "default": DevelopmentConfig,
 }
@@ -0,0 +1,81 @@
+-- 0001: users, places, reviews, amenities and place_amenities, as created
+-- by db.create_all(). Portable SQL; the SQLite FTS5 search index is in
+-- 0001_initial.sqlite.sql.
+
+CREATE TABLE users (
+    email VARCHAR(255) NOT NULL,
+    password VARCHAR(255) NOT NULL,
+    first_name VARCHAR(128) NOT NULL,
+    last_name VARCHAR(128) NOT NULL,
+    is_admin BOOLEAN NOT NULL,
+    id VARCHAR(36) NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (id),
+    UNIQUE (email)
+);
+CREATE INDEX ix_users_created_at_id ON users (created_at, id);
+
+CREATE TABLE amenities (
+    name VARCHAR(128) NOT NULL,
+    description VARCHAR(255),
+    id VARCHAR(36) NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (id),
+    UNIQUE (name)
+);
+CREATE INDEX ix_amenities_created_at_id ON amenities (created_at, id);
+
+CREATE TABLE places (
+    name VARCHAR(128) NOT NULL,
+    description VARCHAR(1024),
+    city VARCHAR(128) NOT NULL,
+    price_per_night FLOAT NOT NULL,
+    latitude FLOAT NOT NULL,
+    longitude FLOAT NOT NULL,
+    geocell INTEGER,
+    rating_sum INTEGER NOT NULL,
+    review_count INTEGER NOT NULL,
+    rating_1 INTEGER NOT NULL,
+    rating_2 INTEGER NOT NULL,
+    rating_3 INTEGER NOT NULL,
+    rating_4 INTEGER NOT NULL,
+    rating_5 INTEGER NOT NULL,
+    owner_id VARCHAR(36) NOT NULL,
+    id VARCHAR(36) NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (id),
+    FOREIGN KEY (owner_id) REFERENCES users (id)
+);
+CREATE INDEX ix_places_city_price ON places (city, price_per_night);
+CREATE INDEX ix_places_geocell ON places (geocell);
+CREATE INDEX ix_places_created_at_id ON places (created_at, id);
+CREATE INDEX ix_places_price ON places (price_per_night);
+
+CREATE TABLE place_amenities (
+    place_id VARCHAR(36) NOT NULL,
+    amenity_id VARCHAR(36) NOT NULL,
+    PRIMARY KEY (place_id, amenity_id),
+    FOREIGN KEY (place_id) REFERENCES places (id),
+    FOREIGN KEY (amenity_id) REFERENCES amenities (id)
+);
+CREATE INDEX ix_place_amenities_amenity_place ON place_amenities (amenity_id, place_id);
+
+CREATE TABLE reviews (
+    text VARCHAR(1024) NOT NULL,
+    rating INTEGER NOT NULL,
+    user_id VARCHAR(36) NOT NULL,
+    place_id VARCHAR(36) NOT NULL,
+    id VARCHAR(36) NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (id),
+    CONSTRAINT uq_reviews_user_place UNIQUE (user_id, place_id),
+    CONSTRAINT ck_reviews_rating CHECK (rating BETWEEN 1 AND 5),
+    FOREIGN KEY (user_id) REFERENCES users (id),
+    FOREIGN KEY (place_id) REFERENCES places (id)
+);
+CREATE INDEX ix_reviews_place_created_at ON reviews (place_id, created_at, id);
+CREATE INDEX ix_reviews_created_at_id ON reviews (created_at, id);
@@ -0,0 +1,34 @@
+-- 0001, SQLite only: the FTS5 search index (app/search.py). External
+-- content: the text stays in places / reviews.
+
+CREATE VIRTUAL TABLE places_fts USING fts5(
+    name, description, content='places', content_rowid='rowid',
+    tokenize='porter unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER places_fts_ai AFTER INSERT ON places BEGIN
+    INSERT INTO places_fts(rowid, name, description) VALUES (new.rowid, new.name, new.description);
+END;
+CREATE TRIGGER places_fts_ad AFTER DELETE ON places BEGIN
+    INSERT INTO places_fts(places_fts, rowid, name, description)
+    VALUES ('delete', old.rowid, old.name, old.description);
+END;
+CREATE TRIGGER places_fts_au AFTER UPDATE OF name, description ON places BEGIN
+    INSERT INTO places_fts(places_fts, rowid, name, description)
+    VALUES ('delete', old.rowid, old.name, old.description);
+    INSERT INTO places_fts(rowid, name, description) VALUES (new.rowid, new.name, new.description);
+END;
+
+CREATE VIRTUAL TABLE reviews_fts USING fts5(
+    text, content='reviews', content_rowid='rowid',
+    tokenize='porter unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER reviews_fts_ai AFTER INSERT ON reviews BEGIN
+    INSERT INTO reviews_fts(rowid, text) VALUES (new.rowid, new.text);
+END;
+CREATE TRIGGER reviews_fts_ad AFTER DELETE ON reviews BEGIN
+    INSERT INTO reviews_fts(reviews_fts, rowid, text) VALUES ('delete', old.rowid, old.text);
+END;
+CREATE TRIGGER reviews_fts_au AFTER UPDATE OF text ON reviews BEGIN
+    INSERT INTO reviews_fts(reviews_fts, rowid, text) VALUES ('delete', old.rowid, old.text);
+    INSERT INTO reviews_fts(rowid, text) VALUES (new.rowid, new.text);
+END;
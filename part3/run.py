@@ -1,6 +1,9 @@
+import os
+
 from app import create_app
 
-app = create_app()
+# FLASK_CONFIG=production selects ProductionConfig (see config.py)
+app = create_app(os.getenv("FLASK_CONFIG", "development"))
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    app.run(host="0.0.0.0", port=5000, debug=app.config["DEBUG"])
@@ -1,45 +1,118 @@
-PRAGMA foreign_keys = ON;
+-- HBnB database schema (SQLite), as of the latest migration.
+--
+-- Generated by applying migrations/*.sql in order, with their .sqlite.sql
+-- parts; tests/test_schema.py checks that it still matches them and the
+-- models. Deployments should use `flask --app run db-upgrade`, which also
+-- records the schema version.
 
+PRAGMA foreign_keys = ON;
 CREATE TABLE users (
-    id CHAR(36) PRIMARY KEY,
-    first_name VARCHAR(255),
-    last_name VARCHAR(255),
-    email VARCHAR(255) UNIQUE,
-    password VARCHAR(255),
-    is_admin BOOLEAN DEFAULT FALSE
+    email VARCHAR(255) NOT NULL,
+    password VARCHAR(255) NOT NULL,
+    first_name VARCHAR(128) NOT NULL,
+    last_name VARCHAR(128) NOT NULL,
+    is_admin BOOLEAN NOT NULL,
+    id VARCHAR(36) NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (id),
+    UNIQUE (email)
+);
+CREATE INDEX ix_users_created_at_id ON users (created_at, id);
+
+CREATE TABLE amenities (
+    name VARCHAR(128) NOT NULL,
+    description VARCHAR(255),
+    id VARCHAR(36) NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (id),
+    UNIQUE (name)
 );
+CREATE INDEX ix_amenities_created_at_id ON amenities (created_at, id);
 
 CREATE TABLE places (
-    id CHAR(36) PRIMARY KEY,
-    title VARCHAR(255),
-    description TEXT,
-    price DECIMAL(10,2),
-    latitude FLOAT,
-    longitude FLOAT,
-    owner_id CHAR(36),
-    FOREIGN KEY (owner_id) REFERENCES users(id) ON DELETE CASCADE
+    name VARCHAR(128) NOT NULL,
+    description VARCHAR(1024),
+    city VARCHAR(128) NOT NULL,
+    price_per_night FLOAT NOT NULL,
+    latitude FLOAT NOT NULL,
+    longitude FLOAT NOT NULL,
+    geocell INTEGER,
+    rating_sum INTEGER NOT NULL,
+    review_count INTEGER NOT NULL,
+    rating_1 INTEGER NOT NULL,
+    rating_2 INTEGER NOT NULL,
+    rating_3 INTEGER NOT NULL,
+    rating_4 INTEGER NOT NULL,
+    rating_5 INTEGER NOT NULL,
+    owner_id VARCHAR(36) NOT NULL,
+    id VARCHAR(36) NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (id),
+    FOREIGN KEY (owner_id) REFERENCES users (id)
 );
+CREATE INDEX ix_places_city_price ON places (city, price_per_night);
+CREATE INDEX ix_places_geocell ON places (geocell);
+CREATE INDEX ix_places_created_at_id ON places (created_at, id);
+CREATE INDEX ix_places_price ON places (price_per_night);
+
+CREATE TABLE place_amenities (
+    place_id VARCHAR(36) NOT NULL,
+    amenity_id VARCHAR(36) NOT NULL,
+    PRIMARY KEY (place_id, amenity_id),
+    FOREIGN KEY (place_id) REFERENCES places (id),
+    FOREIGN KEY (amenity_id) REFERENCES amenities (id)
+);
+CREATE INDEX ix_place_amenities_amenity_place ON place_amenities (amenity_id, place_id);
 
 CREATE TABLE reviews (
-    id CHAR(36) PRIMARY KEY,
-    text TEXT,
-    rating INT CHECK (rating BETWEEN 1 AND 5),
-    user_id CHAR(36),
-    place_id CHAR(36),
-    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-    FOREIGN KEY (place_id) REFERENCES places(id) ON DELETE CASCADE,
-    UNIQUE(user_id, place_id)
+    text VARCHAR(1024) NOT NULL,
+    rating INTEGER NOT NULL,
+    user_id VARCHAR(36) NOT NULL,
+    place_id VARCHAR(36) NOT NULL,
+    id VARCHAR(36) NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (id),
+    CONSTRAINT uq_reviews_user_place UNIQUE (user_id, place_id),
+    CONSTRAINT ck_reviews_rating CHECK (rating BETWEEN 1 AND 5),
+    FOREIGN KEY (user_id) REFERENCES users (id),
+    FOREIGN KEY (place_id) REFERENCES places (id)
 );
+CREATE INDEX ix_reviews_place_created_at ON reviews (place_id, created_at, id);
+CREATE INDEX ix_reviews_created_at_id ON reviews (created_at, id);
 
-CREATE TABLE amenities (
-    id CHAR(36) PRIMARY KEY,
-    name VARCHAR(255) UNIQUE
+-- full-text search (external content: the text stays in places / reviews)
+CREATE VIRTUAL TABLE places_fts USING fts5(
+    name, description, content='places', content_rowid='rowid',
+    tokenize='porter unicode61 remove_diacritics 2'
 );
+CREATE TRIGGER places_fts_ai AFTER INSERT ON places BEGIN
+    INSERT INTO places_fts(rowid, name, description) VALUES (new.rowid, new.name, new.description);
+END;
+CREATE TRIGGER places_fts_ad AFTER DELETE ON places BEGIN
+    INSERT INTO places_fts(places_fts, rowid, name, description)
+    VALUES ('delete', old.rowid, old.name, old.description);
+END;
+CREATE TRIGGER places_fts_au AFTER UPDATE OF name, description ON places BEGIN
+    INSERT INTO places_fts(places_fts, rowid, name, description)
+    VALUES ('delete', old.rowid, old.name, old.description);
+    INSERT INTO places_fts(rowid, name, description) VALUES (new.rowid, new.name, new.description);
+END;
 
-CREATE TABLE place_amenities (
-    place_id CHAR(36),
-    amenity_id CHAR(36),
-    PRIMARY KEY(place_id, amenity_id),
-    FOREIGN KEY (place_id) REFERENCES places(id) ON DELETE CASCADE,
-    FOREIGN KEY (amenity_id) REFERENCES amenities(id) ON DELETE CASCADE
+CREATE VIRTUAL TABLE reviews_fts USING fts5(
+    text, content='reviews', content_rowid='rowid',
+    tokenize='porter unicode61 remove_diacritics 2'
 );
+CREATE TRIGGER reviews_fts_ai AFTER INSERT ON reviews BEGIN
+    INSERT INTO reviews_fts(rowid, text) VALUES (new.rowid, new.text);
+END;
+CREATE TRIGGER reviews_fts_ad AFTER DELETE ON reviews BEGIN
+    INSERT INTO reviews_fts(reviews_fts, rowid, text) VALUES ('delete', old.rowid, old.text);
+END;
+CREATE TRIGGER reviews_fts_au AFTER UPDATE OF text ON reviews BEGIN
+    INSERT INTO reviews_fts(reviews_fts, rowid, text) VALUES ('delete', old.rowid, old.text);
+    INSERT INTO reviews_fts(rowid, text) VALUES (new.rowid, new.text);
+END;
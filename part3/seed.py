@@ -1,4 +1,15 @@
-from app import create_app
+"""
+Seed the database with a small, fixed demo data set (4 users, 6 amenities,
+3 places, 6 reviews), replacing whatever is there, in one transaction.
+
+    python seed.py
+
+For load-test volumes use the bulk generator instead:
+
+    flask --app run seed-data --users 10000 --places 1000000 --reviews 20000000 --reset
+"""
+from app import create_app, seeding
+from app.business.facade import HBnBFacade
 from app.extensions import db
 from app.models.user import User
 from app.models.amenity import Amenity
@@ -8,189 +19,104 @@ from app.models.review import Review
 app = create_app()
 
 
-def set_password(user, plain):
-    if hasattr(user, "set_password"):
-        user.set_password(plain)
-    elif hasattr(user, "hash_password"):
-        user.hash_password(plain)
-    else:
-        raise RuntimeError("User model has no set_password/hash_password method")
-
-
-def reset_db():
-    # FK order
-    Review.query.delete()
-    db.session.commit()
-
-    Place.query.delete()
-    db.session.commit()
-
-    Amenity.query.delete()
-    db.session.commit()
-
-    User.query.delete()
-    db.session.commit()
-
-
-def get_or_create_user(email, first_name, last_name, password, is_admin=False, fixed_id=None):
-    u = User.query.filter_by(email=email).first()
-    if u:
-        return u
-
-    kwargs = {
-        "first_name": first_name,
-        "last_name": last_name,
-        "email": email,
-        "is_admin": is_admin,
-    }
-
-    if fixed_id is not None:
-        # if your model supports id as string/uuid
-        kwargs["id"] = fixed_id
-
-    u = User(**kwargs)
-    set_password(u, password)
-    db.session.add(u)
-    db.session.commit()
+def make_user(email, first_name, last_name, password, is_admin=False, fixed_id=None):
+    kwargs = {"id": fixed_id} if fixed_id is not None else {}
+    u = User(first_name=first_name, last_name=last_name, email=email, is_admin=is_admin, **kwargs)
+    u.set_password(password)
     return u
 
 
-def create_amenity(aid, name):
-    # SQLAlchemy 2.x friendly: Session.get
-    existing = db.session.get(Amenity, aid)
-    if existing:
-        return existing
-
-    a = Amenity(id=aid, name=name)
-    db.session.add(a)
-    db.session.commit()
-    return a
-
-
-def safe_attach_amenities(place, amenities):
-    # Only if relationship exists
-    if hasattr(place, "amenities"):
-        for a in amenities:
-            place.amenities.append(a)
-        db.session.commit()
-
-
 def main():
+    facade = HBnBFacade()
     with app.app_context():
-        # 0) wipe everything
-        reset_db()
-
-        # 1) users
-        admin = get_or_create_user(
-            email="admin@hbnb.io",
-            first_name="Admin",
-            last_name="HBnB",
-            password="admin1234",
-            is_admin=True,
-            fixed_id="36c9050e-ddd3-4c3b-9731-9f487208bbc1"
-        )
-
-        owner = get_or_create_user(
-            email="owner@hbnb.io",
-            first_name="John",
-            last_name="Doe",
-            password="owner1234",
-            is_admin=False
-        )
-
-        jane = get_or_create_user(
-            email="jane@hbnb.io",
-            first_name="Jane",
-            last_name="Smith",
-            password="jane1234",
-            is_admin=False
-        )
-
-        robert = get_or_create_user(
-            email="robert@hbnb.io",
-            first_name="Robert",
-            last_name="Brown",
-            password="robert1234",
-            is_admin=False
-        )
-
-        # 2) amenities
-        wifi = create_amenity("a1b2c3d4-1111-2222-3333-444455556666", "WiFi")
-        pool = create_amenity("b2c3d4e5-2222-3333-4444-555566667777", "Pool")
-        ac   = create_amenity("c3d4e5f6-3333-4444-5555-666677778888", "Air Conditioning")
-        kitchen = create_amenity("d4e5f6a7-4444-5555-6666-777788889999", "Kitchen")
-        parking = create_amenity("e5f6a7b8-5555-6666-7777-888899990000", "Free Parking")
-        gym = create_amenity("f6a7b8c9-6666-7777-8888-999900001111", "Gym")
-
-        # 3) places (FULL - descriptions + city + coords)
-        beach = Place(
-            name="Beautiful Beach House",
-            description=(
-                "Wake up to ocean views and golden sunsets. This beach house is bright, airy, "
-                "and designed for comfort—perfect for families or friends who want a relaxing stay "
-                "steps away from the sea."
-            ),
-            city="Jeddah",
-            price_per_night=150,
-            latitude=21.4858,
-            longitude=39.1925,
-            owner_id=owner.id
-        )
-
-        cabin = Place(
-            name="Cozy Cabin",
-            description=(
-                "A warm wooden cabin tucked away for a quiet escape. Enjoy fresh air, calm nights, "
-                "and a comfortable interior with everything you need for a peaceful weekend."
-            ),
-            city="Abha",
-            price_per_night=100,
-            latitude=18.2164,
-            longitude=42.5053,
-            owner_id=owner.id
-        )
-
-        apt = Place(
-            name="Modern Apartment",
-            description=(
-                "A clean, modern apartment in a convenient location. Bright living area, fast Wi-Fi, "
-                "and a practical layout—ideal for business trips or a short city stay."
-            ),
-            city="Riyadh",
-            price_per_night=200,
-            latitude=24.7136,
-            longitude=46.6753,
-            owner_id=owner.id
-        )
-
-        db.session.add_all([beach, cabin, apt])
-        db.session.commit()
-
-        # 4) attach amenities (if relationship exists)
-        safe_attach_amenities(beach, [wifi, pool, ac, kitchen, parking])
-        safe_attach_amenities(cabin, [wifi, ac, parking])
-        safe_attach_amenities(apt, [wifi, gym, parking, kitchen])
-
-        # 5) reviews (NO ADMIN)
-        # Beach
-        db.session.add_all([
-            Review(text="Great place to stay! Clean, beautiful, and the view is amazing.", rating=4, user_id=jane.id, place_id=beach.id),
-            Review(text="Amazing location and very comfortable. Would definitely come back.", rating=5, user_id=robert.id, place_id=beach.id),
-        ])
-
-        # Cabin
-        db.session.add_all([
-            Review(text="Perfect for a weekend trip. Quiet and cozy with a great vibe.", rating=5, user_id=jane.id, place_id=cabin.id),
-            Review(text="Nice place overall, super calm. Small improvements would make it perfect.", rating=4, user_id=robert.id, place_id=cabin.id),
-        ])
-
-        # Apartment
-        db.session.add_all([
-            Review(text="Clean and stylish. Wi-Fi was fast and the check-in was easy.", rating=5, user_id=jane.id, place_id=apt.id),
-            Review(text="Great spot in the city. Comfortable and practical for a short stay.", rating=4, user_id=robert.id, place_id=apt.id),
-        ])
-
-        db.session.commit()
+        # 0) wipe everything (same transaction as the inserts below)
+        seeding.reset(db.session.connection())
+
+        with facade.transaction():
+            # 1) users
+            admin = facade.create(make_user(
+                email="admin@hbnb.io",
+                first_name="Admin",
+                last_name="HBnB",
+                password="admin1234",
+                is_admin=True,
+                fixed_id="36c9050e-ddd3-4c3b-9731-9f487208bbc1"
+            ))
+            owner = facade.create(make_user("owner@hbnb.io", "John", "Doe", "owner1234"))
+            jane = facade.create(make_user("jane@hbnb.io", "Jane", "Smith", "jane1234"))
+            robert = facade.create(make_user("robert@hbnb.io", "Robert", "Brown", "robert1234"))
+
+            # 2) amenities
+            wifi, pool, ac, kitchen, parking, gym = facade.create_many([
+                Amenity(id="a1b2c3d4-1111-2222-3333-444455556666", name="WiFi"),
+                Amenity(id="b2c3d4e5-2222-3333-4444-555566667777", name="Pool"),
+                Amenity(id="c3d4e5f6-3333-4444-5555-666677778888", name="Air Conditioning"),
+                Amenity(id="d4e5f6a7-4444-5555-6666-777788889999", name="Kitchen"),
+                Amenity(id="e5f6a7b8-5555-6666-7777-888899990000", name="Free Parking"),
+                Amenity(id="f6a7b8c9-6666-7777-8888-999900001111", name="Gym"),
+            ])
+
+            # 3) places (FULL - descriptions + city + coords)
+            beach = Place(
+                name="Beautiful Beach House",
+                description=(
+                    "Wake up to ocean views and golden sunsets. This beach house is bright, airy, "
+                    "and designed for comfort—perfect for families or friends who want a relaxing stay "
+                    "steps away from the sea."
+                ),
+                city="Jeddah",
+                price_per_night=150,
+                latitude=21.4858,
+                longitude=39.1925,
+                owner_id=owner.id
+            )
+
+            cabin = Place(
+                name="Cozy Cabin",
+                description=(
+                    "A warm wooden cabin tucked away for a quiet escape. Enjoy fresh air, calm nights, "
+                    "and a comfortable interior with everything you need for a peaceful weekend."
+                ),
+                city="Abha",
+                price_per_night=100,
+                latitude=18.2164,
+                longitude=42.5053,
+                owner_id=owner.id
+            )
+
+            apt = Place(
+                name="Modern Apartment",
+                description=(
+                    "A clean, modern apartment in a convenient location. Bright living area, fast Wi-Fi, "
+                    "and a practical layout—ideal for business trips or a short city stay."
+                ),
+                city="Riyadh",
+                price_per_night=200,
+                latitude=24.7136,
+                longitude=46.6753,
+                owner_id=owner.id
+            )
+
+            for place in (beach, cabin, apt):
+                facade.create(place)
+
+            # 4) attach amenities
+            facade.add_place_amenities(beach, [a.id for a in (wifi, pool, ac, kitchen, parking)])
+            facade.add_place_amenities(cabin, [a.id for a in (wifi, ac, parking)])
+            facade.add_place_amenities(apt, [a.id for a in (wifi, gym, parking, kitchen)])
+
+            # 5) reviews (NO ADMIN); bulk_add_reviews keeps the rating aggregates in step
+            facade.create_many([
+                # Beach
+                Review(text="Great place to stay! Clean, beautiful, and the view is amazing.", rating=4, user_id=jane.id, place_id=beach.id),
+                Review(text="Amazing location and very comfortable. Would definitely come back.", rating=5, user_id=robert.id, place_id=beach.id),
+                # Cabin
+                Review(text="Perfect for a weekend trip. Quiet and cozy with a great vibe.", rating=5, user_id=jane.id, place_id=cabin.id),
+                Review(text="Nice place overall, super calm. Small improvements would make it perfect.", rating=4, user_id=robert.id, place_id=cabin.id),
+                # Apartment
+                Review(text="Clean and stylish. Wi-Fi was fast and the check-in was easy.", rating=5, user_id=jane.id, place_id=apt.id),
+                Review(text="Great spot in the city. Comfortable and practical for a short stay.", rating=4, user_id=robert.id, place_id=apt.id),
+            ])
 
     print("✅ Database seeded successfully (full places + amenities + reviews).")
 
@@ -0,0 +1,152 @@
+"""
+SQL recorded per test-client request: N+1 detection and query budgets.
+
+QueryRecorder listens to the app's engine and files every statement under
+the request that issued it (between Flask's request_started and
+request_tearing_down signals, so a streamed body is included):
+
+    with QueryRecorder(self.app) as recorder:
+        self.client.get(f"/api/v1/places/{place_id}")
+    recorder.last.count        # statements of the last request
+    recorder.last.repeated()   # {shape: times} run more than once
+
+A statement's shape is its SQL with literals and parameter lists reduced
+to "?", so the same query for different ids has one shape: a shape that
+repeats within one request is a query in a loop (N+1).
+
+QueryBudgetMixin wraps that in assertions for unittest test cases.
+"""
+import re
+from collections import Counter
+
+from flask import request, request_started, request_tearing_down
+from sqlalchemy import event
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_NAMED = re.compile(r":\w+|%\(\w+\)s|\$\d+")
+_PARAM_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")  # IN (?, ?, ?) -> IN (?)
+_ROWS = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")  # VALUES (?), (?) -> VALUES (?)
+_SPACE = re.compile(r"\s+")
+
+
+def statement_shape(sql):
+    """SQL with everything that varies by parameter reduced to '?'"""
+    sql = _STRING.sub("?", sql)
+    sql = _NAMED.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _PARAM_LIST.sub("(?)", sql)
+    sql = _ROWS.sub("(?)", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+class RequestQueries:
+    """The statements of one request"""
+
+    def __init__(self, method, path, endpoint):
+        self.method = method
+        self.path = path
+        self.endpoint = endpoint
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def shapes(self):
+        return Counter(statement_shape(s) for s in self.statements)
+
+    def repeated(self, allowed=()):
+        """{shape: times} for shapes run more than once, minus those matching an `allowed` regex"""
+        return {
+            shape: times for shape, times in self.shapes().items()
+            if times > 1 and not any(re.search(pattern, shape) for pattern in allowed)
+        }
+
+    def describe(self):
+        lines = [f"{self.method} {self.path}: {self.count} statements"]
+        lines += [f"  {i + 1:>3}. {s}" for i, s in enumerate(statement_shape(s) for s in self.statements)]
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return f"<RequestQueries {self.method} {self.path} {self.count}>"
+
+
+class QueryRecorder:
+    """Record the statements of every request `app` handles while active"""
+
+    def __init__(self, app, engine=None):
+        self.app = app
+        self.engine = engine
+        self.requests = []
+        self._current = None
+
+    @property
+    def last(self):
+        return self.requests[-1] if self.requests else None
+
+    def _request_started(self, sender, **extra):
+        rule = request.url_rule
+        self._current = RequestQueries(request.method, request.full_path.rstrip("?"),
+                                       rule.rule if rule is not None else None)
+        self.requests.append(self._current)
+
+    def _request_tearing_down(self, sender, **extra):
+        self._current = None
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self._current is not None:
+            self._current.statements.append(statement)
+
+    def start(self):
+        if self.engine is None:
+            from app.extensions import db
+            with self.app.app_context():
+                self.engine = db.engine
+        event.listen(self.engine, "before_cursor_execute", self._before_cursor_execute)
+        request_started.connect(self._request_started, self.app)
+        request_tearing_down.connect(self._request_tearing_down, self.app)
+        return self
+
+    def stop(self):
+        event.remove(self.engine, "before_cursor_execute", self._before_cursor_execute)
+        request_started.disconnect(self._request_started, self.app)
+        request_tearing_down.disconnect(self._request_tearing_down, self.app)
+        self._current = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class QueryBudgetMixin:
+    """
+    For unittest.TestCase classes with self.app and self.client:
+
+        res = self.assertQueryBudget(3, "get", f"/api/v1/places/{place_id}")
+
+    sends the request and fails if it ran more than 3 statements or
+    repeated a statement shape. Extra keyword arguments go to the client.
+    """
+
+    def record_queries(self, method, url, **kwargs):
+        """(response, RequestQueries) of one test-client request"""
+        with QueryRecorder(self.app) as recorder:
+            response = getattr(self.client, method.lower())(url, **kwargs)
+        return response, recorder.last
+
+    def assertQueryBudget(self, max_queries, method, url, allow_repeated=(), **kwargs):
+        response, queries = self.record_queries(method, url, **kwargs)
+        self.assertIsNotNone(queries, f"{method.upper()} {url} did not reach the app")
+        if queries.count > max_queries:
+            self.fail(f"query budget exceeded ({queries.count} > {max_queries})\n{queries.describe()}")
+        self.assertNoRepeatedQueries(queries, allow_repeated)
+        return response
+
+    def assertNoRepeatedQueries(self, queries, allowed=()):
+        repeated = queries.repeated(allowed)
+        if repeated:
+            shapes = "\n".join(f"  {times}x {shape}" for shape, times in repeated.items())
+            self.fail(f"repeated statements (N+1?) in {queries.method} {queries.path}:\n{shapes}")
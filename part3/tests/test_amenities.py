@@ -0,0 +1,71 @@
+import unittest
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.extensions import db
+from app.models.amenity import Amenity
+from tests.query_budget import QueryBudgetMixin
+
+
+class TestAmenities(QueryBudgetMixin, unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("testing")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+
+        self.wifi = Amenity(name="WiFi")
+        db.session.add(self.wifi)
+        db.session.commit()
+
+        token = create_access_token(identity="admin-id", additional_claims={"is_admin": True})
+        self.admin_headers = {"Authorization": f"Bearer {token}"}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_update_and_delete_amenity(self):
+        res = self.client.put(f"/api/v1/amenities/{self.wifi.id}",
+                              json={"name": "Fast WiFi"}, headers=self.admin_headers)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.get_json()["name"], "Fast WiFi")
+
+        res = self.client.delete(f"/api/v1/amenities/{self.wifi.id}", headers=self.admin_headers)
+        self.assertEqual(res.status_code, 204)
+
+        res = self.client.get(f"/api/v1/amenities/{self.wifi.id}")
+        self.assertEqual(res.status_code, 404)
+
+    def test_amenity_names_are_unique(self):
+        res = self.client.post("/api/v1/amenities/", json={"name": "WiFi"}, headers=self.admin_headers)
+        self.assertEqual((res.status_code, res.get_json()), (400, {"error": "Amenity already exists"}))
+
+        pool = self.client.post("/api/v1/amenities/", json={"name": "Pool"}, headers=self.admin_headers)
+        res = self.client.put(f"/api/v1/amenities/{pool.get_json()['id']}",
+                              json={"name": "WiFi"}, headers=self.admin_headers)
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(sorted(a.name for a in Amenity.query.all()), ["Pool", "WiFi"])
+
+    def test_amenity_lookup_does_not_probe_other_tables(self):
+        amenity_id = self.wifi.id
+        db.session.expunge_all()
+        res, queries = self.record_queries("get", f"/api/v1/amenities/{amenity_id}")
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(queries.count, 1)
+        self.assertIn("FROM amenities", queries.statements[0])
+
+    def test_etag_revalidation_and_invalidation(self):
+        res = self.client.get("/api/v1/amenities/")
+        etag = res.headers["ETag"]
+
+        res = self.client.get("/api/v1/amenities/", headers={"If-None-Match": etag})
+        self.assertEqual(res.status_code, 304)
+
+        self.client.post("/api/v1/amenities/", json={"name": "Pool"}, headers=self.admin_headers)
+        res = self.client.get("/api/v1/amenities/", headers={"If-None-Match": etag})
+        self.assertEqual(res.status_code, 200)
+        self.assertNotEqual(res.headers["ETag"], etag)
+        self.assertEqual(len(res.get_json()["amenities"]), 2)
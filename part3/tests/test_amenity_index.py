@@ -0,0 +1,124 @@
+import unittest
+from app import create_app
+from app.extensions import db
+from app.amenity_index import get_amenity_index
+from app.business.facade import HBnBFacade
+from app.models.user import User
+from app.models.place import Place
+from app.models.amenity import Amenity
+
+
+class TestAmenityIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("testing")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.facade = HBnBFacade()
+
+        self.owner = User(email="owner@test.com", first_name="John", last_name="Doe")
+        self.owner.set_password("owner1234")
+        self.facade.create(self.owner)
+
+        self.wifi = self.facade.create(Amenity(name="WiFi"))
+        self.pool = self.facade.create(Amenity(name="Pool"))
+        self.parking = self.facade.create(Amenity(name="Parking"))
+
+        def place(name, *amenities):
+            p = self.facade.create(Place(name=name, description="", city="Jeddah",
+                                         price_per_night=100, latitude=21.5, longitude=39.2,
+                                         owner_id=self.owner.id))
+            self.facade.add_place_amenities(p, [a.id for a in amenities])
+            return p
+
+        self.villa = place("Villa", self.wifi, self.pool, self.parking)
+        self.flat = place("Flat", self.wifi)
+        self.resort = place("Resort", self.wifi, self.pool)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _names(self, amenities):
+        res = self.client.get("/api/v1/places/", query_string={"amenities": amenities})
+        self.assertEqual(res.status_code, 200)
+        return sorted(p["name"] for p in res.get_json()["places"])
+
+    def test_filter_requires_every_amenity(self):
+        self.assertEqual(self._names("wifi"), ["Flat", "Resort", "Villa"])
+        self.assertEqual(self._names("wifi, POOL"), ["Resort", "Villa"])
+        self.assertEqual(self._names(f"{self.pool.id},parking"), ["Villa"])
+        self.assertEqual(self._names("pool,sauna"), [])
+
+    def test_links_are_applied_incrementally(self):
+        index = get_amenity_index()
+        built_at = index._built_at
+
+        self.flat.amenities.append(self.pool)
+        self.villa.amenities.remove(self.pool)
+        db.session.commit()
+        self.assertEqual(self._names("pool"), ["Flat", "Resort"])
+
+        self.facade.delete(self.resort)
+        sauna = self.facade.create(Amenity(name="Sauna"))
+        self.facade.add_place_amenities(self.flat, [sauna.id])
+        self.assertEqual(self._names("pool,sauna"), ["Flat"])
+        # kept up to date without a rebuild
+        self.assertEqual(index._built_at, built_at)
+
+    def test_bulk_created_and_renamed_amenities_resolve_by_name(self):
+        index = get_amenity_index()
+        built_at = index._built_at
+
+        sauna, = self.facade.create_many([Amenity(name="Sauna")])
+        self.facade.add_place_amenities(self.flat, [sauna.id])
+        self.assertEqual(self._names("sauna"), ["Flat"])
+
+        self.facade.update(self.pool, {"name": "Swimming Pool"})
+        self.assertEqual(self._names("swimming pool"), ["Resort", "Villa"])
+        self.assertEqual(self._names("pool"), [])
+        self.assertEqual(index._built_at, built_at)
+
+    def test_deleted_places_free_their_positions(self):
+        index = get_amenity_index()
+        size = len(index._place_ids)
+        for name in ("A", "B", "C"):
+            self.facade.delete(self.flat)
+            self.flat = self.facade.create(Place(name=name, description="", city="Jeddah",
+                                                 price_per_night=100, latitude=21.5, longitude=39.2,
+                                                 owner_id=self.owner.id))
+            self.facade.add_place_amenities(self.flat, [self.parking.id])
+        self.assertEqual(len(index._place_ids), size)
+        self.assertEqual(len(index._positions), size)
+        self.assertEqual(self._names("parking"), ["C", "Villa"])
+        self.assertEqual(self._names("wifi"), ["Resort", "Villa"])
+
+    def test_rolled_back_changes_are_not_applied(self):
+        get_amenity_index()
+        self.flat.amenities.append(self.parking)
+        db.session.flush()
+        db.session.rollback()
+        self.assertEqual(self._names("parking"), ["Villa"])
+
+        with self.assertRaises(ValueError):
+            with self.facade.transaction():
+                self.flat.amenities.append(self.pool)
+                db.session.flush()
+                raise ValueError("abort")
+        self.assertEqual(self._names("pool"), ["Resort", "Villa"])
+
+    def test_large_results_are_filtered_in_sql(self):
+        from app.repositories import sqlalchemy_repository
+        limit = sqlalchemy_repository.AMENITY_INDEX_MAX_IN
+        sqlalchemy_repository.AMENITY_INDEX_MAX_IN = 1
+        try:
+            self.assertIsNone(get_amenity_index().places_with_all(["wifi", "pool"], max_results=1))
+            self.assertEqual(self._names("wifi,pool"), ["Resort", "Villa"])
+        finally:
+            sqlalchemy_repository.AMENITY_INDEX_MAX_IN = limit
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+from unittest import mock
+from app.cache import ResponseCache
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def test_lru_eviction_and_tag_invalidation(self):
+        cache = ResponseCache(max_entries=2, ttl=60)
+        cache.set("/a", {"a": 1}, 200, ["places"])
+        cache.set("/b", {"b": 1}, 200, ["amenities"])
+        cache.get("/a")
+        cache.set("/c", {"c": 1}, 200, ["places"])
+
+        self.assertIsNone(cache.get("/b"))
+        self.assertEqual(len(cache), 2)
+
+        cache.invalidate("places")
+        self.assertEqual(len(cache), 0)
+
+    def test_ttl_expiry(self):
+        cache = ResponseCache(max_entries=10, ttl=5)
+        with mock.patch("app.cache.time.monotonic", return_value=100.0):
+            entry = cache.set("/a", {"a": 1}, 200, [])
+        with mock.patch("app.cache.time.monotonic", return_value=104.0):
+            self.assertIs(cache.get("/a"), entry)
+        with mock.patch("app.cache.time.monotonic", return_value=105.0):
+            self.assertIsNone(cache.get("/a"))
+
+    def test_invalidated_tags_settle(self):
+        cache = ResponseCache(max_entries=10, ttl=60, settle_seconds=5)
+        with mock.patch("app.cache.time.monotonic", return_value=100.0):
+            cache.invalidate("place:1")
+            self.assertTrue(cache.settling(["places", "place:1"]))
+            self.assertFalse(cache.settling(["places"]))
+            entry = cache.set("/a", {"a": 1}, 200, ["place:1"], store=False)
+            self.assertIsNone(cache.get("/a"))
+            self.assertTrue(entry.etag)
+        with mock.patch("app.cache.time.monotonic", return_value=105.0):
+            self.assertFalse(cache.settling(["place:1"]))
+
+        self.assertFalse(ResponseCache(settle_seconds=0).settling(["place:1"]))
@@ -0,0 +1,69 @@
+import os
+import shutil
+import tempfile
+import unittest
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.extensions import db
+from app.sqlite import read_pragmas
+from config import config, ProductionConfig
+
+
+class TestProductionConfig(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        config["production-test"] = type("ProductionTestConfig", (ProductionConfig,), {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(self.tmp, 'prod.db')}",
+            # a fresh database; production only checks the schema version
+            "SCHEMA_SETUP": "migrate",
+        })
+        self.app = create_app("production-test")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+
+    def tearDown(self):
+        db.session.remove()
+        db.engine.dispose()
+        self.ctx.pop()
+        del config["production-test"]
+        shutil.rmtree(self.tmp)
+
+    def test_engine_uses_configured_pool(self):
+        options = ProductionConfig.SQLALCHEMY_ENGINE_OPTIONS
+        pool = db.engine.pool
+        self.assertEqual(type(pool).__name__, "QueuePool")
+        self.assertEqual(pool.size(), options["pool_size"])
+        self.assertEqual(pool._max_overflow, options["max_overflow"])
+        self.assertTrue(pool._pre_ping)
+        self.assertEqual(pool._recycle, options["pool_recycle"])
+
+    def test_sqlite_pragmas_applied_on_connect(self):
+        pragmas = read_pragmas(db.engine, ["journal_mode", "synchronous", "busy_timeout",
+                                           "mmap_size", "cache_size"])
+        self.assertEqual(pragmas["journal_mode"], "wal")
+        self.assertEqual(pragmas["synchronous"], 1)  # NORMAL
+        self.assertEqual(pragmas["busy_timeout"], ProductionConfig.SQLITE_PRAGMAS["busy_timeout"])
+        self.assertEqual(pragmas["cache_size"], ProductionConfig.SQLITE_PRAGMAS["cache_size"])
+
+    def test_pool_endpoint_is_admin_only(self):
+        def headers(is_admin):
+            token = create_access_token(identity="someone", additional_claims={"is_admin": is_admin})
+            return {"Authorization": f"Bearer {token}"}
+
+        res = self.client.get("/api/v1/internal/pool", headers=headers(False))
+        self.assertEqual(res.status_code, 403)
+
+        self.client.get("/api/v1/amenities/")
+        res = self.client.get("/api/v1/internal/pool", headers=headers(True))
+        self.assertEqual(res.status_code, 200)
+        body = res.get_json()
+        self.assertEqual(body["pool_class"], "QueuePool")
+        self.assertEqual(body["size"], ProductionConfig.SQLALCHEMY_ENGINE_OPTIONS["pool_size"])
+        self.assertGreaterEqual(body["checkouts"], 1)
+        self.assertGreaterEqual(body["peak_checked_out"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.extensions import db
+from app.business.facade import HBnBFacade
+from app.models.user import User
+from tests.query_budget import QueryBudgetMixin
+
+
+class TestCurrentUser(QueryBudgetMixin, unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("testing")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+
+        self.user = User(email="jane@test.com", first_name="Jane", last_name="Roe")
+        self.user.set_password("jane1234")
+        db.session.add(self.user)
+        db.session.commit()
+        self.user_id = self.user.id
+        token = create_access_token(identity=self.user_id, additional_claims={"is_admin": False})
+        self.headers = {"Authorization": f"Bearer {token}"}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _user_queries(self, method, url, **kwargs):
+        # every request starts with a fresh session, as outside tests
+        db.session.remove()
+        res, queries = self.record_queries(method, url, headers=self.headers, **kwargs)
+        return res, sum(1 for s in queries.statements if "FROM users" in s)
+
+    def test_user_is_loaded_once_then_served_from_cache(self):
+        res, queries = self._user_queries("get", "/api/v1/auth/me")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(queries, 1)
+
+        res, queries = self._user_queries("get", "/api/v1/auth/me")
+        self.assertEqual(res.get_json()["first_name"], "Jane")
+        self.assertEqual(queries, 0)
+
+        # the cached user is a normal persistent instance for writes
+        res, queries = self._user_queries("post", "/api/v1/places/", json={
+            "name": "Loft", "city": "Riyadh", "price_per_night": 90,
+            "latitude": 24.7, "longitude": 46.6,
+        })
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(res.get_json()["owner_id"], self.user_id)
+        self.assertEqual(queries, 0)
+
+    def test_update_and_delete_invalidate_the_cache(self):
+        self._user_queries("get", "/api/v1/auth/me")
+
+        res, _ = self._user_queries("put", f"/api/v1/users/{self.user_id}",
+                                    json={"first_name": "Janet"})
+        self.assertEqual(res.status_code, 200)
+        res, queries = self._user_queries("get", "/api/v1/auth/me")
+        self.assertEqual(res.get_json()["first_name"], "Janet")
+        self.assertEqual(queries, 1)
+
+        self._user_queries("get", "/api/v1/auth/me")
+        HBnBFacade().delete(db.session.get(User, self.user_id))
+        res, _ = self._user_queries("get", "/api/v1/auth/me")
+        self.assertEqual(res.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import re
+import unittest
+from app import create_app
+from app.extensions import db
+from app.business.facade import HBnBFacade
+from app.metrics import Histogram
+from app.models.user import User
+from app.models.place import Place
+from config import config, TestingConfig
+
+SAMPLE = re.compile(r'^(\w+)\{(.*)\} (\S+)$')
+
+
+def _samples(text):
+    """{(name, frozenset of label pairs): value} from the text format"""
+    samples = {}
+    for line in text.splitlines():
+        match = SAMPLE.match(line)
+        if match:
+            labels = frozenset(re.findall(r'(\w+)="((?:[^"\\]|\\.)*)"', match[2]))
+            samples[match[1], labels] = float(match[3])
+    return samples
+
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("testing")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+
+        owner = User(email="owner@test.com", first_name="John", last_name="Doe")
+        owner.set_password("owner1234")
+        HBnBFacade().create(owner)
+        self.place = HBnBFacade().create(Place(name="Villa", description="", city="Jeddah",
+                                               price_per_night=100, latitude=21.5, longitude=39.2,
+                                               owner_id=owner.id))
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+        config.pop("metrics-test", None)
+
+    def _scrape(self, **kwargs):
+        res = self.client.get("/metrics", **kwargs)
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.content_type.startswith("text/plain"))
+        return _samples(res.get_data(as_text=True))
+
+    def test_requests_are_labelled_by_route_not_path(self):
+        self.client.get(f"/api/v1/places/{self.place.id}")
+        self.client.get("/api/v1/places/no-such-place")
+        self.client.get("/no/such/route")
+
+        samples = self._scrape()
+        route = ("method", "GET"), ("endpoint", "/api/v1/places/<string:place_id>")
+        self.assertEqual(samples["hbnb_http_requests_total", frozenset(route + (("status", "200"),))], 1)
+        self.assertEqual(samples["hbnb_http_requests_total", frozenset(route + (("status", "404"),))], 1)
+        self.assertEqual(samples["hbnb_http_request_duration_seconds_count", frozenset(route)], 2)
+        self.assertEqual(samples["hbnb_http_request_duration_seconds_bucket",
+                                 frozenset(route + (("le", "+Inf"),))], 2)
+        self.assertEqual(samples["hbnb_http_requests_total", frozenset(
+            {("method", "GET"), ("endpoint", "<unmatched>"), ("status", "404")})], 1)
+        self.assertFalse(any(self.place.id in str(labels) for _, labels in samples))
+
+    def test_response_size_and_sql_per_request(self):
+        res = self.client.get(f"/api/v1/places/{self.place.id}")
+        samples = self._scrape()
+        route = frozenset({("method", "GET"), ("endpoint", "/api/v1/places/<string:place_id>")})
+        self.assertEqual(samples["hbnb_http_response_size_bytes_sum", route], len(res.get_data()))
+        self.assertEqual(samples["hbnb_db_queries_per_request_count", route], 1)
+        self.assertGreaterEqual(samples["hbnb_db_queries_per_request_sum", route], 1)
+        self.assertGreater(samples["hbnb_db_query_duration_seconds_total", route], 0)
+
+    def test_histogram_buckets_are_cumulative(self):
+        hist = Histogram((1, 5))
+        for value in (0, 1, 3, 5, 9):
+            hist.observe(value)
+        self.assertEqual(list(hist.cumulative()), [(1, 2), (5, 4), ("+Inf", 5)])
+        self.assertEqual((hist.sum, hist.count), (18, 5))
+
+    def test_token_and_disabling(self):
+        config["metrics-test"] = type("MetricsTestConfig", (TestingConfig,), {"METRICS_TOKEN": "s3cret"})
+        client = create_app("metrics-test").test_client()
+        self.assertEqual(client.get("/metrics").status_code, 401)
+        self.assertEqual(client.get("/metrics", headers={"Authorization": "Bearer nope"}).status_code, 401)
+        self.assertEqual(client.get("/metrics", headers={"Authorization": "Bearer s3cret"}).status_code, 200)
+
+        config["metrics-test"] = type("MetricsTestConfig", (TestingConfig,), {"METRICS_ENABLED": False})
+        self.assertEqual(create_app("metrics-test").test_client().get("/metrics").status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
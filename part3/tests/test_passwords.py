@@ -0,0 +1,85 @@
+import unittest
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+from app.passwords import PasswordHasher, PasswordHasherBusy, hash_cost
+
+
+class TestPasswordHasher(unittest.TestCase):
+
+    def test_process_pool_hash_and_check(self):
+        hasher = PasswordHasher(rounds=4, workers=1)
+        try:
+            hashed = hasher.hash("secret123")
+            self.assertEqual(hash_cost(hashed), 4)
+            self.assertTrue(hasher.check(hashed, "secret123"))
+            self.assertFalse(hasher.check(hashed, "wrong"))
+            self.assertFalse(hasher.check("not-a-hash", "secret123"))
+        finally:
+            hasher.shutdown()
+
+    def test_saturated_pool_raises_busy(self):
+        hasher = PasswordHasher(rounds=4, workers=1, max_pending=1, timeout=0.05)
+        hasher._slots.acquire()
+        with self.assertRaises(PasswordHasherBusy):
+            hasher.hash("secret123")
+        hasher._slots.release()
+
+    def test_slow_job_raises_busy_and_keeps_its_slot(self):
+        hasher = PasswordHasher(rounds=14, workers=1, max_pending=1, timeout=0.2)
+        try:
+            with self.assertRaises(PasswordHasherBusy):
+                hasher.hash("secret123")
+            # the timed out job still runs in the pool and holds the only slot
+            with self.assertRaises(PasswordHasherBusy):
+                hasher.hash("secret123")
+        finally:
+            hasher.shutdown()
+        self.assertTrue(hasher._slots.acquire(blocking=False))
+
+
+class TestLoginRehash(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("testing")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_login_rehashes_when_cost_changed(self):
+        user = User(email="old@test.com", first_name="Old", last_name="Hash")
+        user.password = PasswordHasher(rounds=5).hash("secret123")
+        db.session.add(user)
+        db.session.commit()
+
+        res = self.client.post("/api/v1/auth/login",
+                               json={"email": "old@test.com", "password": "secret123"})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(hash_cost(db.session.get(User, user.id).password),
+                         self.app.config["BCRYPT_LOG_ROUNDS"])
+
+        # still valid with the new hash
+        res = self.client.post("/api/v1/auth/login",
+                               json={"email": "old@test.com", "password": "secret123"})
+        self.assertEqual(res.status_code, 200)
+
+    def test_wrong_password_is_not_rehashed(self):
+        user = User(email="old@test.com", first_name="Old", last_name="Hash")
+        user.password = PasswordHasher(rounds=5).hash("secret123")
+        db.session.add(user)
+        db.session.commit()
+        stored = user.password
+
+        res = self.client.post("/api/v1/auth/login",
+                               json={"email": "old@test.com", "password": "nope"})
+        self.assertEqual(res.status_code, 401)
+        self.assertEqual(db.session.get(User, user.id).password, stored)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,324 @@
+import random
+import unittest
+from datetime import datetime, timedelta
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.models.amenity import Amenity
+from app.models.review import Review
+from app.batch import run_batch
+from tests.query_budget import QueryBudgetMixin
+
+
+class TestPlaces(QueryBudgetMixin, unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("testing")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+
+        self.owner = User(email="owner@test.com", first_name="John", last_name="Doe")
+        self.owner.set_password("owner1234")
+        db.session.add(self.owner)
+        db.session.flush()
+
+        base = datetime(2024, 1, 1)
+        for i in range(7):
+            place = Place(
+                name=f"Place {i}",
+                description="",
+                city="Riyadh" if i % 2 == 0 else "Jeddah",
+                price_per_night=100 + i,
+                latitude=24.7,
+                longitude=46.6,
+                owner_id=self.owner.id,
+            )
+            place.created_at = base + timedelta(minutes=i)
+            db.session.add(place)
+            if i == 0:
+                self.wifi = Amenity(name="WiFi")
+                place.add_amenity(self.wifi)
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_list_places_paginates_with_cursor(self):
+        names = []
+        cursor = None
+        while True:
+            url = "/api/v1/places/?limit=3" + (f"&cursor={cursor}" if cursor else "")
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, 200)
+            body = res.get_json()
+            self.assertLessEqual(len(body["places"]), 3)
+            names += [p["name"] for p in body["places"]]
+            cursor = body["next_cursor"]
+            if not cursor:
+                break
+        self.assertEqual(names, [f"Place {i}" for i in range(7)])
+
+    def test_list_places_invalid_cursor(self):
+        res = self.client.get("/api/v1/places/?cursor=not-a-cursor")
+        self.assertEqual(res.status_code, 400)
+
+    def test_list_places_filters(self):
+        res = self.client.get("/api/v1/places/?city=Riyadh&min_price=101&max_price=105")
+        self.assertEqual(res.status_code, 200)
+        names = [p["name"] for p in res.get_json()["places"]]
+        self.assertEqual(names, ["Place 2", "Place 4"])
+
+        res = self.client.get("/api/v1/places/?amenity=WiFi")
+        names = [p["name"] for p in res.get_json()["places"]]
+        self.assertEqual(names, ["Place 0"])
+
+        res = self.client.get("/api/v1/places/?max_price=cheap")
+        self.assertEqual(res.status_code, 400)
+
+    def test_nearby_places_are_distance_ordered(self):
+        jeddah = Place(name="Beach", description="", city="Jeddah", price_per_night=150,
+                       latitude=21.4858, longitude=39.1925, owner_id=self.owner.id)
+        near = Place(name="Near", description="", city="Riyadh", price_per_night=90,
+                     latitude=24.75, longitude=46.65, owner_id=self.owner.id)
+        db.session.add_all([jeddah, near])
+        db.session.commit()
+
+        res = self.client.get("/api/v1/places/nearby?lat=24.76&lon=46.66&radius_km=50&limit=3")
+        self.assertEqual(res.status_code, 200)
+        places = res.get_json()["places"]
+        self.assertEqual(len(places), 3)
+        self.assertEqual(places[0]["name"], "Near")
+        distances = [p["distance_km"] for p in places]
+        self.assertEqual(distances, sorted(distances))
+
+        res = self.client.get("/api/v1/places/within?min_lat=21&min_lon=39&max_lat=22&max_lon=40")
+        self.assertEqual([p["name"] for p in res.get_json()["places"]], ["Beach"])
+
+        res = self.client.get("/api/v1/places/nearby?lat=24.7&lon=46.6")
+        self.assertEqual(res.status_code, 400)
+
+    def test_place_reviews_constant_queries(self):
+        place_id = Place.query.filter_by(name="Place 1").first().id
+        for i in range(6):
+            author = User(email=f"guest{i}@test.com", first_name="Guest", last_name=str(i))
+            author.set_password("guest1234")
+            db.session.add(author)
+            db.session.flush()
+            db.session.add(Review(text="Nice", rating=5, user_id=author.id, place_id=place_id))
+        db.session.commit()
+        db.session.expunge_all()
+
+        res, queries = self.record_queries("get", f"/api/v1/places/{place_id}/reviews?limit=4")
+        self.assertEqual(res.status_code, 200)
+        body = res.get_json()
+        self.assertEqual([r["user_name"] for r in body["reviews"]],
+                         ["Guest 0", "Guest 1", "Guest 2", "Guest 3"])
+        self.assertIsNotNone(body["next_cursor"])
+        self.assertLessEqual(queries.count, 3)
+
+        res, _ = self.record_queries(
+            "get", f"/api/v1/places/{place_id}/reviews?limit=4&cursor={body['next_cursor']}"
+        )
+        self.assertEqual([r["user_name"] for r in res.get_json()["reviews"]],
+                         ["Guest 4", "Guest 5"])
+
+    def _guest_headers(self, email):
+        guest = User(email=email, first_name="Guest", last_name="User")
+        guest.set_password("guest1234")
+        db.session.add(guest)
+        db.session.commit()
+        token = create_access_token(identity=guest.id, additional_claims={"is_admin": False})
+        return {"Authorization": f"Bearer {token}"}
+
+    def test_rating_aggregates_follow_review_writes(self):
+        place_id = Place.query.filter_by(name="Place 3").first().id
+        url = f"/api/v1/places/{place_id}"
+
+        res = self.client.post(f"{url}/reviews", json={"text": "Great", "rating": 5},
+                               headers=self._guest_headers("a@test.com"))
+        self.assertEqual(res.status_code, 201)
+        review_id = res.get_json()["id"]
+        bob = self._guest_headers("b@test.com")
+        self.client.post(f"{url}/reviews", json={"text": "Fine", "rating": 2}, headers=bob)
+
+        # one review per user and place, on both endpoints; nothing is counted twice
+        res = self.client.post(f"{url}/reviews", json={"text": "Again", "rating": 1}, headers=bob)
+        self.assertEqual((res.status_code, res.get_json()), (400, {"error": "User already reviewed this place"}))
+        res = self.client.post("/api/v1/reviews/", json={"text": "Again", "rating": 1, "place_id": place_id},
+                               headers=bob)
+        self.assertEqual((res.status_code, res.get_json()), (400, {"error": "User already reviewed this place"}))
+
+        body = self.client.get(url).get_json()
+        self.assertEqual((body["avg_rating"], body["review_count"]), (3.5, 2))
+        self.assertEqual(body["rating_histogram"], {"1": 0, "2": 1, "3": 0, "4": 0, "5": 1})
+
+        admin = {"Authorization": "Bearer " + create_access_token(
+            identity="admin-id", additional_claims={"is_admin": True})}
+        res = self.client.put(f"/api/v1/reviews/{review_id}", json={"rating": 3}, headers=admin)
+        self.assertEqual(res.status_code, 200)
+        res = self.client.put(f"/api/v1/reviews/{review_id}", json={"rating": 9}, headers=admin)
+        self.assertEqual(res.status_code, 400)
+        body = self.client.get(url).get_json()
+        self.assertEqual((body["avg_rating"], body["review_count"]), (2.5, 2))
+
+        self.client.delete(f"/api/v1/reviews/{review_id}", headers=admin)
+        body = self.client.get(url).get_json()
+        self.assertEqual((body["avg_rating"], body["review_count"]), (2.0, 1))
+
+        Place.query.filter_by(id=place_id).update({"rating_sum": 0, "review_count": 0})
+        db.session.commit()
+        result = self.app.test_cli_runner().invoke(args=["rebuild-rating-aggregates"])
+        self.assertIn("Rebuilt rating aggregates for 7 places", result.output)
+        db.session.expire_all()
+        body = self.client.get(url).get_json()
+        self.assertEqual((body["avg_rating"], body["review_count"]), (2.0, 1))
+
+    def test_box_search_matches_a_full_scan(self):
+        from app import geo
+        from app.repositories.sqlalchemy_repository import SQLAlchemyRepository
+        rng = random.Random(7)
+        spots = [(24.7, 46.6), (21.5, 39.2), (64.1, 179.5), (64.2, -179.6)]
+        for i in range(400):
+            lat, lon = rng.choice(spots)
+            lon = (lon + rng.uniform(-1.5, 1.5) + 180) % 360 - 180
+            db.session.add(Place(name=f"R{i}", description="", city="X", price_per_night=10,
+                                 latitude=lat + rng.uniform(-1.5, 1.5), longitude=lon,
+                                 owner_id=self.owner.id))
+        db.session.commit()
+        places = Place.query.all()
+        repo = SQLAlchemyRepository()
+
+        for box, limit in [((23, 45, 26, 48), 5), ((23, 45, 26, 48), 500), ((20, 38, 23, 41), 1),
+                           ((62, 178, 66, -178), 20), ((-90, -180, 90, 180), 10)]:
+            center = geo.box_center(*box)
+            expected = sorted((geo.haversine_km(*center, p.latitude, p.longitude), p.id)
+                              for p in places if geo.in_box(p.latitude, p.longitude, *box))[:limit]
+            hits = repo.list_places_in_box(*box, limit=limit)
+            self.assertEqual([p.id for p, _ in hits], [place_id for _, place_id in expected], box)
+
+    def test_owner_cannot_write_rating_aggregates(self):
+        place_id = Place.query.filter_by(name="Place 1").first().id
+        token = create_access_token(identity=self.owner.id, additional_claims={"is_admin": False})
+        res = self.client.put(f"/api/v1/places/{place_id}",
+                              json={"price_per_night": 80, "rating_sum": 500, "review_count": 100,
+                                    "rating_5": 100},
+                              headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(res.status_code, 200)
+
+        body = self.client.get(f"/api/v1/places/{place_id}").get_json()
+        self.assertEqual(body["price_per_night"], 80)
+        self.assertEqual((body["avg_rating"], body["review_count"]), (None, 0))
+        self.assertEqual(body["rating_histogram"]["5"], 0)
+
+    def test_update_place_adds_amenities(self):
+        place = Place.query.filter_by(name="Place 1").first()
+        place_id, pool = place.id, Amenity(name="Pool")
+        db.session.add(pool)
+        db.session.commit()
+        token = create_access_token(identity=self.owner.id, additional_claims={"is_admin": False})
+        headers = {"Authorization": f"Bearer {token}"}
+        url = f"/api/v1/places/{place_id}"
+
+        res = self.client.put(url, json={"amenities": [pool.id, self.wifi.id]}, headers=headers)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(sorted(res.get_json()["amenities"]), sorted([pool.id, self.wifi.id]))
+
+        res = self.client.put(url, json={"name": "Renamed", "amenities": ["nope"]}, headers=headers)
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("nope", res.get_json()["error"])
+        self.assertEqual(self.client.get(url).get_json()["name"], "Place 1")
+
+    def test_stream_places(self):
+        res = self.client.get("/api/v1/places/?stream=1&city=Riyadh")
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.is_streamed)
+        body = res.get_json()
+        self.assertEqual([p["name"] for p in body["places"]],
+                         ["Place 0", "Place 2", "Place 4", "Place 6"])
+        self.assertEqual(body["places"][0]["amenities"], [self.wifi.id])
+
+        res = self.client.get("/api/v1/places/", headers={"Accept": "application/x-ndjson"})
+        self.assertEqual(res.mimetype, "application/x-ndjson")
+        lines = res.get_data(as_text=True).splitlines()
+        self.assertEqual(len(lines), 7)
+
+    def test_batch_create_places_and_reviews(self):
+        token = create_access_token(identity=self.owner.id, additional_claims={"is_admin": False})
+        headers = {"Authorization": f"Bearer {token}"}
+        items = [
+            {"name": "A", "city": "Abha", "price_per_night": 80, "latitude": 18.2, "longitude": 42.5},
+            {"name": "", "city": "Abha", "price_per_night": 80, "latitude": 18.2, "longitude": 42.5},
+            {"name": "C", "city": "Abha", "price_per_night": 90, "latitude": 95, "longitude": 42.5},
+        ]
+
+        res = self.client.post("/api/v1/places/batch", json=items, headers=headers)
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual([e["index"] for e in res.get_json()["errors"]], [1, 2])
+        self.assertEqual(Place.query.filter_by(city="Abha").count(), 0)
+
+        res = self.client.post("/api/v1/places/batch?mode=partial", json=items, headers=headers)
+        self.assertEqual(res.status_code, 207)
+        created = res.get_json()["created"]
+        self.assertEqual([(c["index"], c["name"]) for c in created], [(0, "A")])
+        place_id = created[0]["id"]
+
+        headers = self._guest_headers("batch@test.com")
+        res = self.client.post("/api/v1/reviews/batch", json=[
+            {"text": "Great", "rating": 5, "place_id": place_id},
+            {"text": "Again", "rating": 1, "place_id": place_id},
+        ], headers=headers)
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.get_json()["errors"], [{"index": 1, "error": "User already reviewed this place"}])
+
+        res = self.client.post("/api/v1/reviews/batch?mode=partial", json=[
+            {"text": "Great", "rating": 5, "place_id": place_id},
+            {"text": "Again", "rating": 1, "place_id": place_id},
+        ], headers=headers)
+        self.assertEqual(res.status_code, 207)
+        res = self.client.post("/api/v1/reviews/batch", json=[
+            {"text": "Good", "rating": 4, "place_id": place_id},
+        ], headers=headers)
+        self.assertEqual(res.get_json()["errors"], [{"index": 0, "error": "User already reviewed this place"}])
+
+        res = self.client.post("/api/v1/reviews/batch", json=[
+            {"text": "Good", "rating": 4, "place_id": place_id},
+        ], headers=self._guest_headers("batch2@test.com"))
+        self.assertEqual(res.status_code, 201)
+
+        body = self.client.get(f"/api/v1/places/{place_id}").get_json()
+        self.assertEqual((body["avg_rating"], body["review_count"]), (4.5, 2))
+        self.assertEqual(body["rating_histogram"]["5"], 1)
+
+    def test_batch_reviews_reject_bool_ratings_and_admins(self):
+        place_id = Place.query.filter_by(name="Place 2").first().id
+        res = self.client.post("/api/v1/reviews/batch", json=[
+            {"text": "Great", "rating": 5, "place_id": place_id},
+            {"text": "Odd", "rating": True, "place_id": place_id},
+        ], headers=self._guest_headers("bool@test.com"))
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.get_json()["errors"], [{"index": 1, "error": "Rating must be an integer"}])
+
+        admin = User(email="admin@test.com", first_name="Ad", last_name="Min", is_admin=True)
+        admin.set_password("admin1234")
+        db.session.add(admin)
+        db.session.commit()
+        token = create_access_token(identity=admin.id, additional_claims={"is_admin": True})
+        res = self.client.post("/api/v1/reviews/batch", json=[
+            {"text": "Great", "rating": 5, "place_id": place_id},
+        ], headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(res.status_code, 403)
+        self.assertEqual(Review.query.count(), 0)
+
+    def test_batch_insert_failure_is_a_400(self):
+        def failing_insert(objs):
+            raise ValueError("Rating must be between 1 and 5")
+
+        with self.app.test_request_context("/batch", method="POST", json=[{"name": "A"}]):
+            body, status = run_batch(lambda item: item, failing_insert, dict)
+        self.assertEqual(status, 400)
+        self.assertEqual(body["created"], [])
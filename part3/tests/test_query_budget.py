@@ -0,0 +1,145 @@
+import unittest
+from flask_jwt_extended import create_access_token
+from app import create_app, seeding
+from app.extensions import db
+from app.models.place import Place
+from app.models.user import User
+from tests.query_budget import QueryBudgetMixin, QueryRecorder, statement_shape
+
+# most statements each endpoint may run, whatever the dataset size
+BUDGETS = {
+    "place_list": 4,
+    "place_detail": 2,
+    "place_update": 3,
+    "place_reviews": 2,
+    "place_search": 3,
+    "places_nearby": 5,  # up to 3 growing geocell windows, then the places
+    "review_create": 4,
+    "review_update": 4,
+    "amenity_list": 1,
+    "user_list": 1,
+    "me": 1,
+}
+
+
+class TestQueryBudget(QueryBudgetMixin, unittest.TestCase):
+    """Query budgets at a small dataset; TestQueryBudgetLarge reruns them on a larger one"""
+    USERS, PLACES, REVIEWS = 10, 10, 60
+
+    def setUp(self):
+        self.app = create_app("testing")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+
+        seeding.generate(db.session.connection(), self.app.extensions["password_hasher"].hash("seed1234"),
+                         users=self.USERS, places=self.PLACES, reviews=self.REVIEWS, amenities=6)
+        db.session.commit()
+        # the place with the most reviews, so pages are full
+        self.place = Place.query.order_by(Place.review_count.desc()).first()
+        self.owner_id = self.place.owner_id
+        db.session.expunge_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _headers(self, user_id, is_admin=False):
+        token = create_access_token(identity=user_id, additional_claims={"is_admin": is_admin})
+        return {"Authorization": f"Bearer {token}"}
+
+    def _guest_id(self):
+        """A new user, who owns no place and has not reviewed any"""
+        guest = User(email="guest@test.com", first_name="Guest", last_name="User")
+        guest.set_password("guest1234")
+        db.session.add(guest)
+        db.session.commit()
+        guest_id = guest.id
+        db.session.expunge_all()
+        return guest_id
+
+    def test_place_reads(self):
+        url = f"/api/v1/places/{self.place.id}"
+        self.assertEqual(self.assertQueryBudget(BUDGETS["place_list"], "get",
+                                                "/api/v1/places/?limit=20").status_code, 200)
+        res = self.assertQueryBudget(BUDGETS["place_detail"], "get", url)
+        self.assertIn("host_name", res.get_json())
+        res = self.assertQueryBudget(BUDGETS["place_reviews"], "get", f"{url}/reviews?limit=20")
+        self.assertEqual(len(res.get_json()["reviews"]), min(20, self.place.review_count))
+        res = self.assertQueryBudget(BUDGETS["place_search"], "get",
+                                     f"/api/v1/places/search?q={self.place.city}")
+        self.assertTrue(res.get_json()["places"])
+        res = self.assertQueryBudget(BUDGETS["places_nearby"], "get",
+                                     f"/api/v1/places/nearby?lat={self.place.latitude}"
+                                     f"&lon={self.place.longitude}&radius_km=50",
+                                     allow_repeated=[r"WHERE places\.geocell BETWEEN"])
+        self.assertEqual(res.status_code, 200)
+
+    def test_place_update(self):
+        res = self.assertQueryBudget(BUDGETS["place_update"], "put", f"/api/v1/places/{self.place.id}",
+                                     json={"price_per_night": 99}, headers=self._headers(self.owner_id))
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.get_json()["price_per_night"], 99)
+        self.assertIn("host_name", res.get_json())
+
+    def test_review_writes(self):
+        headers = self._headers(self._guest_id())
+        res = self.assertQueryBudget(BUDGETS["review_create"], "post",
+                                     f"/api/v1/places/{self.place.id}/reviews",
+                                     json={"text": "Lovely", "rating": 4}, headers=headers)
+        self.assertEqual(res.status_code, 201)
+        res = self.assertQueryBudget(BUDGETS["review_update"], "put", f"/api/v1/reviews/{res.get_json()['id']}",
+                                     json={"rating": 2}, headers=headers)
+        self.assertEqual(res.status_code, 200)
+
+    def test_other_lists(self):
+        self.assertEqual(self.assertQueryBudget(BUDGETS["amenity_list"], "get",
+                                                "/api/v1/amenities/").status_code, 200)
+        admin = self._headers(self.owner_id, is_admin=True)
+        self.assertEqual(self.assertQueryBudget(BUDGETS["user_list"], "get", "/api/v1/users/",
+                                                headers=admin).status_code, 200)
+        self.assertEqual(self.assertQueryBudget(BUDGETS["me"], "get", "/api/v1/auth/me",
+                                                headers=self._headers(self.owner_id)).status_code, 200)
+
+
+class TestQueryBudgetLarge(TestQueryBudget):
+    USERS, PLACES, REVIEWS = 60, 120, 1500
+
+
+class TestQueryRecorder(unittest.TestCase):
+
+    def test_statement_shape_ignores_parameters(self):
+        self.assertEqual(statement_shape("SELECT * FROM t WHERE id = 'a' AND n > 3 AND x IN (?, ?, ?)"),
+                         statement_shape("SELECT *  FROM t WHERE id = 'b' AND n > 10\nAND x IN (?)"))
+        self.assertNotEqual(statement_shape("SELECT rating_1 FROM places"),
+                            statement_shape("SELECT rating_2 FROM places"))
+
+    def test_flags_queries_in_a_loop(self):
+        app = create_app("testing")
+
+        @app.route("/n-plus-one")
+        def n_plus_one():
+            return {"names": [db.session.get(User, user_id).first_name for user_id in user_ids]}
+
+        with app.app_context():
+            users = [User(email=f"u{i}@test.com", first_name=f"U{i}", last_name="") for i in range(3)]
+            for user in users:
+                user.password = "x"
+            db.session.add_all(users)
+            db.session.commit()
+            user_ids = [u.id for u in users]
+            db.session.expunge_all()
+
+            with QueryRecorder(app) as recorder:
+                app.test_client().get("/n-plus-one")
+            db.session.remove()
+            db.drop_all()
+
+        self.assertEqual(recorder.last.endpoint, "/n-plus-one")
+        self.assertEqual(recorder.last.count, 3)
+        self.assertEqual(list(recorder.last.repeated().values()), [3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import os
+import shutil
+import tempfile
+import unittest
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.cache import ResponseCache
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.replicas import STICKY_PRUNE_MIN, ReplicaRouter
+from config import config, TestingConfig
+
+
+class TestReadReplicas(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        config["replica-test"] = type("ReplicaTestConfig", (TestingConfig,), {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(self.tmp, 'primary.db')}",
+            "DATABASE_REPLICA_URIS": [f"sqlite:///{os.path.join(self.tmp, 'replica.db')}"],
+        })
+        self.app = create_app("replica-test")
+        # routing, not cached responses, is under test
+        self.app.extensions.pop("response_cache", None)
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            owner = User(email="owner@test.com", first_name="John", last_name="Doe")
+            owner.set_password("owner1234")
+            db.session.add(owner)
+            db.session.flush()
+            db.session.add(Place(name="Replicated", description="", city="Riyadh",
+                                 price_per_night=100, latitude=24.7, longitude=46.6,
+                                 owner_id=owner.id))
+            db.session.commit()
+            self.owner_id = owner.id
+            self.token = create_access_token(identity=owner.id, additional_claims={"is_admin": False})
+        self._sync()
+
+    def tearDown(self):
+        self.app.extensions["replica_router"].dispose()
+        with self.app.app_context():
+            db.engine.dispose()
+        del config["replica-test"]
+        shutil.rmtree(self.tmp)
+
+    def _sync(self):
+        result = self.app.test_cli_runner().invoke(args=["sync-sqlite-replicas"])
+        self.assertIn("Synced 1 SQLite replica(s)", result.output)
+
+    def _names(self, headers=None):
+        res = self.client.get("/api/v1/places/", headers=headers or {})
+        self.assertEqual(res.status_code, 200)
+        return sorted(p["name"] for p in res.get_json()["places"])
+
+    def test_reads_use_replica_and_writer_reads_its_writes(self):
+        auth = {"Authorization": f"Bearer {self.token}"}
+        res = self.client.post("/api/v1/places/", headers=auth, json={
+            "name": "Fresh", "city": "Riyadh", "price_per_night": 90,
+            "latitude": 24.7, "longitude": 46.6,
+        })
+        self.assertEqual(res.status_code, 201)
+        fresh_id = res.get_json()["id"]
+
+        # anonymous GETs are served by the (stale) replica
+        self.assertEqual(self._names(), ["Replicated"])
+        self.assertEqual(self.client.get(f"/api/v1/places/{fresh_id}").status_code, 404)
+
+        # the writer is pinned to the primary for REPLICA_STICKY_SECONDS
+        self.assertEqual(self._names(auth), ["Fresh", "Replicated"])
+        self.assertEqual(self.client.get(f"/api/v1/places/{fresh_id}", headers=auth).status_code, 200)
+
+        self._sync()
+        self.assertEqual(self._names(), ["Fresh", "Replicated"])
+
+    def test_replica_reads_after_a_write_are_not_cached(self):
+        self.app.extensions["response_cache"] = ResponseCache(max_entries=16, ttl=60, settle_seconds=60)
+        self.assertEqual(self._names(), ["Replicated"])
+        auth = {"Authorization": f"Bearer {self.token}"}
+        self.client.post("/api/v1/places/", headers=auth, json={
+            "name": "Fresh", "city": "Riyadh", "price_per_night": 90,
+            "latitude": 24.7, "longitude": 46.6,
+        })
+
+        # the lagging replica's answer is served, but does not refill the cache
+        self.assertEqual(self._names(), ["Replicated"])
+        self._sync()
+        self.assertEqual(self._names(), ["Fresh", "Replicated"])
+
+    def test_stickiness_expires(self):
+        router = ReplicaRouter([], sticky_seconds=0)
+        router.mark_written("user-1")
+        self.assertFalse(router.is_sticky("user-1"))
+
+        router.sticky_seconds = 60
+        router.mark_written("user-1")
+        self.assertTrue(router.is_sticky("user-1"))
+        self.assertFalse(router.is_sticky("user-2"))
+
+    def test_expired_stickiness_is_swept(self):
+        router = ReplicaRouter([], sticky_seconds=0)
+        for i in range(10 * STICKY_PRUNE_MIN):
+            router.mark_written(f"user-{i}")
+        self.assertLessEqual(len(router._sticky_until), STICKY_PRUNE_MIN)
+
+        router.sticky_seconds = 60
+        router.mark_written("writer")
+        for i in range(2 * STICKY_PRUNE_MIN):
+            router.mark_written(f"other-{i}")
+        self.assertTrue(router.is_sticky("writer"))
+
+
+if __name__ == "__main__":
+    unittest.main()
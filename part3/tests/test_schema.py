@@ -0,0 +1,165 @@
+import os
+import shutil
+import tempfile
+import unittest
+import orjson
+from sqlalchemy import create_engine, inspect
+from app import create_app
+from app.extensions import db
+from app.schema import (
+    MIGRATIONS_DIR, SchemaOutOfDate, current_version, discover, latest_version, split_statements,
+    upgrade,
+)
+from config import config, TestingConfig
+
+SCHEMA_SQL = os.path.join(os.path.dirname(MIGRATIONS_DIR), "schema.sql")
+
+
+def _structure(engine):
+    """
+    Tables, columns, indexes, keys and FTS objects, comparable across creation
+    paths (column types as their generic type: the migrations write TIMESTAMP
+    where create_all() writes DATETIME on SQLite)
+    """
+    insp = inspect(engine)
+    tables = {}
+    for name in insp.get_table_names():
+        if name == "schema_version":
+            continue
+        tables[name] = {
+            "columns": [(c["name"], _generic(c["type"]), c["nullable"], c["primary_key"])
+                        for c in insp.get_columns(name)],
+            "indexes": sorted((i["name"], tuple(i["column_names"]), i["unique"])
+                              for i in insp.get_indexes(name)),
+            "unique": sorted(tuple(u["column_names"]) for u in insp.get_unique_constraints(name)),
+            "foreign_keys": sorted((tuple(f["constrained_columns"]), f["referred_table"])
+                                   for f in insp.get_foreign_keys(name)),
+        }
+    with engine.connect() as conn:
+        objects = sorted(conn.exec_driver_sql(
+            "SELECT type, name FROM sqlite_master WHERE name NOT LIKE 'sqlite_%'"
+            " AND name != 'schema_version'").all())
+    return tables, objects
+
+
+def _generic(type_):
+    try:
+        return repr(type_.as_generic())
+    except NotImplementedError:  # untyped FTS columns
+        return str(type_)
+
+
+def _sql(engine):
+    with engine.connect() as conn:
+        return sorted(" ".join(sql.split()) for (sql,) in conn.exec_driver_sql(
+            "SELECT sql FROM sqlite_master WHERE sql IS NOT NULL AND name != 'schema_version'"))
+
+
+class TestMigrations(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        for key in ("schema-test", "swagger-test"):
+            config.pop(key, None)
+        shutil.rmtree(self.tmp)
+
+    def _app(self, name="schema-test", **options):
+        config[name] = type("SchemaTestConfig", (TestingConfig,), {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(self.tmp, 'app.db')}",
+            **options,
+        })
+        return create_app(name)
+
+    def _dispose(self, app):
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+
+    def test_migrations_match_models_and_schema_sql(self):
+        app = self._app()  # testing: SCHEMA_SETUP = "migrate"
+        with app.app_context():
+            migrated = db.engine
+            self.assertEqual(current_version(db.session.connection()), latest_version())
+
+            models = create_engine("sqlite://")
+            db.metadata.create_all(models)
+            self.assertEqual(_structure(migrated), _structure(models))
+
+            script = create_engine("sqlite://")
+            with open(SCHEMA_SQL) as f, script.begin() as conn:
+                for statement in split_statements(f.read()):
+                    conn.exec_driver_sql(statement)
+            self.assertEqual(_sql(migrated), _sql(script))
+            db.session.remove()
+        self._dispose(app)
+
+    def test_check_refuses_pending_migrations_until_upgrade(self):
+        with self.assertRaises(SchemaOutOfDate):
+            self._app(SCHEMA_SETUP="check")
+
+        app = self._app(SCHEMA_SETUP="create_all")
+        result = app.test_cli_runner().invoke(args=["db-upgrade"])
+        # tables from create_all, but no recorded version
+        self.assertIsInstance(result.exception, SchemaOutOfDate)
+        result = app.test_cli_runner().invoke(args=["db-stamp"])
+        self.assertIn(f"schema is at version {latest_version()}", result.output)
+        self._dispose(app)
+
+        app = self._app(SCHEMA_SETUP="check")
+        result = app.test_cli_runner().invoke(args=["db-upgrade"])
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn(f"Schema is at version {latest_version()}", result.output)
+        self._dispose(app)
+
+    def test_dialect_scripts_run_only_on_their_dialect(self):
+        scripts = {
+            "0001_things.sql": "CREATE TABLE things (id INTEGER NOT NULL PRIMARY KEY, name VARCHAR(20));",
+            "0001_things.sqlite.sql": "CREATE INDEX ix_things_name ON things (name);",
+            "0001_things.postgresql.sql": "CREATE EXTENSION pg_trgm;",
+        }
+        for filename, sql in scripts.items():
+            with open(os.path.join(self.tmp, filename), "w") as f:
+                f.write(sql)
+        engine = create_engine("sqlite://")
+        with engine.begin() as conn:
+            self.assertEqual([m.name for m in upgrade(conn, directory=self.tmp)], ["things"])
+            self.assertEqual(current_version(conn), 1)
+        self.assertEqual([i["name"] for i in inspect(engine).get_indexes("things")], ["ix_things_name"])
+
+        os.remove(os.path.join(self.tmp, "0001_things.sql"))
+        discover.cache_clear()
+        with self.assertRaises(RuntimeError):
+            discover(self.tmp)
+
+    def test_swagger_json_is_cached_on_disk(self):
+        path = os.path.join(self.tmp, "swagger.json")
+        app = self._app("swagger-test", SWAGGER_CACHE=path)
+        res = app.test_client().get("/api/v1/swagger.json")
+        self.assertEqual(res.status_code, 200)
+        with open(path, "rb") as f:
+            spec = orjson.loads(f.read())
+        self.assertIn("/places/search", spec["paths"])
+        self._dispose(app)
+
+        # a new worker serves the file as long as the fingerprint matches
+        spec["info"]["title"] = "From cache"
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(spec))
+        app = self._app("swagger-test", SWAGGER_CACHE=path)
+        self.assertEqual(app.test_client().get("/api/v1/swagger.json").get_json()["info"]["title"],
+                         "From cache")
+        self._dispose(app)
+
+        spec["x-fingerprint"] = "stale"
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(spec))
+        app = self._app("swagger-test", SWAGGER_CACHE=path)
+        self.assertEqual(app.test_client().get("/api/v1/swagger.json").get_json()["info"]["title"],
+                         "HBnB API")
+        self._dispose(app)
+
+
+if __name__ == "__main__":
+    unittest.main()
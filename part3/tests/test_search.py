@@ -0,0 +1,88 @@
+import unittest
+from app import create_app
+from app.extensions import db
+from app.business.facade import HBnBFacade
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from app.search import match_expression
+
+
+class TestPlaceSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("testing")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.facade = HBnBFacade()
+
+        self.owner = User(email="owner@test.com", first_name="John", last_name="Doe")
+        self.owner.set_password("owner1234")
+        self.facade.create(self.owner)
+
+        def place(name, description):
+            return Place(name=name, description=description, city="Jeddah", price_per_night=100,
+                         latitude=21.5, longitude=39.2, owner_id=self.owner.id)
+
+        self.beach = self.facade.create(place("Beach House", "Wake up to ocean views"))
+        self.cabin = self.facade.create(place("Cozy Cabin", "Quiet forest escape near the beach"))
+        self.loft = self.facade.create(place("City Loft", "Modern apartment downtown"))
+        self.facade.create(Review(text="Lovely sunsets over the sea", rating=5,
+                                  user_id=self.owner.id, place_id=self.loft.id))
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _search(self, q):
+        res = self.client.get("/api/v1/places/search", query_string={"q": q})
+        self.assertEqual(res.status_code, 200)
+        return [p["name"] for p in res.get_json()["places"]]
+
+    def test_ranks_name_matches_first(self):
+        self.assertEqual(self._search("beach"), ["Beach House", "Cozy Cabin"])
+
+    def test_search_opens_no_transaction(self):
+        # the query starts with WITH: it is a read and takes no write lock
+        db.session.commit()
+        self.assertEqual(self._search("beach"), ["Beach House", "Cozy Cabin"])
+        self.assertFalse(db.session.connection().connection.driver_connection.in_transaction)
+
+    def test_matches_review_text_and_prefixes(self):
+        self.assertEqual(self._search("sunset"), ["City Loft"])
+        self.assertEqual(self._search("apart"), ["City Loft"])
+
+    def test_index_follows_updates_deletes_and_bulk_inserts(self):
+        self.facade.update(self.loft, {"description": "Penthouse with a rooftop pool"})
+        self.assertEqual(self._search("penthouse"), ["City Loft"])
+        self.assertEqual(self._search("apartment"), [])
+
+        self.facade.delete(self.cabin)
+        self.assertEqual(self._search("beach"), ["Beach House"])
+
+        self.facade.create_many([Place(name="Dune Camp", description="Desert stars", city="Ula",
+                                       price_per_night=80, latitude=26.6, longitude=37.9,
+                                       owner_id=self.owner.id)])
+        self.assertEqual(self._search("desert"), ["Dune Camp"])
+
+    def test_rebuild_command(self):
+        # an existing database: no index content yet
+        db.session.execute(db.text("INSERT INTO places_fts(places_fts) VALUES ('delete-all')"))
+        db.session.commit()
+        self.assertEqual(self._search("beach"), [])
+
+        result = self.app.test_cli_runner().invoke(args=["rebuild-search-index"])
+        self.assertIn("places_fts: 3 rows", result.output)
+        self.assertEqual(self._search("beach"), ["Beach House", "Cozy Cabin"])
+
+    def test_query_syntax_is_escaped(self):
+        self.assertEqual(match_expression('beach" OR NEAR(x'), '"beach" AND "OR" AND "NEAR" AND "x"*')
+        self.assertEqual(self._search('beach" OR'), [])
+        res = self.client.get("/api/v1/places/search?q=%20%2A")
+        self.assertEqual(res.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
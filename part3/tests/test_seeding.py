@@ -0,0 +1,81 @@
+import unittest
+from app import create_app, seeding
+from app.extensions import db
+from app.business.facade import HBnBFacade
+
+
+class TestSeeding(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("testing")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.runner = self.app.test_cli_runner()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _seed(self, *extra):
+        return self.runner.invoke(args=[
+            "seed-data", "--users", "20", "--places", "50", "--reviews", "400",
+            "--amenities", "6", "--password", "seed1234", *extra,
+        ])
+
+    def _rows(self, sql):
+        return db.session.execute(db.text(sql)).all()
+
+    def test_counts_and_rating_aggregates(self):
+        result = self._seed()
+        self.assertEqual(result.exit_code, 0, result.output)
+        counts = self._rows("SELECT (SELECT count(*) FROM users), (SELECT count(*) FROM places), "
+                            "(SELECT count(*) FROM reviews), (SELECT count(*) FROM amenities)")[0]
+        self.assertEqual(tuple(counts), (20, 50, 400, 6))
+
+        # aggregates stored on places match the generated reviews
+        mismatches = self._rows("""
+            SELECT p.id FROM places p LEFT JOIN (
+                SELECT place_id, count(*) AS n, sum(rating) AS s, sum(rating = 5) AS five
+                FROM reviews GROUP BY place_id) r ON r.place_id = p.id
+            WHERE p.review_count != coalesce(r.n, 0) OR p.rating_sum != coalesce(r.s, 0)
+               OR p.rating_5 != coalesce(r.five, 0)
+               OR p.rating_1 + p.rating_2 + p.rating_3 + p.rating_4 + p.rating_5 != p.review_count
+        """)
+        self.assertEqual(mismatches, [])
+        self.assertEqual(self._rows("SELECT count(*) FROM places WHERE geocell IS NULL")[0][0], 0)
+
+    def test_same_seed_same_data(self):
+        self.assertEqual(self._seed("--seed", "7").exit_code, 0)
+        first = self._rows("SELECT id, name, latitude, rating_sum FROM places ORDER BY id")
+        self.assertEqual(self._seed("--seed", "7", "--reset").exit_code, 0)
+        self.assertEqual(self._rows("SELECT id, name, latitude, rating_sum FROM places ORDER BY id"), first)
+
+    def test_refuses_non_empty_database_without_reset(self):
+        self.assertEqual(self._seed().exit_code, 0)
+        result = self._seed()
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn("--reset", result.output)
+        self.assertEqual(self._rows("SELECT count(*) FROM places")[0][0], 50)
+
+    def test_generated_data_is_usable_through_the_api(self):
+        self.assertEqual(self._seed().exit_code, 0)
+
+        res = self.client.post("/api/v1/auth/login",
+                               json={"email": seeding.seed_email(3), "password": "seed1234"})
+        self.assertEqual(res.status_code, 200)
+
+        city = self._rows("SELECT city FROM places LIMIT 1")[0][0]
+        res = self.client.get("/api/v1/places/search", query_string={"q": city})
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.get_json()["places"])
+
+        place = HBnBFacade().get_place(seeding.seed_id(3, 0))
+        self.assertIsNotNone(place)
+        res = self.client.get(f"/api/v1/places/{place.id}/reviews")
+        self.assertEqual(res.status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import os
+import tempfile
+import unittest
+from sqlalchemy import create_engine, event
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.extensions import db
+from app.business.facade import HBnBFacade
+from app.models.user import User
+from app.models.place import Place
+from app.models.amenity import Amenity
+from app.models.review import Review
+from app.sqlite import configure_sqlite
+
+
+class TestTransactions(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("testing")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.facade = HBnBFacade()
+
+        self.owner = User(email="owner@test.com", first_name="John", last_name="Doe")
+        self.owner.set_password("owner1234")
+        self.guest = User(email="guest@test.com", first_name="Jane", last_name="Roe")
+        self.guest.set_password("guest1234")
+        self.amenities = [Amenity(name=name) for name in ("WiFi", "Pool", "Gym")]
+        db.session.add_all([self.owner, self.guest, *self.amenities])
+        db.session.commit()
+
+        self.commits = 0
+        event.listen(db.session, "after_commit", self._count_commit)
+
+    def tearDown(self):
+        event.remove(db.session, "after_commit", self._count_commit)
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _count_commit(self, session):
+        self.commits += 1
+
+    def _headers(self, user):
+        token = create_access_token(identity=user.id, additional_claims={"is_admin": False})
+        return {"Authorization": f"Bearer {token}"}
+
+    def _place(self, **extra):
+        return dict(name="Loft", city="Riyadh", price_per_night=90,
+                    latitude=24.7, longitude=46.6, **extra)
+
+    def test_create_place_with_amenities_commits_once(self):
+        ids = [a.id for a in self.amenities]
+        self.commits = 0
+        res = self.client.post("/api/v1/places/", json=self._place(amenities=ids),
+                               headers=self._headers(self.owner))
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(self.commits, 1)
+        self.assertEqual(sorted(res.get_json()["amenities"]), sorted(ids))
+
+    def test_unknown_amenity_leaves_no_place_behind(self):
+        res = self.client.post("/api/v1/places/",
+                               json=self._place(amenities=[self.amenities[0].id, "nope"]),
+                               headers=self._headers(self.owner))
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("nope", res.get_json()["error"])
+        self.assertEqual(Place.query.count(), 0)
+
+    def test_create_review_commits_once(self):
+        place = Place(name="Loft", description="", city="Riyadh", price_per_night=90,
+                      latitude=24.7, longitude=46.6, owner_id=self.owner.id)
+        self.facade.create(place)
+        place_id = place.id
+
+        self.commits = 0
+        res = self.client.post(f"/api/v1/places/{place_id}/reviews",
+                               json={"text": "Great", "rating": 5},
+                               headers=self._headers(self.guest))
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(self.commits, 1)
+        self.assertEqual(db.session.get(Place, place_id).review_count, 1)
+
+    def test_transaction_takes_write_lock_after_earlier_reads(self):
+        User.query.count()  # e.g. get_current_user() before the block
+        self.assertFalse(db.session.connection().connection.driver_connection.in_transaction)
+        with self.facade.transaction():
+            self.assertTrue(db.session.connection().connection.driver_connection.in_transaction)
+
+    def test_nested_failure_rolls_back_to_savepoint(self):
+        with self.facade.transaction():
+            place = self.facade.create(Place(name="Loft", description="", city="Riyadh", price_per_night=90,
+                                             latitude=24.7, longitude=46.6,
+                                             owner_id=self.owner.id))
+            try:
+                with self.facade.transaction():
+                    self.facade.create(Review(text="Great", rating=5,
+                                              user_id=self.guest.id, place_id=place.id))
+                    raise ValueError("abort the review")
+            except ValueError:
+                pass
+            self.assertEqual(self.commits, 0)
+
+        self.assertEqual(self.commits, 1)
+        self.assertEqual(Place.query.count(), 1)
+        self.assertEqual(Review.query.count(), 0)
+        self.assertEqual(Place.query.one().review_count, 0)
+
+    def test_outer_failure_rolls_back_everything(self):
+        with self.assertRaises(ValueError):
+            with self.facade.transaction():
+                self.facade.create(Amenity(name="Sauna"))
+                self.facade.add_place_amenities(None, ["missing"])
+        self.assertEqual(self.commits, 0)
+        self.assertIsNone(Amenity.query.filter_by(name="Sauna").first())
+
+
+class TestSQLiteLocking(unittest.TestCase):
+    """Two connections to one WAL database, as two requests of a threaded server"""
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        self.engine = create_engine(f"sqlite:///{self.path}")
+        configure_sqlite(self.engine, {"journal_mode": "WAL", "busy_timeout": 200})
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql("CREATE TABLE t (id INTEGER PRIMARY KEY, n INTEGER)")
+            conn.exec_driver_sql("INSERT INTO t VALUES (1, 0)")
+
+    def tearDown(self):
+        self.engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+
+    def test_reads_open_no_transaction(self):
+        with self.engine.connect() as conn:
+            conn.exec_driver_sql("SELECT n FROM t").scalar()
+            self.assertFalse(conn.connection.driver_connection.in_transaction)
+            conn.exec_driver_sql("UPDATE t SET n = 1")
+            self.assertTrue(conn.connection.driver_connection.in_transaction)
+            conn.commit()
+
+    def test_write_after_read_survives_a_concurrent_commit(self):
+        with self.engine.connect() as a:
+            self.assertEqual(a.exec_driver_sql("SELECT n FROM t").scalar(), 0)
+            with self.engine.begin() as b:
+                b.exec_driver_sql("UPDATE t SET n = n + 1")
+            a.exec_driver_sql("UPDATE t SET n = n + 1")
+            a.commit()
+        with self.engine.connect() as conn:
+            self.assertEqual(conn.exec_driver_sql("SELECT n FROM t").scalar(), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
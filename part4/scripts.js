@@ -143,18 +143,25 @@ async function getUserNameById(userId) {
 async function loadAmenitiesMap() {
   if (amenitiesMap) return amenitiesMap;
 
-  // try /amenities/ then /amenities
-  const list =
-    await apiGetJsonWithFallback("/amenities/", "/amenities");
-
-  const arr = Array.isArray(list) ? list : (list && list.amenities) ? list.amenities : [];
   amenitiesMap = new Map();
-  arr.forEach((a) => {
-    if (!a) return;
-    const id = a.id ?? a.amenity_id;
-    const name = a.name ?? a.title;
-    if (id && name) amenitiesMap.set(String(id), String(name));
-  });
+
+  // amenities are paginated: follow next_cursor until the last page
+  let cursor = null;
+  do {
+    const query = `?limit=200${cursor ? `&cursor=${encodeURIComponent(cursor)}` : ""}`;
+    // try /amenities/ then /amenities
+    const list =
+      await apiGetJsonWithFallback(`/amenities/${query}`, `/amenities${query}`);
+
+    const arr = Array.isArray(list) ? list : (list && list.amenities) ? list.amenities : [];
+    arr.forEach((a) => {
+      if (!a) return;
+      const id = a.id ?? a.amenity_id;
+      const name = a.name ?? a.title;
+      if (id && name) amenitiesMap.set(String(id), String(name));
+    });
+    cursor = list && !Array.isArray(list) ? list.next_cursor : null;
+  } while (cursor);
 
   return amenitiesMap;
 }
@@ -213,12 +220,15 @@ async function handleLoginSubmit(e) {
 
 /* ========= PLACES ========= */
 let cachedPlaces = [];
+let placesCursor = null;   // next_cursor of the last page loaded
+let placesFilter = null;   // max price the loaded pages were fetched with
+let placesRequest = 0;     // bumped per fetch so a stale page is dropped
 
-function renderPlaces(list) {
+function renderPlaces(list, append = false) {
   const container = qs("places-list");
   if (!container) return;
 
-  container.innerHTML = "";
+  if (!append) container.innerHTML = "";
 
   list.forEach((p) => {
     const title = p.title ?? p.name ?? "Untitled";
@@ -236,34 +246,62 @@ function renderPlaces(list) {
   });
 }
 
-function applyMaxPriceFilter(maxPrice) {
-  if (!maxPrice || maxPrice === "All") {
-    renderPlaces(cachedPlaces);
-    return;
-  }
-  const limit = Number(maxPrice);
-  const filtered = cachedPlaces.filter((p) => {
-    const price = Number(p.price_per_night ?? p.price ?? p.pricePerNight ?? NaN);
-    return Number.isFinite(price) && price <= limit;
-  });
-  renderPlaces(filtered);
+async function fetchPlaces(maxPrice, cursor = null) {
+  // filtering runs server-side: GET /places/?max_price=
+  const params = new URLSearchParams();
+  if (maxPrice && maxPrice !== "All") params.set("max_price", maxPrice);
+  if (cursor) params.set("cursor", cursor);
+  const query = params.toString() ? `?${params}` : "";
+  return apiGetJsonWithFallback(`/places/${query}`, `/places${query}`);
+}
+
+function updateLoadMore() {
+  const button = qs("load-more");
+  if (button) button.hidden = !placesCursor;
 }
 
-async function loadPlaces() {
+async function loadPlaces(maxPrice = null) {
   const container = qs("places-list");
   if (!container) return;
 
-  const data = await apiGetJsonWithFallback("/places/", "/places");
+  const request = ++placesRequest;
+  const data = await fetchPlaces(maxPrice);
+  if (request !== placesRequest) return;
   if (!data) {
     container.innerHTML = `<div class="error">Failed to load places.</div>`;
+    placesCursor = null;
+    updateLoadMore();
     return;
   }
 
+  // places are paginated: further pages are appended by the "Load more" button
   cachedPlaces = Array.isArray(data) ? data : (data.places || []);
+  placesCursor = Array.isArray(data) ? null : data.next_cursor;
+  placesFilter = maxPrice;
   renderPlaces(cachedPlaces);
+  updateLoadMore();
 
   const select = qs("max-price");
-  if (select) select.onchange = () => applyMaxPriceFilter(select.value);
+  if (select) select.onchange = () => loadPlaces(select.value);
+  const button = qs("load-more");
+  if (button) button.onclick = loadMorePlaces;
+}
+
+async function loadMorePlaces() {
+  if (!placesCursor) return;
+  const button = qs("load-more");
+  if (button) button.disabled = true;
+
+  const request = ++placesRequest;
+  const data = await fetchPlaces(placesFilter, placesCursor);
+  if (button) button.disabled = false;
+  if (request !== placesRequest || !data) return;
+
+  const page = Array.isArray(data) ? data : (data.places || []);
+  cachedPlaces = cachedPlaces.concat(page);
+  placesCursor = Array.isArray(data) ? null : data.next_cursor;
+  renderPlaces(page, true);
+  updateLoadMore();
 }
 
 /* ========= PLACE DETAILS ========= */